@@ -0,0 +1,81 @@
+def get_financing_offers():
+    """
+    Return a catalog of solar financing products available to Kenyan households.
+    Offer terms are indicative and should be updated periodically.
+
+    Offer structures:
+    - "amortizing": fixed monthly payments on a reducing balance at annual_rate
+    - "payg": pay-as-you-go plan with a daily payment set as a percentage of the system price
+    - "balloon": reduced monthly payments with balloon_percent of the financed amount due at the end
+
+    Returns:
+    list: List of dictionaries containing financing offer information
+    """
+    offers = [
+        {
+            "name": "Bank Green Energy Loan",
+            "provider_type": "Bank",
+            "structure": "amortizing",
+            "deposit_percent": 20,
+            "fee_percent": 2.5,      # Arrangement and insurance fees, % of financed amount
+            "term_months": 60,
+            "annual_rate": 0.14
+        },
+        {
+            "name": "Bank Asset Finance (7 years)",
+            "provider_type": "Bank",
+            "structure": "amortizing",
+            "deposit_percent": 30,
+            "fee_percent": 3.0,
+            "term_months": 84,
+            "annual_rate": 0.12
+        },
+        {
+            "name": "SACCO Development Loan",
+            "provider_type": "SACCO",
+            "structure": "amortizing",
+            "deposit_percent": 0,
+            "fee_percent": 1.0,
+            "term_months": 48,
+            "annual_rate": 0.12
+        },
+        {
+            "name": "SACCO Solar Product Loan",
+            "provider_type": "SACCO",
+            "structure": "amortizing",
+            "deposit_percent": 10,
+            "fee_percent": 0.5,
+            "term_months": 36,
+            "annual_rate": 0.10
+        },
+        {
+            "name": "PAYG Daily Plan",
+            "provider_type": "Pay-As-You-Go",
+            "structure": "payg",
+            "deposit_percent": 10,
+            "fee_percent": 0.0,
+            "term_months": 24,
+            "daily_rate_percent": 0.16  # Daily payment, % of system price
+        },
+        {
+            "name": "PAYG Extended Plan",
+            "provider_type": "Pay-As-You-Go",
+            "structure": "payg",
+            "deposit_percent": 5,
+            "fee_percent": 0.0,
+            "term_months": 36,
+            "daily_rate_percent": 0.12
+        },
+        {
+            "name": "Bank Balloon Loan",
+            "provider_type": "Bank",
+            "structure": "balloon",
+            "deposit_percent": 20,
+            "fee_percent": 2.0,
+            "term_months": 60,
+            "annual_rate": 0.15,
+            "balloon_percent": 30
+        }
+    ]
+
+    return offers
@@ -0,0 +1,39 @@
+"""
+Grid Reliability Data Module
+
+This module provides indicative Kenya Power outage statistics for each region in
+get_county_regions(). Values should be updated as utility reliability reports are published.
+"""
+
+# Relative likelihood of an outage starting in each hour of the day (00:00-23:00).
+# Outages cluster in the afternoon storm hours and the evening peak.
+OUTAGE_START_HOUR_WEIGHTS = [
+    0.6, 0.5, 0.5, 0.5, 0.5, 0.6,  # 00-05
+    0.8, 0.9, 0.9, 0.9, 1.0, 1.0,  # 06-11
+    1.1, 1.2, 1.4, 1.5, 1.5, 1.4,  # 12-17
+    1.6, 1.8, 1.7, 1.3, 0.9, 0.7   # 18-23
+]
+
+
+def get_regional_outage_statistics():
+    """
+    Return outage frequency and duration distributions for each region.
+
+    Outage counts are Poisson distributed with the given mean per year; durations are
+    lognormal with the given median (hours) and sigma.
+
+    Returns:
+    dict: Dictionary with outage statistics per region
+    """
+    statistics = {
+        "Nairobi": {"outages_per_year": 30, "median_duration_hours": 1.5, "duration_sigma": 1.0},
+        "Central": {"outages_per_year": 40, "median_duration_hours": 2.0, "duration_sigma": 1.0},
+        "Coast": {"outages_per_year": 45, "median_duration_hours": 2.5, "duration_sigma": 1.1},
+        "Rift Valley": {"outages_per_year": 50, "median_duration_hours": 3.0, "duration_sigma": 1.1},
+        "Eastern": {"outages_per_year": 55, "median_duration_hours": 3.0, "duration_sigma": 1.2},
+        "Western": {"outages_per_year": 60, "median_duration_hours": 3.5, "duration_sigma": 1.2},
+        "Nyanza": {"outages_per_year": 60, "median_duration_hours": 3.5, "duration_sigma": 1.2},
+        "North Eastern": {"outages_per_year": 80, "median_duration_hours": 5.0, "duration_sigma": 1.3}
+    }
+
+    return statistics
@@ -1,45 +1,132 @@
+import copy
+
+# Kenya Power tariff information (as of mid-2023)
+# These rates should be updated periodically to reflect current tariffs
+#
+# Consumption bands are (upper limit in kWh/month, energy charge in KES/kWh). With
+# 'volume' band pricing all units of the month are charged at the rate of the band the
+# monthly consumption falls in; with 'incremental' pricing each band's units are charged
+# at that band's rate.
+ELECTRICITY_TARIFFS = {
+    "Domestic": {
+        "category": "Domestic (DC)",
+        "energy_charge": 21.00,  # KES per kWh (ordinary consumption)
+        "fixed_charge": 200,     # KES per month
+        "bands": [
+            (30, 12.22),              # Lifeline
+            (100, 16.54),             # Ordinary I
+            (float("inf"), 21.00)     # Ordinary II
+        ],
+        "band_pricing": "volume",
+        "description": "For domestic consumers with single phase supply"
+    },
+    "Small Commercial": {
+        "category": "Small Commercial (SC)",
+        "energy_charge": 22.70,  # KES per kWh
+        "fixed_charge": 250,     # KES per month
+        "bands": [
+            (100, 16.50),
+            (float("inf"), 22.70)
+        ],
+        "band_pricing": "volume",
+        "description": "For small commercial consumers with single phase supply"
+    },
+    "Commercial (DC)": {
+        "category": "Commercial (DC)",
+        "energy_charge": 23.50,  # KES per kWh
+        "fixed_charge": 3500,    # KES per month
+        "bands": [
+            (float("inf"), 23.50)
+        ],
+        "band_pricing": "volume",
+        "description": "For commercial consumers with three phase supply"
+    },
+    "Industrial": {
+        "category": "Industrial (IT)",
+        "energy_charge": 20.60,  # KES per kWh
+        "fixed_charge": 4500,    # KES per month
+        "bands": [
+            (float("inf"), 20.60)
+        ],
+        "band_pricing": "volume",
+        "description": "For industrial consumers with high power requirements"
+    }
+}
+
+# Pass-through charges and levies added to every bill (as of mid-2023)
+BILL_ADJUSTMENTS = {
+    "fuel_energy_cost": 4.40,       # KES per kWh, Fuel Energy Cost Charge (FCC)
+    "forex_adjustment": 1.20,       # KES per kWh, Foreign Exchange Rate Fluctuation Adjustment (FERFA)
+    "inflation_adjustment": 0.46,   # KES per kWh, Inflation Adjustment (INFA)
+    "erc_levy": 0.08,               # KES per kWh, Energy Regulatory levy
+    "wra_levy": 0.03,               # KES per kWh, Water Resources Authority levy
+    "rep_levy_percent": 5.0,        # % of energy charge, Rural Electrification Programme levy
+    "vat_percent": 16.0             # % of energy, pass-through and fixed charges
+}
+
+# Time-of-use tariffs for customers billed on TOU energy and kVA maximum demand.
+# Each period lists its hours of the day (00-23) and energy charge; maximum demand is
+# recorded during the demand hours only, so off-peak battery charging is not penalised.
+TOU_TARIFFS = {
+    "Commercial (DC)": {
+        "category": "Commercial (CI1)",
+        "fixed_charge": 3500,             # KES per month
+        "periods": {
+            "Peak": {"hours": list(range(6, 22)), "energy_charge": 23.50},
+            "Off-Peak": {"hours": [22, 23, 0, 1, 2, 3, 4, 5], "energy_charge": 11.75}
+        },
+        "demand_charge_per_kva": 800,     # KES per kVA of monthly maximum demand
+        "demand_hours": list(range(6, 22)),
+        "power_factor": 0.9,
+        "description": "Commercial and industrial supply at 415 V with TOU metering"
+    },
+    "Industrial": {
+        "category": "Industrial (CI2)",
+        "fixed_charge": 4500,             # KES per month
+        "periods": {
+            "Peak": {"hours": list(range(6, 22)), "energy_charge": 20.60},
+            "Off-Peak": {"hours": [22, 23, 0, 1, 2, 3, 4, 5], "energy_charge": 10.30}
+        },
+        "demand_charge_per_kva": 520,     # KES per kVA of monthly maximum demand
+        "demand_hours": list(range(6, 22)),
+        "power_factor": 0.9,
+        "description": "Industrial supply at 11 kV with TOU metering"
+    }
+}
+
+
 def get_electricity_tariff(consumer_type):
     """
     Get the current electricity tariff information for Kenya.
-    
+
     Parameters:
     consumer_type (str): The type of consumer (Domestic, Small Commercial, Commercial, or Industrial)
-    
+
     Returns:
-    dict: Dictionary containing tariff information
+    dict: Dictionary containing tariff information, consumption bands and bill adjustments
     """
-    # Kenya Power tariff information (as of mid-2023)
-    # These rates should be updated periodically to reflect current tariffs
-    tariffs = {
-        "Domestic": {
-            "category": "Domestic (DC)",
-            "energy_charge": "21.00",  # KES per kWh
-            "fixed_charge": "200",     # KES per month
-            "description": "For domestic consumers with single phase supply"
-        },
-        "Small Commercial": {
-            "category": "Small Commercial (SC)",
-            "energy_charge": "22.70",  # KES per kWh
-            "fixed_charge": "250",     # KES per month
-            "description": "For small commercial consumers with single phase supply"
-        },
-        "Commercial (DC)": {
-            "category": "Commercial (DC)",
-            "energy_charge": "23.50",  # KES per kWh
-            "fixed_charge": "3500",    # KES per month
-            "description": "For commercial consumers with three phase supply"
-        },
-        "Industrial": {
-            "category": "Industrial (IT)",
-            "energy_charge": "20.60",  # KES per kWh
-            "fixed_charge": "4500",    # KES per month
-            "description": "For industrial consumers with high power requirements"
-        }
+    # Return the tariff information for the specified consumer type,
+    # or the domestic tariff as default
+    tariff = ELECTRICITY_TARIFFS.get(consumer_type, ELECTRICITY_TARIFFS["Domestic"])
+    return {
+        **copy.deepcopy(tariff),
+        "adjustments": dict(BILL_ADJUSTMENTS)
+    }
+
+
+def get_tou_tariff(consumer_type):
+    """
+    Get the time-of-use tariff information for a commercial or industrial consumer.
+
+    Parameters:
+    consumer_type (str): The type of consumer (Commercial (DC) or Industrial)
+
+    Returns:
+    dict: Dictionary containing TOU periods, demand charge and bill adjustments
+    """
+    if consumer_type not in TOU_TARIFFS:
+        raise ValueError(f"No time-of-use tariff for consumer type: {consumer_type}")
+    return {
+        **copy.deepcopy(TOU_TARIFFS[consumer_type]),
+        "adjustments": dict(BILL_ADJUSTMENTS)
     }
-    
-    # Return the tariff information for the specified consumer type
-    if consumer_type in tariffs:
-        return tariffs[consumer_type]
-    else:
-        # Return domestic tariff as default
-        return tariffs["Domestic"]
@@ -0,0 +1,40 @@
+def get_reference_load_profiles():
+    """
+    Return reference household and business load profiles for nationwide comparisons.
+    Consumption levels are indicative of typical Kenya Power customers in each group.
+
+    Returns:
+    list: List of dictionaries containing load profile information
+    """
+    profiles = [
+        {
+            "name": "Basic Household",
+            "description": "Lighting, phone charging, TV and radio",
+            "daily_energy_kwh": 1.5,
+            "consumer_type": "Domestic",
+            "ac_load_peak_kw": 0.5
+        },
+        {
+            "name": "Average Household",
+            "description": "Lighting, TV, fridge, iron and small kitchen appliances",
+            "daily_energy_kwh": 5,
+            "consumer_type": "Domestic",
+            "ac_load_peak_kw": 2.0
+        },
+        {
+            "name": "Large Household",
+            "description": "Average household plus electric shower, water pump and home office",
+            "daily_energy_kwh": 12,
+            "consumer_type": "Domestic",
+            "ac_load_peak_kw": 4.0
+        },
+        {
+            "name": "Small Business",
+            "description": "Shop, salon or small office with refrigeration",
+            "daily_energy_kwh": 20,
+            "consumer_type": "Small Commercial",
+            "ac_load_peak_kw": 5.0
+        }
+    ]
+
+    return profiles
@@ -0,0 +1,62 @@
+def get_solar_pumps():
+    """
+    Return a catalog of DC solar water pumps commonly sold in Kenya.
+    Pump curves are described by the shutoff head and maximum flow at rated power,
+    which define a quadratic head-flow curve. Prices are indicative and should be
+    updated periodically.
+
+    Returns:
+    list: List of dictionaries containing pump information
+    """
+    pumps = [
+        {
+            "name": "Surface Pump 550W",
+            "type": "Surface",
+            "rated_power_w": 550,
+            "shutoff_head_m": 35,
+            "max_flow_m3h": 6.0,
+            "price": 40000  # KES
+        },
+        {
+            "name": "Submersible Pump 370W",
+            "type": "Submersible",
+            "rated_power_w": 370,
+            "shutoff_head_m": 60,
+            "max_flow_m3h": 2.5,
+            "price": 45000
+        },
+        {
+            "name": "Submersible Pump 750W",
+            "type": "Submersible",
+            "rated_power_w": 750,
+            "shutoff_head_m": 90,
+            "max_flow_m3h": 4.0,
+            "price": 75000
+        },
+        {
+            "name": "Submersible Pump 1100W",
+            "type": "Submersible",
+            "rated_power_w": 1100,
+            "shutoff_head_m": 110,
+            "max_flow_m3h": 6.0,
+            "price": 105000
+        },
+        {
+            "name": "Submersible Pump 1500W",
+            "type": "Submersible",
+            "rated_power_w": 1500,
+            "shutoff_head_m": 120,
+            "max_flow_m3h": 8.5,
+            "price": 140000
+        },
+        {
+            "name": "Submersible Pump 2200W",
+            "type": "Submersible",
+            "rated_power_w": 2200,
+            "shutoff_head_m": 140,
+            "max_flow_m3h": 12.0,
+            "price": 190000
+        }
+    ]
+
+    return pumps
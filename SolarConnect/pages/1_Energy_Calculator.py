@@ -5,6 +5,7 @@ import io
 import base64
 from data.appliances import common_appliances
 from utils.energy_calculator import calculate_energy_from_appliances, extract_energy_from_bill
+from utils.tariff_engine import calculate_bill, effective_tariff, consumption_from_bill, BILL_COMPONENTS
 import matplotlib.pyplot as plt
 
 # Set page configuration
@@ -179,6 +180,13 @@ with tab2:
         bill_period = st.selectbox("Billing Period", ["1 month", "2 months"])
         period_multiplier = 1 if bill_period == "1 month" else 2
         
+        # Reconstruct the consumption from the bill amount if the kWh are not known
+        bill_amount = st.number_input("Or enter your bill amount (KES)", min_value=0.0, value=0.0, step=100.0,
+                                      help="Total amount of a domestic bill, including levies and VAT")
+        if manually_entered_kwh == 0 and bill_amount > 0:
+            manually_entered_kwh = float(consumption_from_bill(bill_amount / period_multiplier, "Domestic")) * period_multiplier
+            st.write(f"Estimated usage from bill amount: {manually_entered_kwh:.0f} kWh")
+        
         tariff_info = st.checkbox("Enter tariff information", help="Enter your specific electricity tariff rate from the bill")
         
         if tariff_info:
@@ -240,20 +248,17 @@ with tab2:
                         st.write("Billing Period: April 2025")
                         st.write("Meter Number: M98765432")
                         
+                        # Reconstruct the itemized bill with the domestic tariff
                         st.write("**Charges**")
-                        energy_charge = 21.00
-                        st.write(f"Energy Charge: KES {energy_charge}/kWh")
-                        st.write(f"Energy Cost: KES {energy_charge * extracted_kwh:.2f}")
-                        st.write("Fixed Charge: KES 200.00")
-                        st.write(f"Total Bill Amount: KES {(energy_charge * extracted_kwh) + 200:.2f}")
+                        bill = calculate_bill(monthly_kwh, "Domestic")
+                        for name in BILL_COMPONENTS:
+                            st.write(f"{name.replace('_', ' ').title()}: KES {float(bill[name]) * period_multiplier_auto:,.2f}")
+                        st.write(f"Total Bill Amount: KES {float(bill['total']) * period_multiplier_auto:,.2f}")
                         
-                        # Store tariff information from "bill"
+                        # Store tariff information from "bill" as all-in charges
                         if 'custom_tariff' not in st.session_state:
                             st.session_state.custom_tariff = {}
-                        st.session_state.custom_tariff = {
-                            "energy_charge": energy_charge,
-                            "fixed_charge": 200
-                        }
+                        st.session_state.custom_tariff = effective_tariff(monthly_kwh, "Domestic")
                 else:
                     st.error("Could not extract energy consumption from the uploaded bill. Please use manual entry instead.")
                     st.info("Tips: Make sure your bill clearly shows the kWh consumption value. The system looks for terms like 'Total Units', 'Units Consumed', or 'Energy Consumption'.")
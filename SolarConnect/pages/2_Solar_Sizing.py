@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from utils.pvgis_api import get_irradiance_data, get_optimal_tilt_angle
-from utils.solar_calculator import calculate_system_size, calculate_inverter_size, calculate_wire_sizes
+from utils.pipeline import ScenarioPipeline
+from utils.consumption_forecast import forecast_consumption, expansion_factor
+from utils.hourly_simulation import hourly_load_profile
+from utils.transposition import simulate_sub_arrays, compare_roof_designs
 import folium
 from streamlit_folium import folium_static
 
@@ -24,6 +27,8 @@ if 'location' not in st.session_state:
     st.session_state.location = None
 if 'irradiance_data' not in st.session_state:
     st.session_state.irradiance_data = None
+if 'scenario_pipeline' not in st.session_state:
+    st.session_state.scenario_pipeline = ScenarioPipeline()
 
 # App title
 st.title("☀️ Solar System Sizing")
@@ -211,8 +216,20 @@ else:
         efficiency = st.slider("System Efficiency (%)", min_value=70, max_value=95, value=85,
                             help="Overall efficiency of the solar system including losses")
         
-        future_expansion = st.slider("Future Expansion (%)", min_value=0, max_value=100, value=20,
-                                  help="Additional capacity for future needs")
+        if st.checkbox("Size expansion from expected consumption growth"):
+            growth_col1, growth_col2 = st.columns(2)
+            with growth_col1:
+                expected_growth = st.slider("Consumption Growth (%/year)", min_value=0, max_value=15, value=5)
+            with growth_col2:
+                expansion_horizon = st.slider("Years to Cover", min_value=1, max_value=15, value=5)
+            growth_forecast = forecast_consumption(1.0, expected_growth / 100, expansion_horizon)
+            future_expansion = round(float(expansion_factor(growth_forecast)) * 100)
+            load_growth = (growth_forecast.max() / growth_forecast[0] - 1) * 100
+            st.write(f"**Future Expansion:** {future_expansion}% (sizes for year-{expansion_horizon} "
+                     f"consumption, {load_growth:.0f}% above today)")
+        else:
+            future_expansion = st.slider("Future Expansion (%)", min_value=0, max_value=100, value=20,
+                                      help="Additional capacity for future needs")
     
     with col2:
         st.subheader("Technical Parameters")
@@ -231,9 +248,13 @@ else:
             st.error("Please set your location first to get solar irradiance data")
         else:
             with st.spinner("Calculating system size..."):
-                # Calculate system size
-                results = calculate_system_size(
+                # Calculate system size through the scenario pipeline so that only
+                # the stages affected by changed inputs are recomputed
+                pipeline = st.session_state.scenario_pipeline
+                pipeline.set_inputs(
                     daily_energy_kwh=st.session_state.total_daily_energy,
+                    monthly_energy_kwh=st.session_state.total_monthly_energy,
+                    irradiance_data=st.session_state.irradiance_data,
                     peak_sun_hours=peak_sun_hours,
                     panel_wattage=panel_wattage,
                     battery_voltage=battery_voltage,
@@ -242,6 +263,7 @@ else:
                     system_efficiency=efficiency/100,  # Convert percentage to decimal
                     future_expansion=future_expansion/100  # Convert percentage to decimal
                 )
+                results = pipeline.get('sizing')
                 
                 # Store results in session state
                 st.session_state.solar_system_results = results
@@ -307,6 +329,57 @@ else:
         - Expansion Capacity: {future_expansion}%
         """)
         
+        # Roof layout: split the panels over several roof faces
+        st.subheader("Roof Layout")
+        st.write("Split the panels over roof faces with different tilts and orientations to compare yields "
+                 "with a single optimally tilted array. Azimuth is the compass direction a face points "
+                 "(0° = north, 90° = east, 180° = south, 270° = west).")
+
+        latitude = st.session_state.location['latitude']
+        equator_facing = 0 if latitude < 0 else 180
+        optimal_tilt = get_optimal_tilt_angle(latitude)
+        half = results['number_of_panels'] // 2
+        faces = st.data_editor(
+            pd.DataFrame({
+                'name': ['East Face', 'West Face'],
+                'tilt': [15.0, 15.0],
+                'azimuth': [90.0, 270.0],
+                'panels': [results['number_of_panels'] - half, half]
+            }),
+            num_rows="dynamic",
+            key="roof_faces"
+        ).dropna()
+
+        if not faces.empty and faces['panels'].sum() > 0:
+            designs = {
+                'Single Array (optimal tilt)': [{'tilt': optimal_tilt, 'azimuth': equator_facing,
+                                                 'panels': results['number_of_panels']}],
+                'Roof Layout': faces.to_dict('records')
+            }
+            load_kw = hourly_load_profile(results['daily_energy_kwh'])
+            comparison = compare_roof_designs(designs, st.session_state.irradiance_data, latitude, load_kw=load_kw,
+                                              panel_wattage=panel_wattage, system_efficiency=efficiency/100)
+            st.dataframe(comparison.rename(columns={
+                'design': 'Design',
+                'capacity_kw': 'Capacity (kWp)',
+                'annual_kwh': 'Annual Energy (kWh)',
+                'specific_yield_kwh_per_kwp': 'Specific Yield (kWh/kWp)',
+                'effective_peak_sun_hours': 'Effective Peak Sun Hours',
+                'peak_output_kw': 'Peak Output (kW)',
+                'self_consumption_percent': 'Used Directly (%)'
+            }).round(2), hide_index=True)
+
+            # Average daily output of each face
+            layout = simulate_sub_arrays(faces.to_dict('records'), st.session_state.irradiance_data, latitude,
+                                         panel_wattage=panel_wattage, system_efficiency=efficiency/100)
+            daily_profile = pd.DataFrame(
+                layout['face_kw'].reshape(len(faces), -1, 24).mean(axis=1).T,
+                columns=faces['name'].astype(str).tolist()
+            )
+            daily_profile['Load'] = load_kw.reshape(-1, 24).mean(axis=0)
+            daily_profile.index.name = 'Hour'
+            st.line_chart(daily_profile)
+
         # Next steps
         st.divider()
         st.write("Ready to see cost estimates and ROI analysis?")
@@ -2,9 +2,21 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from utils.roi_calculator import calculate_roi, calculate_grid_costs
-from utils.pdf_generator import generate_pdf_report
-from data.kenya_electricity_tariffs import get_electricity_tariff
+from utils.report_cache import cached_pdf_report, get_report_cache
+from utils.battery_degradation import BATTERY_CHEMISTRIES, estimate_battery_replacement_years
+from utils.pipeline import ScenarioPipeline
+from utils.sensitivity import sensitivity_analysis, tornado_data, SENSITIVITY_METRICS
+from utils.monte_carlo import simulate_financial_risk, RISK_ASSUMPTIONS
+from utils.cashflow import monthly_cash_flows, annual_view
+from utils.financing import evaluate_financing_offers
+from utils.tariff_engine import calculate_bill, effective_tariff, BILL_COMPONENTS
+from utils.consumption_forecast import fit_consumption_growth, forecast_consumption, forecast_from_appliance_additions
+from utils.response_surface import build_response_surface, interpolate_surface, exact_scenario, SURFACE_AXES
+from utils.break_even import break_even_surface
+from utils.outage_model import simulate_outage_coverage
+from utils.street_lighting import nearest_county
+from data.kenya_counties import get_kenya_counties
+from data.grid_reliability import get_regional_outage_statistics
 import io
 import base64
 from datetime import datetime
@@ -19,6 +31,106 @@ st.set_page_config(
 # Initialize session state variables for cost analysis if they don't exist
 if 'cost_analysis_results' not in st.session_state:
     st.session_state.cost_analysis_results = None
+if 'scenario_pipeline' not in st.session_state:
+    st.session_state.scenario_pipeline = ScenarioPipeline()
+if 'risk_results' not in st.session_state:
+    st.session_state.risk_results = None
+if 'response_surface' not in st.session_state:
+    st.session_state.response_surface = None
+if 'break_even_results' not in st.session_state:
+    st.session_state.break_even_results = None
+
+
+@st.fragment
+def what_if_explorer(base_inputs):
+    """Answer what-if slider moves from the precomputed response surface; only this section reruns."""
+    # Rebuild the surface only when an input outside its grid has changed
+    fixed_inputs = {name: value for name, value in base_inputs.items() if name not in SURFACE_AXES}
+    surface = st.session_state.response_surface
+    if surface is None or {name: surface['base_inputs'][name] for name in fixed_inputs} != fixed_inputs:
+        surface = build_response_surface(base_inputs)
+        st.session_state.response_surface = surface
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        what_if_inflation = st.slider("Grid Inflation (%/year)", min_value=2.0, max_value=15.0,
+                                      value=float(base_inputs['inflation_rate'] * 100), step=0.5, key="what_if_inflation")
+        what_if_period = st.slider("Analysis Period (years)", min_value=5, max_value=25,
+                                   value=int(base_inputs['analysis_period']), key="what_if_period")
+    with col2:
+        what_if_installation = st.slider("Installation Cost (%)", min_value=5.0, max_value=30.0,
+                                         value=float(base_inputs['installation_percent']), step=1.0,
+                                         key="what_if_installation")
+        what_if_financed = st.slider("Financed Share (%)", min_value=50, max_value=90,
+                                     value=int(round(base_inputs['financing_percentage'] * 100)), key="what_if_financed")
+    with col3:
+        what_if_interest = st.slider("Loan Interest Rate (%)", min_value=6.0, max_value=20.0,
+                                     value=float(base_inputs['financing_interest'] * 100), step=0.5,
+                                     key="what_if_interest")
+    
+    point = {
+        'inflation_rate': what_if_inflation / 100,
+        'analysis_period': what_if_period,
+        'installation_percent': what_if_installation,
+        'financing_percentage': what_if_financed / 100,
+        'financing_interest': what_if_interest / 100
+    }
+    estimate = interpolate_surface(surface, **point)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Payback Period", f"{float(estimate['payback_period']):.1f} years")
+        st.caption(f"± {float(estimate['payback_period_error_bound']):.1f} years")
+    with col2:
+        st.metric("Net Present Value", f"KES {float(estimate['npv']):,.0f}")
+        st.caption(f"± KES {float(estimate['npv_error_bound']):,.0f}")
+    with col3:
+        st.metric("ROI", f"{float(estimate['roi_percent']):.1f}%")
+        st.caption(f"± {float(estimate['roi_percent_error_bound']):.1f}%")
+    
+    if st.button("Compute Exactly", key="what_if_exact"):
+        exact = exact_scenario(surface, **point)
+        st.write(f"**Exact:** payback {float(exact['payback_period']):.2f} years, "
+                 f"NPV KES {float(exact['npv']):,.0f}, ROI {float(exact['roi_percent']):.1f}%")
+
+@st.fragment
+def break_even_explorer(base_inputs, current_price):
+    """Solve and plot break-even system prices; only this section reruns, and only on new inputs."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        break_even_targets = st.multiselect("Target Payback (years)", [3, 5, 7, 10], default=[3, 5, 7])
+    with col2:
+        tariff_range = st.slider("Tariff Range (KES/kWh)", min_value=5.0, max_value=60.0, value=(15.0, 40.0))
+    with col3:
+        inflation_range = st.slider("Inflation Range (%/year)", min_value=0.0, max_value=20.0, value=(2.0, 12.0))
+    
+    if break_even_targets:
+        # Re-solve only when the scenario or the controls have changed
+        request = (base_inputs, sorted(break_even_targets), tariff_range, inflation_range)
+        cached = st.session_state.break_even_results
+        if cached is None or cached['request'] != request:
+            tariff_axis = np.linspace(tariff_range[0], tariff_range[1], 100)
+            inflation_axis = np.linspace(inflation_range[0], inflation_range[1], 100) / 100
+            break_even = break_even_surface(
+                base_inputs,
+                sorted(break_even_targets),
+                energy_charge=tariff_axis,
+                inflation_rate=inflation_axis
+            )
+            
+            fig, axes = plt.subplots(1, len(break_even_targets), figsize=(5 * len(break_even_targets), 4), squeeze=False)
+            for ax, target, price in zip(axes[0], break_even['targets'], break_even['system_price_per_wp']):
+                contour = ax.contourf(inflation_axis * 100, tariff_axis, price, levels=12, cmap='viridis')
+                fig.colorbar(contour, ax=ax, label='KES/Wp')
+                ax.set_title(f'{target:.0f}-Year Payback')
+                ax.set_xlabel('Grid Inflation (%/year)')
+                ax.set_ylabel('Tariff (KES/kWh)')
+            fig.tight_layout()
+            cached = {'request': request, 'figure': fig}
+            st.session_state.break_even_results = cached
+        st.pyplot(cached['figure'])
+    
+    st.write(f"Current system price: KES {current_price:,.0f}/Wp")
 
 # App title
 st.title("💰 Cost Comparison & ROI Analysis")
@@ -69,6 +181,27 @@ else:
         
         battery_replacement_years = st.slider("Battery Replacement (years)", min_value=5, max_value=15, value=10,
                                         help="Expected battery replacement interval in years")
+        
+        battery_chemistry = st.selectbox("Battery Chemistry", list(BATTERY_CHEMISTRIES.keys()), index=1,
+                                      help="Battery chemistry used for the cycle-life estimate")
+        
+        estimate_battery_life = st.checkbox("Estimate replacement from battery cycling",
+                                         help="Simulate a year of hourly operation and project battery life from the charge cycles")
+        
+        if estimate_battery_life:
+            if st.session_state.get('irradiance_data'):
+                battery_projection = estimate_battery_replacement_years(
+                    results,
+                    st.session_state.irradiance_data,
+                    chemistry=battery_chemistry,
+                    battery_dod=st.session_state.scenario_pipeline.inputs['battery_dod']
+                )
+                battery_replacement_years = battery_projection['replacement_year']
+                st.info(f"Projected battery life: {battery_projection['projected_life_years']:.1f} years "
+                        f"({battery_projection['equivalent_full_cycles_per_year']:.0f} full cycles/year). "
+                        f"Batteries will be replaced every {battery_replacement_years} years.")
+            else:
+                st.warning("Set your location on the Solar Sizing page to estimate battery life")
     
     with col2:
         st.subheader("Grid Electricity Parameters")
@@ -90,26 +223,37 @@ else:
             # Select tariff type
             consumer_type = st.selectbox("Consumer Type", ["Domestic", "Small Commercial", "Commercial (DC)", "Industrial"])
             
-            # Get tariff based on selection
-            tariff_info = get_electricity_tariff(consumer_type)
+            # Full monthly bill at the household's consumption, including pass-through
+            # charges, levies and VAT, expressed as all-in energy and fixed charges
+            monthly_bill = calculate_bill(st.session_state.total_monthly_energy, consumer_type)
+            tariff_info = effective_tariff(st.session_state.total_monthly_energy, consumer_type)
             
             # Display tariff information
-            st.write(f"**Tariff Rate:** KES {tariff_info['energy_charge']}/kWh")
-            st.write(f"**Fixed Charge:** KES {tariff_info['fixed_charge']}/month")
+            st.write(f"**Tariff Rate (all-in):** KES {tariff_info['energy_charge']:.2f}/kWh")
+            st.write(f"**Fixed Charge (incl. VAT):** KES {tariff_info['fixed_charge']:.2f}/month")
             
-            energy_charge = float(tariff_info['energy_charge'])
-            fixed_charge = int(tariff_info['fixed_charge'])
+            with st.expander("Monthly Bill Breakdown"):
+                st.dataframe(pd.DataFrame({
+                    'Item': [name.replace('_', ' ').title() for name in BILL_COMPONENTS] + ['Total'],
+                    'Amount (KES)': [float(monthly_bill[name]) for name in BILL_COMPONENTS] + [float(monthly_bill['total'])]
+                }).style.format({'Amount (KES)': "{:,.2f}"}))
+            
+            energy_charge = tariff_info['energy_charge']
+            fixed_charge = tariff_info['fixed_charge']
+            # Each year is billed with the full tariff, so consumption growth can cross bands
+            tariff = consumer_type
             
         elif tariff_source == "From Bill" and has_custom_tariff:
             # Use tariff information extracted from bill
             bill_tariff = st.session_state.custom_tariff
             
             # Display the tariff info from the bill
-            st.write(f"**Tariff Rate from Bill:** KES {bill_tariff['energy_charge']}/kWh")
-            st.write(f"**Fixed Charge from Bill:** KES {bill_tariff['fixed_charge']}/month")
+            st.write(f"**Tariff Rate from Bill:** KES {float(bill_tariff['energy_charge']):.2f}/kWh")
+            st.write(f"**Fixed Charge from Bill:** KES {float(bill_tariff['fixed_charge']):.2f}/month")
             
             energy_charge = float(bill_tariff['energy_charge'])
-            fixed_charge = int(bill_tariff['fixed_charge'])
+            fixed_charge = float(bill_tariff['fixed_charge'])
+            tariff = None
             
         else:  # Custom Input
             # Allow custom input of rates
@@ -126,6 +270,7 @@ else:
                 max_value=5000, 
                 value=200 if not has_custom_tariff else int(st.session_state.custom_tariff['fixed_charge'])
             )
+            tariff = None
         
         # Grid electricity inflation rate
         grid_inflation = st.slider("Grid Electricity Inflation (%/year)", min_value=2, max_value=15, value=5,
@@ -134,50 +279,79 @@ else:
         # Analysis period
         analysis_period = st.slider("Analysis Period (years)", min_value=5, max_value=25, value=20,
                                  help="Period over which to compare solar vs grid costs")
+        
+        # Discount rate for NPV and levelized cost of energy
+        discount_rate = st.slider("Discount Rate (%/year)", min_value=0, max_value=25, value=10,
+                               help="Return you could earn elsewhere; used for net present value and cost of energy")
+        
+        # Consumption growth over the analysis period
+        growth_source = st.radio("Consumption Growth", ["Fixed Rate", "From Bill History", "Appliance Additions"],
+                                 horizontal=True,
+                                 help="Households often add appliances over time, which raises future grid bills")
+        base_annual_kwh = st.session_state.total_monthly_energy * 12
+        if growth_source == "From Bill History":
+            bill_history = st.text_area("Monthly consumption from past bills (kWh, oldest first, comma-separated)",
+                                        placeholder="280, 295, 290, 310, 305, 320, ...")
+            history = [float(value) for value in bill_history.replace('\n', ',').split(',') if value.strip()]
+            if len(history) >= 3:
+                fit = fit_consumption_growth(np.array(history))
+                consumption_growth = float(fit['growth_rate'])
+                st.write(f"**Fitted growth:** {consumption_growth * 100:.1f}%/year (R² {float(fit['r_squared']):.2f})")
+            else:
+                consumption_growth = 0.0
+                st.info("Enter at least 3 months of consumption to fit a growth rate")
+            consumption_by_year = forecast_consumption(base_annual_kwh, consumption_growth, analysis_period)
+        elif growth_source == "Appliance Additions":
+            added_daily_kwh = st.number_input("Daily consumption added each year (kWh/day)", min_value=0.0,
+                                              max_value=50.0, value=0.5, step=0.1)
+            consumption_by_year = forecast_from_appliance_additions(base_annual_kwh, added_daily_kwh, analysis_period)
+            # Equivalent constant growth rate for the batch analyses
+            consumption_growth = float((consumption_by_year[-1] / consumption_by_year[0]) ** (1 / max(analysis_period - 1, 1)) - 1)
+        else:
+            consumption_growth = st.slider("Consumption Growth (%/year)", min_value=0, max_value=15, value=0) / 100
+            consumption_by_year = forecast_consumption(base_annual_kwh, consumption_growth, analysis_period)
+        if consumption_growth > 0:
+            st.write(f"**Consumption in year {analysis_period}:** {consumption_by_year[-1]:,.0f} kWh "
+                     f"({(consumption_by_year[-1] / consumption_by_year[0] - 1) * 100:.0f}% above today)")
     
     # Calculate button
     if st.button("Calculate ROI & Cost Comparison", type="primary"):
         with st.spinner("Calculating costs and ROI..."):
-            # Calculate solar system costs
-            panel_cost = results['total_panel_capacity_kw'] * 1000 * panel_cost_per_wp
-            battery_cost = results['battery_capacity_kwh'] * battery_cost_per_kwh
-            inverter_cost = inverter_size * inverter_cost_per_kw
-            
-            equipment_cost = panel_cost + battery_cost + inverter_cost
-            installation_cost = equipment_cost * (installation_percent / 100)
-            
-            total_initial_cost = equipment_cost + installation_cost
-            
-            # Calculate grid electricity costs
-            monthly_energy_kwh = st.session_state.total_monthly_energy
-            annual_energy_kwh = monthly_energy_kwh * 12
-            
-            grid_costs = calculate_grid_costs(
-                annual_energy_kwh=annual_energy_kwh,
+            # Run the cost, grid cost and ROI stages of the scenario pipeline,
+            # using the system sized on the Solar Sizing page
+            pipeline = st.session_state.scenario_pipeline
+            pipeline.set_inputs(
+                daily_energy_kwh=st.session_state.total_daily_energy,
+                monthly_energy_kwh=st.session_state.total_monthly_energy,
+                panel_cost_per_wp=panel_cost_per_wp,
+                battery_cost_per_kwh=battery_cost_per_kwh,
+                inverter_cost_per_kw=inverter_cost_per_kw,
+                installation_percent=installation_percent,
+                maintenance_annual=maintenance_annual,
+                battery_replacement_years=battery_replacement_years,
                 energy_charge=energy_charge,
                 fixed_charge=fixed_charge,
+                tariff=tariff,
                 inflation_rate=grid_inflation/100,  # Convert percentage to decimal
-                years=analysis_period
+                analysis_period=analysis_period,
+                discount_rate=discount_rate/100,
+                consumption_growth=consumption_growth,
+                consumption_by_year=consumption_by_year
             )
+            pipeline.provide('sizing', results)
             
-            # Calculate ROI and payback period
-            roi_results = calculate_roi(
-                total_initial_cost=total_initial_cost,
-                annual_maintenance=maintenance_annual,
-                battery_replacement_cost=battery_cost,
-                battery_replacement_years=battery_replacement_years,
-                grid_costs=grid_costs,
-                analysis_period=analysis_period
-            )
+            costs = pipeline.get('costs')
+            grid_costs = pipeline.get('grid_costs')
+            roi_results = pipeline.get('roi')
             
             # Store results in session state
             st.session_state.cost_analysis_results = {
-                "panel_cost": panel_cost,
-                "battery_cost": battery_cost,
-                "inverter_cost": inverter_cost,
-                "equipment_cost": equipment_cost,
-                "installation_cost": installation_cost,
-                "total_initial_cost": total_initial_cost,
+                "panel_cost": costs['panel_cost'],
+                "battery_cost": costs['battery_cost'],
+                "inverter_cost": costs['inverter_cost'],
+                "equipment_cost": costs['equipment_cost'],
+                "installation_cost": costs['installation_cost'],
+                "total_initial_cost": costs['total_initial_cost'],
                 "maintenance_annual": maintenance_annual,
                 "battery_replacement_years": battery_replacement_years,
                 "grid_costs": grid_costs,
@@ -185,7 +359,8 @@ else:
                 "energy_charge": energy_charge,
                 "fixed_charge": fixed_charge,
                 "grid_inflation": grid_inflation,
-                "analysis_period": analysis_period
+                "analysis_period": analysis_period,
+                "discount_rate": discount_rate
             }
             
             st.success("Calculation complete!")
@@ -214,27 +389,23 @@ else:
                 down_payment_percent = st.slider("Down Payment (%)", min_value=10, max_value=50, value=30,
                                           help="Percentage of the total cost paid upfront")
             with col2:
-                loan_term_years = st.slider("Loan Term (years)", min_value=3, max_value=10, value=7,
-                                       help="Duration of the solar loan")
+                loan_term_months = st.slider("Loan Term (months)", min_value=12, max_value=120, value=84, step=6,
+                                        help="Duration of the solar loan")
             with col3:
                 interest_rate = st.slider("Interest Rate (%)", min_value=6, max_value=20, value=12,
                                      help="Annual interest rate on the solar loan")
             
-            # Update ROI calculation with new financing parameters
+            # Update ROI calculation with new financing parameters; only the ROI
+            # stage of the pipeline is recomputed, and only if the terms changed
             if 'total_initial_cost' in results:
                 financing_percentage = (100 - down_payment_percent) / 100
-                roi_data = calculate_roi(
-                    total_initial_cost=results['total_initial_cost'],
-                    annual_maintenance=results['maintenance_annual'],
-                    battery_replacement_cost=results['battery_cost'],
-                    battery_replacement_years=results['battery_replacement_years'],
-                    grid_costs=results['grid_costs'],
-                    analysis_period=results['analysis_period'],
+                pipeline = st.session_state.scenario_pipeline
+                pipeline.set_inputs(
                     financing_percentage=financing_percentage,
-                    financing_years=loan_term_years,
+                    financing_years=loan_term_months / 12,
                     financing_interest=interest_rate/100
                 )
-                results['roi_results'] = roi_data
+                results['roi_results'] = pipeline.get('roi')
         
         col1, col2, col3 = st.columns(3)
         
@@ -266,7 +437,76 @@ else:
                 st.metric("Loan Amount", f"KES {fin['financed_amount']:,.2f}")
             with col2:
                 st.metric("Monthly Payment", f"KES {fin['monthly_payment']:,.2f}")
-                st.metric("Loan Term", f"{fin['financing_years']} years")
+                st.metric("Loan Term", f"{fin['financing_years'] * 12:.0f} months")
+            
+            # Month-by-month loan schedule from the monthly cash-flow engine
+            with st.expander("Loan Amortization Schedule"):
+                pipeline = st.session_state.scenario_pipeline
+                inputs = pipeline.inputs
+                cash_flows = monthly_cash_flows(
+                    total_initial_cost=results['total_initial_cost'],
+                    annual_maintenance=results['maintenance_annual'],
+                    battery_replacement_cost=results['battery_cost'],
+                    battery_replacement_years=results['battery_replacement_years'],
+                    annual_energy_kwh=pipeline.get('energy')['annual_kwh'],
+                    energy_charge=results['energy_charge'],
+                    fixed_charge=results['fixed_charge'],
+                    inflation_rate=results['grid_inflation'] / 100,
+                    analysis_period=results['analysis_period'],
+                    financing_percentage=inputs['financing_percentage'],
+                    financing_months=loan_term_months,
+                    financing_interest=inputs['financing_interest'],
+                    discount_rate=inputs['discount_rate'],
+                    tariff=inputs['tariff'],
+                    consumption_by_year=pipeline.get('consumption')
+                )
+                loan_months = int(min(loan_term_months, cash_flows['months']))
+                schedule = pd.DataFrame({
+                    'Month': np.arange(1, loan_months + 1),
+                    'Payment (KES)': cash_flows['loan_payment'][:loan_months],
+                    'Interest (KES)': cash_flows['loan_interest'][:loan_months],
+                    'Principal (KES)': cash_flows['loan_principal'][:loan_months],
+                    'Balance (KES)': cash_flows['loan_balance'][:loan_months]
+                })
+                st.dataframe(schedule.style.format({col: "{:,.2f}" for col in schedule.columns if col != 'Month'}))
+                
+                annual = annual_view(cash_flows)
+                st.write(f"Total interest paid: KES {annual['loan_interest'].sum():,.2f}")
+                if cash_flows['pays_back']:
+                    st.write(f"Payback at monthly resolution: {cash_flows['payback_months'] / 12:.2f} years")
+        
+        # Compare the whole catalog of bank, SACCO and pay-as-you-go offers in one pass
+        with st.expander("Compare Financing Offers"):
+            pipeline = st.session_state.scenario_pipeline
+            offers = evaluate_financing_offers(
+                total_initial_cost=results['total_initial_cost'],
+                annual_maintenance=results['maintenance_annual'],
+                battery_replacement_cost=results['battery_cost'],
+                battery_replacement_years=results['battery_replacement_years'],
+                annual_energy_kwh=pipeline.get('energy')['annual_kwh'],
+                energy_charge=results['energy_charge'],
+                fixed_charge=results['fixed_charge'],
+                inflation_rate=results['grid_inflation'] / 100,
+                analysis_period=results['analysis_period'],
+                discount_rate=pipeline.inputs['discount_rate']
+            )
+            rank_by = st.radio("Rank by", ["Net Present Value", "Total Cost", "Monthly Burden"], horizontal=True)
+            rank_column = {"Net Present Value": 'rank_npv', "Total Cost": 'rank_total_cost',
+                           "Monthly Burden": 'rank_monthly_burden'}[rank_by]
+            offers = offers.sort_values(rank_column)
+            
+            st.dataframe(pd.DataFrame({
+                'Offer': offers['name'],
+                'Provider': offers['provider_type'],
+                'Upfront (KES)': offers['upfront_payment'],
+                'Monthly Payment (KES)': offers['monthly_payment'],
+                'Net Monthly Cost, Year 1 (KES)': offers['monthly_burden'],
+                'Total Paid (KES)': offers['total_paid'],
+                'NPV (KES)': offers['npv'],
+                'Payback (years)': offers['payback_years']
+            }).style.format({'Payback (years)': "{:.1f}"}, precision=0, thousands=","), hide_index=True)
+            st.caption("Net monthly cost is the average monthly payment minus the grid bill savings in the first year; "
+                       "negative values mean the system saves more than it costs from the start.")
         
         # Display ROI summary
         st.subheader("Return on Investment")
@@ -295,7 +535,10 @@ else:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Payback Period", f"{roi_data['payback_period']:.1f} years")
+            if roi_data.get('pays_back', True):
+                st.metric("Payback Period", f"{roi_data['payback_period']:.1f} years")
+            else:
+                st.metric("Payback Period", f"Over {results['analysis_period']} years")
         
         with col2:
             st.metric("Lifetime Savings", f"KES {roi_data['total_savings']:,.2f}")
@@ -303,6 +546,27 @@ else:
         with col3:
             st.metric("ROI (%)", f"{roi_data['roi_percent']:.1f}%")
         
+        # Discounted returns
+        if 'npv' in roi_data:
+            st.subheader("Discounted Returns")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Net Present Value", f"KES {roi_data['npv']:,.0f}",
+                          help=f"Value of the savings today at a {roi_data['discount_rate'] * 100:.0f}% discount rate")
+            
+            with col2:
+                if np.isnan(roi_data['irr']):
+                    st.metric("Internal Rate of Return", "n/a")
+                else:
+                    st.metric("Internal Rate of Return", f"{roi_data['irr'] * 100:.1f}%")
+            
+            with col3:
+                st.metric("Solar Cost of Energy", f"KES {roi_data['lcoe_solar']:.2f}/kWh")
+            
+            with col4:
+                st.metric("Grid Cost of Energy", f"KES {roi_data['lcoe_grid']:.2f}/kWh")
+        
         # Grid vs Solar comparison over time
         st.subheader("Grid vs Solar: Cumulative Cost Comparison")
         
@@ -384,6 +648,169 @@ else:
         # Show the dataframe
         st.dataframe(yearly_df)
         
+        # What-if exploration answered by interpolation over a precomputed grid of scenarios
+        st.subheader("What-If Explorer")
+        st.write("Explore other assumptions instantly. Results are interpolated from a precomputed grid of "
+                 "scenarios with an error bound; use Compute Exactly for the precise figures.")
+        what_if_explorer(st.session_state.scenario_pipeline.evaluation_inputs())
+        
+        # Break-even pricing: the system price at which payback hits each target
+        with st.expander("Break-Even System Price"):
+            st.write("System price per Wp (equipment and installation) at which this system pays back "
+                     "within each target, across tariff and grid inflation levels.")
+            current_price = results['total_initial_cost'] / (st.session_state.solar_system_results['total_panel_capacity_kw'] * 1000)
+            break_even_explorer(st.session_state.scenario_pipeline.evaluation_inputs(), current_price)
+        
+        # Backup value during Kenya Power outages
+        with st.expander("Outage Backup Value"):
+            st.write("Simulate thousands of years of grid outages to see how much outage time your "
+                     "system covers and what that is worth.")
+            location = st.session_state.get('location') or {}
+            region = location.get('region')
+            if region is None and 'latitude' in location:
+                county = nearest_county([location['latitude']], [location['longitude']])[0][0]
+                region = get_kenya_counties()[county]['region']
+            regions = list(get_regional_outage_statistics().keys())
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                outage_region = st.selectbox("Region", regions, index=regions.index(region) if region in regions else 0)
+                outage_stats = get_regional_outage_statistics()[outage_region]
+                st.write(f"**Typical outages:** {outage_stats['outages_per_year']} per year, "
+                         f"median {outage_stats['median_duration_hours']:.1f} hours")
+            with col2:
+                critical_load_percent = st.slider("Load Kept On During Outages (%)", min_value=10, max_value=100, value=100)
+            with col3:
+                outage_cost_per_hour = st.number_input("Cost of an Hour Without Power (KES)", min_value=0, max_value=100000,
+                                                       value=150, help="Lost sales, generator fuel or spoiled goods")
+            
+            sized_system = st.session_state.solar_system_results
+            outages = simulate_outage_coverage(
+                outage_region,
+                battery_capacity_kwh=sized_system['battery_capacity_kwh'],
+                daily_energy_kwh=st.session_state.total_daily_energy,
+                battery_dod=st.session_state.scenario_pipeline.inputs['battery_dod'],
+                panel_capacity_kw=sized_system['total_panel_capacity_kw'],
+                peak_sun_hours=sized_system['peak_sun_hours'],
+                critical_load_fraction=critical_load_percent / 100,
+                outage_cost_per_hour=outage_cost_per_hour,
+                seed=0
+            )
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Outage Hours Covered", f"{outages['coverage_fraction'] * 100:.1f}%")
+            with col2:
+                st.metric("Outage Hours per Year", f"{outages['mean']['outage_hours']:.0f}")
+            with col3:
+                st.metric("Avoided Losses per Year", f"KES {outages['mean']['avoided_loss']:,.0f}")
+            
+            percentiles = outages['percentiles']
+            st.write(f"In a bad year (95th percentile) there are {percentiles['outage_hours'][95]:.0f} outage hours "
+                     f"and {percentiles['unserved_kwh'][95]:.1f} kWh of the load goes unserved.")
+        
+        # Sensitivity analysis: every input is varied in one batched evaluation
+        st.subheader("Sensitivity Analysis")
+        st.write("How much each assumption moves the result when varied over a realistic range, with all other inputs unchanged.")
+        
+        sensitivity_metric = st.selectbox(
+            "Metric",
+            list(SENSITIVITY_METRICS.keys()),
+            format_func=lambda metric: SENSITIVITY_METRICS[metric],
+            index=1
+        )
+        
+        sensitivity = sensitivity_analysis(st.session_state.scenario_pipeline.evaluation_inputs())
+        tornado = tornado_data(sensitivity, sensitivity_metric)
+        base_value = sensitivity['base'][sensitivity_metric]
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
+        positions = np.arange(len(tornado))[::-1]
+        ax.barh(positions, tornado['low'] - base_value, left=base_value, color='tab:blue', label='Low value')
+        ax.barh(positions, tornado['high'] - base_value, left=base_value, color='tab:orange', label='High value')
+        ax.axvline(base_value, color='black', linewidth=1)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(tornado['label'])
+        ax.set_xlabel(SENSITIVITY_METRICS[sensitivity_metric])
+        ax.set_title('Tornado Chart')
+        ax.legend()
+        ax.grid(True, axis='x')
+        
+        st.pyplot(fig)
+        
+        with st.expander("Sensitivity Details"):
+            st.dataframe(tornado)
+        
+        # Monte Carlo risk analysis of tariff escalation, prices, degradation and battery life
+        st.subheader("Risk Analysis")
+        st.write("Kenya's grid tariffs change with fuel cost charges, forex adjustments and tariff reviews. "
+                 "Simulate thousands of possible futures to see the range of outcomes.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            risk_paths = st.select_slider("Simulated Futures", options=[1000, 10000, 50000, 100000], value=10000)
+        with col2:
+            escalation_volatility = st.slider(
+                "Tariff Volatility (%/year)", min_value=0.0, max_value=15.0,
+                value=RISK_ASSUMPTIONS['escalation_volatility'] * 100, step=0.5
+            ) / 100
+            tariff_review_probability = st.slider(
+                "Tariff Review Chance (%/year)", min_value=0, max_value=50,
+                value=int(RISK_ASSUMPTIONS['tariff_review_probability'] * 100)
+            ) / 100
+        with col3:
+            equipment_cost_uncertainty = st.slider(
+                "Equipment Price Uncertainty (%)", min_value=0, max_value=50,
+                value=int(RISK_ASSUMPTIONS['equipment_cost_uncertainty'] * 100)
+            ) / 100
+            battery_life_uncertainty = st.slider(
+                "Battery Life Uncertainty (%)", min_value=0, max_value=50,
+                value=int(RISK_ASSUMPTIONS['battery_life_uncertainty'] * 100)
+            ) / 100
+        
+        if st.button("Run Risk Analysis"):
+            with st.spinner("Simulating possible futures..."):
+                st.session_state.risk_results = simulate_financial_risk(
+                    st.session_state.scenario_pipeline.evaluation_inputs(),
+                    paths=risk_paths,
+                    assumptions={
+                        'escalation_volatility': escalation_volatility,
+                        'tariff_review_probability': tariff_review_probability,
+                        'equipment_cost_uncertainty': equipment_cost_uncertainty,
+                        'battery_life_uncertainty': battery_life_uncertainty
+                    }
+                )
+        
+        if st.session_state.risk_results:
+            risk = st.session_state.risk_results
+            npv_percentiles = risk['percentiles'].loc['npv']
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Chance of Paying Back", f"{risk['probability_of_payback'] * 100:.0f}%")
+            with col2:
+                st.metric("Chance of Positive NPV", f"{risk['probability_positive_npv'] * 100:.0f}%")
+            with col3:
+                st.metric("Median NPV", f"KES {npv_percentiles['P50']:,.0f}")
+            
+            fig, ax = plt.subplots(figsize=(10, 5))
+            ax.hist(risk['samples']['npv'], bins=60, color='tab:green', alpha=0.7)
+            for label in ['P10', 'P50', 'P90']:
+                ax.axvline(npv_percentiles[label], color='black', linestyle='--', linewidth=1)
+                ax.text(npv_percentiles[label], ax.get_ylim()[1] * 0.95, f' {label}', fontsize=9)
+            ax.set_xlabel('Net Present Value (KES)')
+            ax.set_ylabel('Simulated Futures')
+            ax.set_title(f'NPV Distribution ({risk["paths"]:,} simulated futures)')
+            ax.grid(True, alpha=0.3)
+            
+            st.pyplot(fig)
+            
+            with st.expander("Risk Percentiles"):
+                st.dataframe(risk['percentiles'])
+                if risk['probability_of_payback'] < 1:
+                    st.caption(f"{(1 - risk['probability_of_payback']) * 100:.0f}% of the simulated futures do not pay "
+                               "back within the analysis period; payback percentiles that fall among them are left blank.")
+        
         # Generate PDF report
         st.header("Generate PDF Report")
         
@@ -416,12 +843,11 @@ else:
                         "location": st.session_state.location,
                         "solar_sizing": st.session_state.solar_system_results,
                         "cost_analysis": st.session_state.cost_analysis_results,
-                        "roi_data": roi_data,
-                        "yearly_comparison": yearly_df
+                        "roi_data": roi_data
                     }
                     
-                    # Generate the PDF report
-                    pdf_bytes = generate_pdf_report(report_data)
+                    # Generate the PDF report, reusing the cached one if nothing in it changed
+                    pdf_bytes = cached_pdf_report(report_data)
                     
                     # Create a download button for the PDF
                     b64_pdf = base64.b64encode(pdf_bytes).decode()
@@ -429,6 +855,9 @@ else:
                     st.markdown(href, unsafe_allow_html=True)
                     
                     st.success("PDF report generated successfully!")
+                    cache_stats = get_report_cache().stats()
+                    st.caption(f"Report cache: {cache_stats['hit_rate'] * 100:.0f}% hit rate, "
+                               f"{cache_stats['entries']} reports, {cache_stats['bytes_stored'] / 1024:.0f} KB stored")
         
         # Next steps
         st.divider()
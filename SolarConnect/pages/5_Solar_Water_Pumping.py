@@ -0,0 +1,126 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from utils.water_pumping import size_pumping_system
+from utils.pvgis_api import KENYA_MONTHLY_AVERAGES
+from data.kenya_counties import get_kenya_counties
+from data.solar_pumps import get_solar_pumps
+
+# Set page configuration
+st.set_page_config(
+    page_title="Solar Water Pumping - Solar Sizing App",
+    page_icon="💧",
+    layout="wide"
+)
+
+# Initialize session state for pumping results if it doesn't exist
+if 'pumping_results' not in st.session_state:
+    st.session_state.pumping_results = None
+
+# App title
+st.title("💧 Solar Water Pumping Sizing")
+
+st.write("""
+Size a solar water pumping system for a borehole, well or river intake. The app simulates
+a typical year of hourly pumping for every combination of pump and array size and recommends
+the lowest-cost design that meets your daily water demand.
+""")
+
+# Sizing parameters
+st.header("Pumping Requirements")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Water Demand")
+    daily_water_demand = st.number_input("Daily Water Demand (m³/day)", min_value=1.0, max_value=200.0, value=20.0,
+                                      help="Average volume of water needed per day (1 m³ = 1,000 litres)")
+
+    total_dynamic_head = st.number_input("Total Dynamic Head (m)", min_value=5.0, max_value=200.0, value=40.0,
+                                      help="Vertical lift from the water level to the tank outlet plus pipe friction losses")
+
+    max_storage_days = st.slider("Maximum Tank Storage (days)", min_value=1.0, max_value=5.0, value=3.0, step=0.5,
+                              help="Largest acceptable storage tank, in days of water demand")
+
+with col2:
+    st.subheader("Location & Costs")
+
+    # Use the location set on the Solar Sizing page if available
+    if st.session_state.get('irradiance_data'):
+        irradiance_data = st.session_state.irradiance_data
+        st.write(f"**Location:** {st.session_state.location['location_name']}")
+    else:
+        counties = get_kenya_counties()
+        selected_county = st.selectbox("County", sorted(counties.keys()))
+        irradiance_data = {
+            "peak_sun_hours": counties[selected_county]["climate"]["peak_sun_hours"],
+            "monthly_averages": list(KENYA_MONTHLY_AVERAGES),
+            "source": "Kenya Counties Database"
+        }
+
+    st.write(f"**Peak Sun Hours:** {irradiance_data['peak_sun_hours']:.2f} hours/day")
+
+    panel_wattage = st.selectbox("Solar Panel Wattage (W)", [250, 300, 330, 400, 450, 500, 550], index=3)
+    panel_cost_per_wp = st.number_input("Solar Panel Cost (KES/Wp)", min_value=50, max_value=200, value=90)
+    tank_cost_per_m3 = st.number_input("Storage Tank Cost (KES/m³)", min_value=2000, max_value=50000, value=10000)
+
+with st.expander("Pump Catalog"):
+    st.dataframe(pd.DataFrame(get_solar_pumps()))
+
+# Calculate button
+if st.button("Size Pumping System", type="primary"):
+    with st.spinner("Evaluating pump and array combinations..."):
+        st.session_state.pumping_results = size_pumping_system(
+            daily_water_demand_m3=daily_water_demand,
+            total_dynamic_head_m=total_dynamic_head,
+            irradiance_data=irradiance_data,
+            panel_wattage=panel_wattage,
+            max_storage_days=max_storage_days,
+            panel_cost_per_wp=panel_cost_per_wp,
+            tank_cost_per_m3=tank_cost_per_m3
+        )
+
+# Display pumping results if available
+if st.session_state.pumping_results:
+    results = st.session_state.pumping_results
+
+    if not results['feasible']:
+        st.error("No pump in the catalog can meet this demand at this head. Try reducing the demand or allowing more storage.")
+    else:
+        st.header("Recommended Pumping System")
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Pump", results['pump']['name'])
+        with col2:
+            st.metric("Solar Array", f"{results['array_kw']:.2f} kWp")
+            st.write(f"Number of Panels: {results['number_of_panels']}")
+        with col3:
+            st.metric("Storage Tank", f"{results['tank_m3']:.0f} m³")
+        with col4:
+            st.metric("Estimated Cost", f"KES {results['total_cost']:,.0f}")
+
+        simulation = results['simulation']
+        st.write(f"The system pumps approximately {simulation['annual_pumped_m3']:,.0f} m³ per year "
+                 f"and meets {simulation['reliability'] * 100:.1f}% of the annual demand.")
+
+        # Plot a week of tank levels
+        st.subheader("Tank Level (first week of the year)")
+        hours = np.arange(7 * 24)
+        fig, ax = plt.subplots(figsize=(10, 4))
+        ax.plot(hours, simulation['tank_level_m3'][:len(hours)], 'b-', label='Tank Level')
+        ax.bar(hours, simulation['pumped_m3'][:len(hours)], color='orange', alpha=0.5, label='Pumped per Hour')
+        ax.set_xlabel('Hour')
+        ax.set_ylabel('Volume (m³)')
+        ax.legend()
+        ax.grid(True)
+        st.pyplot(fig)
+
+        with st.expander("All Evaluated Designs"):
+            candidates = results['candidates']
+            st.dataframe(candidates[candidates['feasible']].sort_values('total_cost'))
+
+    st.divider()
+    st.write("Looking for a pumping specialist?")
+    st.page_link("pages/4_Installer_Directory.py", label="Find Installers", icon="👷")
@@ -0,0 +1,110 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from utils.street_lighting import design_street_lighting, DIMMING_PROFILES
+
+# Set page configuration
+st.set_page_config(
+    page_title="Solar Street Lighting - Solar Sizing App",
+    page_icon="🛣️",
+    layout="wide"
+)
+
+# Initialize session state for street-lighting results if it doesn't exist
+if 'street_lighting_results' not in st.session_state:
+    st.session_state.street_lighting_results = None
+
+# App title
+st.title("🛣️ Solar Street Lighting Design")
+
+st.write("""
+Design all-in-one solar street lights for road and estate projects. Upload the pole schedule
+from the tender and every pole gets a panel and battery sized for its own location, with a
+bill of materials for the whole project.
+""")
+
+# Pole schedule
+st.header("Pole Schedule")
+st.write("Upload a CSV file with the columns **latitude**, **longitude** and **luminaire_w**. "
+         "Optional columns: **pole_id**, **dimming_profile** and **peak_sun_hours**.")
+
+pole_upload = st.file_uploader("Upload pole schedule", type=["csv"])
+
+if pole_upload is not None:
+    poles = pd.read_csv(pole_upload)
+else:
+    # Example project along a road between two points
+    number_of_poles = st.number_input("Number of poles (example road project)", min_value=1, max_value=5000, value=100)
+    poles = pd.DataFrame({
+        "latitude": np.linspace(-1.29, -0.42, number_of_poles),
+        "longitude": np.linspace(36.82, 36.95, number_of_poles),
+        "luminaire_w": np.where(np.arange(number_of_poles) % 5 == 0, 60, 40)
+    })
+
+st.dataframe(poles.head(20))
+
+# Design parameters
+st.header("Design Parameters")
+col1, col2 = st.columns(2)
+
+with col1:
+    dimming_profile = st.selectbox("Default Dimming Profile", list(DIMMING_PROFILES.keys()), index=1,
+                                help="Applied to poles without their own dimming profile")
+    autonomy_days = st.slider("Autonomy (nights)", min_value=1, max_value=5, value=3,
+                           help="Number of nights the battery must cover without any sun")
+    battery_dod = st.slider("Battery Depth of Discharge (%)", min_value=50, max_value=95, value=90)
+
+with col2:
+    panel_cost_per_wp = st.number_input("Solar Panel Cost (KES/Wp)", min_value=50, max_value=200, value=90)
+    battery_cost_per_kwh = st.number_input("Battery Cost (KES/kWh)", min_value=20000, max_value=100000, value=40000)
+    pole_fixed_cost = st.number_input("Pole, Controller & Installation (KES/pole)", min_value=0, max_value=200000, value=35000)
+
+if st.button("Design Street Lighting", type="primary"):
+    required_columns = {"latitude", "longitude", "luminaire_w"}
+    if not required_columns.issubset(poles.columns):
+        st.error(f"The pole schedule must contain the columns: {', '.join(sorted(required_columns))}")
+    else:
+        with st.spinner("Sizing panels and batteries for every pole..."):
+            st.session_state.street_lighting_results = design_street_lighting(
+                poles,
+                dimming_profile=dimming_profile,
+                autonomy_days=autonomy_days,
+                battery_dod=battery_dod / 100,
+                panel_cost_per_wp=panel_cost_per_wp,
+                battery_cost_per_kwh=battery_cost_per_kwh,
+                pole_fixed_cost=pole_fixed_cost
+            )
+
+# Display design results if available
+if st.session_state.street_lighting_results:
+    results = st.session_state.street_lighting_results
+    summary = results['summary']
+
+    st.header("Project Summary")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Poles", f"{summary['number_of_poles']:,}")
+    with col2:
+        st.metric("Total Panel Capacity", f"{summary['total_panel_kw']:.2f} kWp")
+    with col3:
+        st.metric("Total Battery Storage", f"{summary['total_battery_kwh']:.1f} kWh")
+    with col4:
+        st.metric("Project Cost", f"KES {summary['total_cost']:,.0f}")
+
+    st.write(f"Average cost per pole: KES {summary['average_cost_per_pole']:,.0f}")
+
+    st.subheader("Bill of Materials")
+    st.dataframe(results['bill_of_materials'])
+
+    st.subheader("Per-Pole Design")
+    st.dataframe(results['design'])
+    st.download_button(
+        "Download Pole Design (CSV)",
+        results['design'].to_csv(index=False),
+        file_name="street_lighting_design.csv",
+        mime="text/csv"
+    )
+
+    st.divider()
+    st.write("Looking for a street-lighting specialist?")
+    st.page_link("pages/4_Installer_Directory.py", label="Find Installers", icon="👷")
@@ -0,0 +1,108 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from data.kenya_electricity_tariffs import TOU_TARIFFS
+from utils.hourly_simulation import hourly_load_profile, COMMERCIAL_LOAD_SHAPE, HOURS_PER_YEAR, HOURS_PER_DAY
+from utils.tariff_engine import calculate_hourly_bill, price_peak_shaving
+
+# Set page configuration
+st.set_page_config(
+    page_title="Commercial Tariffs - Solar Sizing App",
+    page_icon="🏭",
+    layout="wide"
+)
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# App title
+st.title("🏭 Commercial Time-of-Use Tariffs & Peak Shaving")
+
+st.write("""
+Commercial and industrial customers are billed on time-of-use energy and their monthly
+maximum demand in kVA. Price a year of hourly grid imports under the TOU tariff and see how
+much a battery that shaves the demand peak would save.
+""")
+
+# Site load
+st.header("Site Load")
+col1, col2 = st.columns(2)
+
+with col1:
+    consumer_type = st.selectbox("Tariff", list(TOU_TARIFFS.keys()))
+    tariff = TOU_TARIFFS[consumer_type]
+    st.write(f"**{tariff['category']}:** {tariff['description']}")
+    for name, period in tariff['periods'].items():
+        st.write(f"**{name}:** KES {period['energy_charge']:.2f}/kWh")
+    st.write(f"**Maximum Demand:** KES {tariff['demand_charge_per_kva']:,.0f}/kVA per month")
+
+with col2:
+    load_upload = st.file_uploader("Upload hourly load (CSV with one 'load_kw' column, 8760 rows)", type=["csv"])
+    if load_upload is not None:
+        hourly_load = pd.read_csv(load_upload)['load_kw'].to_numpy(dtype=float)
+        if len(hourly_load) != HOURS_PER_YEAR:
+            st.error(f"The load file must contain {HOURS_PER_YEAR} hourly values")
+            st.stop()
+    else:
+        daily_energy = st.number_input("Average Daily Consumption (kWh)", min_value=10, max_value=100000, value=600)
+        weekend_factor = st.slider("Weekend Consumption (% of weekdays)", min_value=10, max_value=100, value=40) / 100
+        hourly_load = hourly_load_profile(daily_energy, COMMERCIAL_LOAD_SHAPE)
+        # Lower consumption on Saturdays and Sundays (the year starts on a Monday)
+        weekend = (np.arange(HOURS_PER_YEAR) // HOURS_PER_DAY) % 7 >= 5
+        hourly_load = np.where(weekend, hourly_load * weekend_factor, hourly_load)
+
+# Monthly TOU bills
+bill = calculate_hourly_bill(hourly_load, consumer_type)
+
+st.header("Monthly Bills")
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Annual Electricity Cost", f"KES {bill['annual_total']:,.0f}")
+with col2:
+    st.metric("Peak Maximum Demand", f"{bill['max_demand_kva'].max():,.1f} kVA")
+with col3:
+    st.metric("Demand Charges (share of bill)", f"{bill['demand_charge'].sum() / bill['annual_total'] * 100:.1f}%")
+
+monthly_table = pd.DataFrame({
+    'Month': MONTH_NAMES,
+    **{f'{name} (kWh)': bill['period_energy_kwh'][name] for name in bill['period_energy_kwh']},
+    'Max Demand (kVA)': bill['max_demand_kva'],
+    'Energy Charge (KES)': bill['energy_charge'],
+    'Demand Charge (KES)': bill['demand_charge'],
+    'Levies & Adjustments (KES)': bill['fuel_energy_cost'] + bill['forex_adjustment'] + bill['inflation_adjustment']
+                                  + bill['erc_levy'] + bill['rep_levy'] + bill['wra_levy'],
+    'VAT (KES)': bill['vat'],
+    'Total (KES)': bill['total']
+})
+st.dataframe(monthly_table.style.format({col: "{:,.0f}" for col in monthly_table.columns if col != 'Month'}))
+
+# Peak shaving
+st.header("Peak Shaving with a Battery")
+round_trip_efficiency = st.slider("Battery Round-Trip Efficiency (%)", min_value=70, max_value=98, value=90) / 100
+battery_cost_per_kwh = st.number_input("Battery Cost (KES/kWh)", min_value=20000, max_value=100000, value=40000)
+
+peak_kw = float(np.max(hourly_load))
+demand_limits = np.linspace(0.5 * peak_kw, peak_kw, 26)
+shaving = price_peak_shaving(hourly_load, demand_limits, consumer_type, round_trip_efficiency=round_trip_efficiency)
+
+with np.errstate(divide='ignore', invalid='ignore'):
+    simple_payback = np.where(shaving['annual_savings'] > 0,
+                              shaving['battery_kwh'] * battery_cost_per_kwh / shaving['annual_savings'], np.nan)
+
+shaving_table = pd.DataFrame({
+    'Demand Limit (kW)': shaving['demand_limit_kw'],
+    'Battery (kWh)': shaving['battery_kwh'],
+    'Battery Power (kW)': shaving['battery_kw'],
+    'Annual Savings (KES)': shaving['annual_savings'],
+    'Simple Payback (years)': simple_payback
+})
+
+fig, ax = plt.subplots(figsize=(10, 5))
+ax.plot(shaving['battery_kwh'], shaving['annual_savings'], marker='o')
+ax.set_xlabel('Battery Capacity (kWh)')
+ax.set_ylabel('Annual Savings (KES)')
+ax.set_title('Value of Peak Shaving')
+ax.grid(True)
+st.pyplot(fig)
+
+st.dataframe(shaving_table.style.format("{:,.1f}"))
@@ -0,0 +1,110 @@
+import streamlit as st
+import numpy as np
+import folium
+from matplotlib import colormaps
+from matplotlib.colors import Normalize, to_hex
+from streamlit_folium import folium_static
+from data.load_profiles import get_reference_load_profiles
+from utils.county_analysis import county_payback_table
+
+# Set page configuration
+st.set_page_config(
+    page_title="County Comparison - Solar Sizing App",
+    page_icon="🗺️",
+    layout="wide"
+)
+
+MAP_METRICS = {
+    'payback_period': 'Payback Period (years)',
+    'roi_percent': 'ROI (%)',
+    'panel_capacity_kw': 'System Size (kWp)',
+    'total_initial_cost': 'System Cost (KES)',
+    'lcoe_solar': 'Solar LCOE (KES/kWh)'
+}
+
+# App title
+st.title("🗺️ Solar Economics Across Kenya's Counties")
+
+st.write("""
+Compare solar payback, returns and system size in all 47 counties for a set of reference
+households and businesses. Every county and profile is sized and costed in one batch.
+""")
+
+# Assumptions
+st.header("Assumptions")
+profiles = get_reference_load_profiles()
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    selected_profiles = st.multiselect("Load Profiles", [profile['name'] for profile in profiles],
+                                       default=[profile['name'] for profile in profiles])
+    profiles = [profile for profile in profiles if profile['name'] in selected_profiles]
+
+with col2:
+    panel_cost_per_wp = st.number_input("Panel Cost (KES/Wp)", min_value=30, max_value=200, value=90)
+    battery_cost_per_kwh = st.number_input("Battery Cost (KES/kWh)", min_value=10000, max_value=100000, value=40000)
+    installation_percent = st.slider("Installation Cost (%)", min_value=10, max_value=30, value=15)
+
+with col3:
+    grid_inflation = st.slider("Grid Electricity Inflation (%/year)", min_value=2, max_value=15, value=5)
+    analysis_period = st.slider("Analysis Period (years)", min_value=5, max_value=25, value=20)
+    financing_percentage = st.slider("Financed Share (%)", min_value=0, max_value=90, value=70)
+
+if not profiles:
+    st.warning("Select at least one load profile")
+    st.stop()
+
+table = county_payback_table(
+    load_profiles=profiles,
+    panel_cost_per_wp=panel_cost_per_wp,
+    battery_cost_per_kwh=battery_cost_per_kwh,
+    installation_percent=installation_percent,
+    inflation_rate=grid_inflation / 100,
+    analysis_period=analysis_period,
+    financing_percentage=financing_percentage / 100
+)
+
+# Map
+st.header("County Map")
+col1, col2 = st.columns(2)
+with col1:
+    map_profile = st.selectbox("Profile", [profile['name'] for profile in profiles])
+with col2:
+    map_metric = st.selectbox("Metric", list(MAP_METRICS.keys()), format_func=lambda metric: MAP_METRICS[metric])
+
+profile_table = table[table['profile'] == map_profile]
+values = profile_table[map_metric].to_numpy(dtype=float)
+# Shorter payback and cheaper energy are better, so those scales are reversed
+colormap = colormaps['RdYlGn_r' if map_metric in ('payback_period', 'total_initial_cost', 'lcoe_solar') else 'RdYlGn']
+normalize = Normalize(vmin=np.nanmin(values), vmax=max(np.nanmax(values), np.nanmin(values) + 1e-9))
+
+m = folium.Map(location=[0.2, 37.9], zoom_start=6)
+for row, value in zip(profile_table.itertuples(), values):
+    folium.CircleMarker(
+        location=[row.latitude, row.longitude],
+        radius=10,
+        color=to_hex(colormap(normalize(value))),
+        fill=True,
+        fill_opacity=0.8,
+        popup=f"{row.county}: {MAP_METRICS[map_metric]} {value:,.1f}"
+    ).add_to(m)
+folium_static(m)
+
+# Summary and table
+st.header("County Results")
+col1, col2, col3 = st.columns(3)
+with col1:
+    best = profile_table.loc[profile_table['payback_period'].idxmin()]
+    st.metric("Fastest Payback", f"{best['county']}", f"{best['payback_period']:.1f} years", delta_color="off")
+with col2:
+    st.metric("Median Payback", f"{profile_table['payback_period'].median():.1f} years")
+with col3:
+    st.metric("Counties Paying Back", f"{int(profile_table['pays_back'].sum())} of {len(profile_table)}")
+
+st.dataframe(table)
+st.download_button(
+    "Download County Results (CSV)",
+    table.to_csv(index=False),
+    file_name="county_solar_comparison.csv",
+    mime="text/csv"
+)
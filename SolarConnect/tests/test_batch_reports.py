@@ -0,0 +1,41 @@
+import io
+import zipfile
+import pandas as pd
+from utils.batch_reports import row_to_inputs, report_filenames, generate_reports
+from utils.pipeline import ScenarioPipeline
+
+SCENARIOS = """name,county,daily_energy_kwh,analysis_period,financing_years
+Amina,Nairobi,8,,5
+Brian,Mombasa,12,25,
+"""
+
+
+def test_partially_blank_integer_columns_run_through_the_pipeline():
+    table = pd.read_csv(io.StringIO(SCENARIOS))
+    assert table['analysis_period'].dtype == float
+
+    for row in table.to_dict('records'):
+        inputs = row_to_inputs(row)
+        for name in ('analysis_period', 'financing_years'):
+            assert name not in inputs or isinstance(inputs[name], int)
+        data = ScenarioPipeline(**inputs).get('report_data')
+        assert len(data['roi_data']['solar_cumulative_costs']) in (20, 25)
+
+
+def test_duplicate_report_ids_get_unique_file_names():
+    rows = [{'report_id': 'Q-1'}, {'report_id': 'Q-2'}, {'report_id': 'Q-1'}, {'report_id': 'Q-1_3'}]
+    assert report_filenames(rows) == ['Q_1_1.pdf', 'Q_2.pdf', 'Q_1_3_2.pdf', 'Q_1_3.pdf']
+
+
+def test_duplicate_report_ids_are_all_written_to_the_zip(tmp_path):
+    table = pd.DataFrame({
+        'report_id': ['lead', 'lead'],
+        'county': ['Nairobi', 'Mombasa'],
+        'daily_energy_kwh': [8, 12]
+    })
+    output = str(tmp_path / 'reports.zip')
+    summary = generate_reports(table, output, workers=1)
+
+    assert summary['reports'] == 2 and not summary['failed']
+    with zipfile.ZipFile(output) as archive:
+        assert sorted(archive.namelist()) == ['lead_1.pdf', 'lead_2.pdf']
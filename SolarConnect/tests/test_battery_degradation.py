@@ -0,0 +1,50 @@
+import numpy as np
+from utils.battery_degradation import BATTERY_CHEMISTRIES, find_reversals, project_battery_replacement, rainflow_cycles
+from utils.roi_calculator import calculate_roi, calculate_grid_costs
+
+
+def test_battery_is_replaced_before_its_life_ends_in_the_roi_schedule():
+    # One 80% cycle a day: about 7.8 years of LiFePO4 life with calendar ageing
+    projection = project_battery_replacement(np.tile([0.2, 1.0], 365), chemistry="LiFePO4")
+    assert 7 < projection['projected_life_years'] < 8
+    assert projection['replacement_year'] == 7
+
+    roi = calculate_roi(
+        total_initial_cost=500000,
+        annual_maintenance=0,
+        battery_replacement_cost=100000,
+        battery_replacement_years=projection['replacement_year'],
+        grid_costs=calculate_grid_costs(3600, 21.0, 200, 0.0, 20),
+        analysis_period=20,
+        financing_percentage=0.0
+    )
+    # Year 0 holds the purchase; year index 7 starts after seven full years of operation
+    replaced = np.nonzero(np.asarray(roi['solar_annual_costs'])[1:] >= 100000)[0] + 1
+    assert replaced.tolist() == [7, 14]
+    assert replaced[0] <= projection['projected_life_years']
+
+
+def test_rainflow_counts_the_astm_e1049_example():
+    # Load history of ASTM E1049-85 section 5.4.4: one full cycle of range 4 and half
+    # cycles of range 3, 4, 6, 8, 8 and 9
+    ranges, means, counts = rainflow_cycles(np.array([-2, 1, -3, 5, -1, 3, -4, 4, -2]))
+    totals = {float(r): float(np.sum(counts[ranges == r])) for r in np.unique(ranges)}
+    assert totals == {3.0: 0.5, 4.0: 1.5, 6.0: 0.5, 8.0: 1.0, 9.0: 0.5}
+    assert np.sum(counts * ranges) == 23.0
+
+
+def test_reversals_ignore_plateaus_and_monotonic_runs():
+    assert find_reversals(np.array([0, 1, 1, 2, 1, 1, 0, 0, 3])).tolist() == [0, 2, 0, 3]
+
+
+def test_idle_battery_only_ages_on_the_calendar():
+    projection = project_battery_replacement(np.full(8760, 0.5), chemistry="LiFePO4")
+    assert projection['cycles_per_year'] == 0
+    assert projection['projected_life_years'] == BATTERY_CHEMISTRIES["LiFePO4"]['calendar_life_years']
+
+
+def test_replacement_projection_is_per_simulated_year():
+    one_year = project_battery_replacement(np.tile([0.2, 1.0], 365))
+    two_years = project_battery_replacement(np.tile([0.2, 1.0], 730), simulated_years=2.0)
+    assert np.isclose(two_years['cycles_per_year'], one_year['cycles_per_year'], rtol=1e-3)
+    assert np.isclose(two_years['projected_life_years'], one_year['projected_life_years'], rtol=1e-3)
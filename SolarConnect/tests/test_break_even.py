@@ -0,0 +1,30 @@
+import numpy as np
+from utils.break_even import break_even_surface, EQUIPMENT_PRICES
+from utils.roi_calculator import evaluate_scenarios
+
+BASE_INPUTS = {
+    'panel_capacity_kw': 2.4,
+    'battery_capacity_kwh': 4.8,
+    'inverter_size_kw': 2.88,
+    'annual_energy_kwh': 3600,
+    'analysis_period': 20
+}
+
+
+def test_targets_past_the_last_payback_year_have_no_break_even():
+    result = break_even_surface(BASE_INPUTS, [7, 19.5, 20], energy_charge=np.linspace(15, 40, 5))
+    assert not np.isnan(result['break_even'][0]).any()
+    assert np.isnan(result['break_even'][1:]).all()
+
+
+def test_break_even_prices_meet_their_target():
+    result = break_even_surface(BASE_INPUTS, [5, 10, 19], energy_charge=np.linspace(15, 40, 6),
+                                inflation_rate=np.linspace(0.02, 0.12, 6))
+    energy_charge, inflation_rate = np.meshgrid(result['axes']['energy_charge'], result['axes']['inflation_rate'],
+                                                indexing='ij')
+    for target, multiplier in zip(result['targets'], result['break_even']):
+        found = ~np.isnan(multiplier)
+        prices = {name: price * multiplier[found] for name, price in EQUIPMENT_PRICES.items()}
+        payback = evaluate_scenarios(**{**BASE_INPUTS, **prices, 'energy_charge': energy_charge[found],
+                                        'inflation_rate': inflation_rate[found]})['payback_period']
+        assert np.allclose(payback, target, atol=0.01)
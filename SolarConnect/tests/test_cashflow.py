@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from utils.cashflow import amortization_schedule, monthly_cash_flows
+from utils.consumption_forecast import forecast_consumption
+from utils.roi_calculator import calculate_roi, calculate_grid_costs
+
+SCENARIO = {
+    'total_initial_cost': 600000,
+    'annual_maintenance': 10000,
+    'battery_replacement_cost': 150000,
+    'battery_replacement_years': 10,
+    'annual_energy_kwh': 3600,
+    'energy_charge': 21.0,
+    'fixed_charge': 200,
+    'inflation_rate': 0.05,
+    'analysis_period': 20,
+    'financing_interest': 0.12
+}
+
+
+@pytest.mark.parametrize('financing_percentage', [0.0, 0.7])
+def test_monthly_payback_agrees_with_the_headline_payback(financing_percentage):
+    cash_flows = monthly_cash_flows(**SCENARIO, financing_percentage=financing_percentage, financing_months=84)
+    roi = calculate_roi(
+        total_initial_cost=SCENARIO['total_initial_cost'],
+        annual_maintenance=SCENARIO['annual_maintenance'],
+        battery_replacement_cost=SCENARIO['battery_replacement_cost'],
+        battery_replacement_years=SCENARIO['battery_replacement_years'],
+        grid_costs=calculate_grid_costs(SCENARIO['annual_energy_kwh'], SCENARIO['energy_charge'],
+                                        SCENARIO['fixed_charge'], SCENARIO['inflation_rate'], SCENARIO['analysis_period']),
+        analysis_period=SCENARIO['analysis_period'],
+        financing_percentage=financing_percentage,
+        financing_years=7,
+        financing_interest=SCENARIO['financing_interest']
+    )
+    assert cash_flows['pays_back'] and roi['pays_back']
+    assert abs(cash_flows['payback_months'] - roi['payback_period'] * 12) <= 1
+
+
+def test_monthly_bills_follow_the_consumption_forecast_and_tariff():
+    consumption = forecast_consumption(1080, 0.05, 20)
+    kwargs = dict(tariff='Domestic', consumption_by_year=consumption)
+    cash_flows = monthly_cash_flows(**{**SCENARIO, 'annual_energy_kwh': 1080}, **kwargs, consumption_profile=np.ones(12))
+    grid_costs = calculate_grid_costs(1080, 21.0, 200, 0.05, 20, **kwargs)
+
+    annual_bills = cash_flows['grid_bills'].reshape(20, 12).sum(axis=-1)
+    assert np.allclose(annual_bills, grid_costs['annual_costs'])
+
+
+@pytest.mark.parametrize('term_months', [18, 18.5])
+def test_amortization_repays_exactly_the_principal(term_months):
+    schedule = amortization_schedule(np.array([100000.0, 100000.0]), np.array([0.0, 0.12]), term_months, 36)
+    assert np.allclose(schedule['principal'].sum(axis=-1), 100000)
+    assert np.allclose(schedule['payment'] - schedule['interest'], schedule['principal'])
+    assert not schedule['payment'][:, 19:].any()
+    assert not schedule['balance'][:, 18:].any()
+
+
+def test_interest_free_loan_splits_the_principal_evenly():
+    schedule = amortization_schedule(60000, 0.0, 18, 24)
+    assert schedule['monthly_payment'] == pytest.approx(60000 / 18)
+    assert np.allclose(schedule['payment'][:18], 60000 / 18)
+    assert not schedule['interest'].any()
+    assert np.allclose(schedule['balance'][:18], 60000 - np.arange(1, 19) * 60000 / 18)
+
+
+def test_fractional_term_ends_with_a_partial_payment():
+    schedule = amortization_schedule(100000, 0.12, 18.5, 24)
+    payments = schedule['payment']
+    assert np.allclose(payments[:18], schedule['monthly_payment'])
+    assert payments[18] == pytest.approx(schedule['balance'][17] * 1.01)
+    assert payments[18] < schedule['monthly_payment']
@@ -0,0 +1,31 @@
+import numpy as np
+from data.kenya_counties import get_kenya_counties
+from utils.county_analysis import county_payback_table
+from utils.solar_calculator import calculate_inverter_size
+
+PROFILES = [
+    {'name': 'Home', 'daily_energy_kwh': 8, 'ac_load_peak_kw': 5.0},
+    {'name': 'Factory', 'daily_energy_kwh': 150}
+]
+
+
+def test_savings_follow_the_energy_delivered_in_each_county():
+    counties = get_kenya_counties()
+    by_sun = sorted(counties, key=lambda name: counties[name]['climate']['peak_sun_hours'])
+    cloudy, sunny = by_sun[0], by_sun[-1]
+    table = county_payback_table(PROFILES, {name: counties[name] for name in (sunny, cloudy)})
+    table = table.set_index(['profile', 'county'])
+
+    # The capped factory array delivers less of its consumption where there is less sun
+    factory = table.loc['Factory']
+    assert factory.loc[cloudy, 'solar_fraction'] < factory.loc[sunny, 'solar_fraction'] <= 1
+    delivered = factory['panel_capacity_kw'] * factory['peak_sun_hours'] * 0.85
+    assert np.allclose(factory['solar_fraction'], np.minimum(1, delivered / 150))
+    assert (table.loc['Home', 'solar_fraction'] == 1).all()
+
+
+def test_inverters_follow_the_single_system_rule():
+    table = county_payback_table(PROFILES)
+    for row in table.itertuples():
+        ac_load_peak = 5.0 if row.profile == 'Home' else None
+        assert np.isclose(row.inverter_size_kw, calculate_inverter_size(row.panel_capacity_kw, ac_load_peak))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from utils.financing import offer_payment_schedules
+
+
+def remaining_balance(principal, annual_rate, payments):
+    balance = principal
+    for payment in payments:
+        balance = balance * (1 + annual_rate / 12) - payment
+    return balance
+
+
+def test_balloon_offer_pays_off_the_loan_with_its_final_payment():
+    offer = {'structure': 'balloon', 'deposit_percent': 10, 'fee_percent': 2,
+             'annual_rate': 0.15, 'term_months': 36, 'balloon_percent': 30}
+    schedule = offer_payment_schedules(500000, [offer], 48)
+    payments = schedule['payments'][0]
+
+    assert schedule['upfront'][0] == pytest.approx(50000 + 450000 * 0.02)
+    # Equal payments until the last month, which adds 30% of the financed amount
+    assert np.allclose(payments[:35], payments[0])
+    assert payments[35] == pytest.approx(payments[0] + 0.3 * 450000)
+    assert not payments[36:].any()
+    assert remaining_balance(450000, 0.15, payments) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_payg_offer_charges_its_daily_rate_for_the_term():
+    offer = {'structure': 'payg', 'deposit_percent': 5, 'daily_rate_percent': 0.1, 'term_months': 24}
+    schedule = offer_payment_schedules(200000, [offer], 36)
+    payments = schedule['payments'][0]
+
+    assert schedule['upfront'][0] == pytest.approx(10000)
+    assert np.allclose(payments[:24], 200000 * 0.001 * 365 / 12)
+    assert not payments[24:].any()
+
+
+def test_interest_free_offer_splits_the_financed_amount_evenly():
+    offers = [
+        {'structure': 'amortizing', 'annual_rate': 0.0, 'term_months': 12},
+        {'structure': 'amortizing', 'annual_rate': 0.12, 'term_months': 12}
+    ]
+    payments = offer_payment_schedules(120000, offers, 12)['payments']
+    assert np.allclose(payments[0], 10000)
+    assert remaining_balance(120000, 0.12, payments[1]) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_unknown_structure_is_rejected():
+    with pytest.raises(ValueError, match="lease"):
+        offer_payment_schedules(100000, [{'structure': 'lease'}], 12)
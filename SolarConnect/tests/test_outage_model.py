@@ -0,0 +1,18 @@
+import pytest
+from data.grid_reliability import get_regional_outage_statistics
+from utils.outage_model import simulate_outage_coverage
+
+
+def test_at_least_one_year_must_be_simulated():
+    region = next(iter(get_regional_outage_statistics()))
+    with pytest.raises(ValueError):
+        simulate_outage_coverage(region, battery_capacity_kwh=10, daily_energy_kwh=8, years=0)
+    result = simulate_outage_coverage(region, battery_capacity_kwh=10, daily_energy_kwh=8, years=1, seed=0)
+    assert result['years'] == 1
+
+
+def test_deeper_discharge_covers_more_outage_time():
+    region = next(iter(get_regional_outage_statistics()))
+    shallow = simulate_outage_coverage(region, battery_capacity_kwh=2, daily_energy_kwh=12, battery_dod=0.5, years=200, seed=0)
+    deep = simulate_outage_coverage(region, battery_capacity_kwh=2, daily_energy_kwh=12, battery_dod=0.95, years=200, seed=0)
+    assert deep['coverage_fraction'] > shallow['coverage_fraction']
@@ -0,0 +1,29 @@
+import numpy as np
+from utils.pipeline import ScenarioPipeline
+from utils.tariff_engine import calculate_bill
+
+
+def test_growth_sized_system_covers_the_forecast_load_at_the_horizon():
+    pipeline = ScenarioPipeline(
+        daily_energy_kwh=10, peak_sun_hours=5.5, irradiance_data={'peak_sun_hours': 5.5},
+        consumption_growth=0.04, future_expansion=None, expansion_horizon_years=8, system_efficiency=0.85
+    )
+    consumption = pipeline.get('consumption')
+    horizon_daily_kwh = 10 * consumption[7] / consumption[0]
+
+    sizing = pipeline.get('sizing')
+    assert np.isclose(sizing['adjusted_daily_energy'] * 0.85, horizon_daily_kwh)
+
+
+def test_tariff_bills_every_forecast_year_at_its_own_band():
+    # 90 kWh/month grows past the 100 kWh Ordinary I band limit in year 3
+    pipeline = ScenarioPipeline(
+        monthly_energy_kwh=90, peak_sun_hours=5.5, irradiance_data={'peak_sun_hours': 5.5},
+        consumption_growth=0.05, tariff='Domestic', inflation_rate=0.0
+    )
+    consumption = pipeline.get('consumption')
+    annual_costs = np.asarray(pipeline.get('grid_costs')['annual_costs'])
+
+    expected = [float(calculate_bill(kwh / 12, 'Domestic')['total']) * 12 for kwh in consumption]
+    assert np.allclose(annual_costs, expected)
+    assert annual_costs[3] / consumption[3] > annual_costs[0] / consumption[0]
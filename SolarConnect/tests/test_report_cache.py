@@ -0,0 +1,52 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from utils.pipeline import ScenarioPipeline
+from utils.pdf_generator import get_report_renderer
+from utils.report_cache import report_cache_key, ReportCache
+
+
+def report_data():
+    pipeline = ScenarioPipeline(daily_energy_kwh=10, peak_sun_hours=5.5, irradiance_data={'peak_sun_hours': 5.5},
+                                customer_info={'name': 'Amina', 'email': '', 'phone': '', 'date': '2026-01-01'})
+    return pipeline.get('report_data')
+
+
+def test_data_the_report_does_not_show_keeps_the_key():
+    data = report_data()
+    changed = dict(data, yearly_comparison=pd.DataFrame({'Year': [1, 2]}),
+                   roi_data=dict(data['roi_data'], annual_savings=np.zeros(20)))
+    assert report_cache_key(changed) == report_cache_key(data)
+
+
+def test_shown_data_changes_the_key():
+    data = report_data()
+    changed = dict(data, roi_data=dict(data['roi_data'], payback_period=data['roi_data']['payback_period'] + 1))
+    assert report_cache_key(changed) != report_cache_key(data)
+
+
+def test_edited_section_builder_changes_the_key(monkeypatch):
+    data = report_data()
+    key = report_cache_key(data)
+    roi_section = next(section for section in get_report_renderer().sections if section.title == "Return on Investment")
+
+    def _roi_rows(data, styles):
+        return [["Payback Period:", f"{data['roi_data']['payback_period']:.2f} years"]]
+
+    # Same name, different body
+    _roi_rows.__qualname__ = roi_section.build.__qualname__
+    monkeypatch.setattr(roi_section, 'build', _roi_rows)
+    assert report_cache_key(data) != key
+
+
+def test_failed_disk_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = ReportCache(directory=str(tmp_path))
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        cache.put('abc', b'%PDF')
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,30 @@
+import numpy as np
+from utils.response_surface import build_response_surface, interpolate_surface, SURFACE_AXES, SURFACE_METRICS
+from utils.roi_calculator import evaluate_scenarios
+
+# Pays back in roughly half of the what-if space, so the surface spans the payback sentinel
+BASE_INPUTS = {
+    'panel_capacity_kw': 2.4,
+    'battery_capacity_kwh': 4.8,
+    'inverter_size_kw': 2.88,
+    'annual_energy_kwh': 2500,
+    'inflation_rate': 0.05,
+    'analysis_period': 20,
+    'installation_percent': 15,
+    'financing_percentage': 0.7,
+    'financing_interest': 0.12
+}
+
+
+def test_error_bounds_hold_for_random_what_if_points():
+    surface = build_response_surface(BASE_INPUTS)
+    rng = np.random.default_rng(0)
+    point = {name: rng.uniform(values[0], values[-1], 2000) for name, values in SURFACE_AXES.items()}
+    point['analysis_period'] = rng.integers(5, 26, 2000)
+
+    estimate = interpolate_surface(surface, **point)
+    exact = evaluate_scenarios(**{**BASE_INPUTS, **point})
+    assert 0.2 < np.mean(exact['pays_back']) < 0.8
+    for metric in SURFACE_METRICS:
+        within = np.abs(estimate[metric] - exact[metric]) <= estimate[f'{metric}_error_bound'] + 1e-9
+        assert np.mean(within) >= 0.99, metric
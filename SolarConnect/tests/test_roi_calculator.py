@@ -0,0 +1,27 @@
+import numpy as np
+from utils.roi_calculator import evaluate_scenarios
+
+SYSTEM = {
+    'panel_capacity_kw': 2.4,
+    'battery_capacity_kwh': 4.8,
+    'inverter_size_kw': 2.88
+}
+
+
+def test_mixed_period_batch_matches_single_rows():
+    # Break-even falls between 17 and 18 years over a 25-year analysis
+    annual_energy_kwh = 1733.78
+    batch = evaluate_scenarios(**SYSTEM, annual_energy_kwh=annual_energy_kwh, analysis_period=np.array([18, 25]))
+
+    for index, period in enumerate([18, 25]):
+        single = evaluate_scenarios(**SYSTEM, annual_energy_kwh=annual_energy_kwh, analysis_period=period)
+        assert batch['pays_back'][index] == single['pays_back']
+        assert np.isclose(batch['payback_period'][index], single['payback_period'])
+        assert np.isclose(batch['total_savings'][index], single['total_savings'])
+
+
+def test_rows_not_paying_back_get_the_sentinel():
+    result = evaluate_scenarios(**SYSTEM, annual_energy_kwh=1733.78, analysis_period=np.array([18, 25]))
+    assert not result['pays_back'][0]
+    assert result['payback_period'][0] == 19
+    assert result['total_savings'][0] < 0
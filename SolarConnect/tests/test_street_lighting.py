@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from utils.street_lighting import design_street_lighting, round_up_to_standard, STANDARD_PANEL_SIZES_W
+
+
+def test_requirements_above_the_largest_size_use_several_stock_units():
+    unit_size, units = round_up_to_standard(np.array([45, 400, 401, 1000]), STANDARD_PANEL_SIZES_W)
+    assert unit_size.tolist() == [50, 400, 400, 400]
+    assert units.tolist() == [1, 1, 2, 3]
+
+
+def test_bill_of_materials_lists_only_stock_sizes():
+    poles = pd.DataFrame({
+        'latitude': [-1.29, -1.29],
+        'longitude': [36.82, 36.82],
+        'luminaire_w': [30, 400],
+        'peak_sun_hours': [5.5, 5.5]
+    })
+    results = design_street_lighting(poles)
+    design = results['design']
+    assert design.loc[1, 'panels'] > 1
+
+    bill = results['bill_of_materials'].set_index('item')['quantity']
+    panel_items = [item for item in bill.index if item.startswith("Solar Panel")]
+    assert all(float(item.split()[-2]) in STANDARD_PANEL_SIZES_W for item in panel_items)
+    assert sum(bill[item] for item in panel_items) == design['panels'].sum()
+    assert np.allclose(design['panel_w'], design['panel_unit_w'] * design['panels'])
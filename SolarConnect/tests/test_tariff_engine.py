@@ -0,0 +1,54 @@
+import numpy as np
+from data.kenya_electricity_tariffs import get_electricity_tariff
+from utils.hourly_simulation import DAYS_PER_MONTH, HOURS_PER_DAY, HOURS_PER_YEAR
+from utils.tariff_engine import calculate_bill, calculate_hourly_bill, compile_tariff, consumption_from_bill
+
+
+def test_consumption_on_a_band_limit_is_charged_at_the_lower_band():
+    kwh = np.array([30.0, np.nextafter(30.0, np.inf), 100.0, np.nextafter(100.0, np.inf)])
+    bill = calculate_bill(kwh, "Domestic")
+    assert np.allclose(bill['energy_charge'] / kwh, [12.22, 16.54, 16.54, 21.00])
+
+
+def test_incremental_pricing_is_continuous_at_band_limits():
+    tariff = get_electricity_tariff("Domestic")
+    tariff['band_pricing'] = 'incremental'
+    compiled = compile_tariff(tariff)
+    assert compiled['charge_below'].tolist() == [0.0, 30 * 12.22, 30 * 12.22 + 70 * 16.54]
+
+    bill = calculate_bill(np.array([30.0, 100.0, 150.0]), compiled)
+    assert np.allclose(bill['energy_charge'], [30 * 12.22, 30 * 12.22 + 70 * 16.54,
+                                               30 * 12.22 + 70 * 16.54 + 50 * 21.00])
+    below, above = calculate_bill(np.array([100.0, np.nextafter(100.0, np.inf)]), compiled)['energy_charge']
+    assert np.isclose(below, above)
+
+
+def test_bill_totals_invert_back_to_their_consumption():
+    kwh = np.array([0.0, 15.0, 30.0, 64.0, 100.0, 250.0, 1500.0])
+    totals = calculate_bill(kwh, "Domestic")['total']
+    assert np.allclose(consumption_from_bill(totals, "Domestic"), kwh)
+
+
+def test_hourly_bill_reduces_each_calendar_month_separately():
+    # A load equal to the day of the year makes every month's energy and peak distinct
+    day = np.repeat(np.arange(HOURS_PER_YEAR // HOURS_PER_DAY, dtype=float), HOURS_PER_DAY)
+    bill = calculate_hourly_bill(day, "Commercial (DC)")
+
+    month_of_day = np.repeat(np.arange(12), DAYS_PER_MONTH)
+    days = np.arange(len(month_of_day))
+    expected_kwh = np.bincount(month_of_day, weights=days * HOURS_PER_DAY)
+    assert np.allclose(bill['energy_kwh'], expected_kwh)
+    assert np.allclose(bill['period_energy_kwh']['Peak'] + bill['period_energy_kwh']['Off-Peak'], expected_kwh)
+    # Peak demand is reached on the last day of each month
+    assert np.allclose(bill['max_demand_kva'], (np.cumsum(DAYS_PER_MONTH) - 1) / 0.9)
+
+
+def test_hourly_bills_of_stacked_series_match_single_series():
+    rng = np.random.default_rng(7)
+    loads = rng.uniform(0, 50, size=(3, HOURS_PER_YEAR))
+    stacked = calculate_hourly_bill(loads, "Industrial")
+    for row, load in enumerate(loads):
+        single = calculate_hourly_bill(load, "Industrial")
+        assert np.allclose(stacked['total'][row], single['total'])
+    assert stacked['total'].shape == (3, 12)
+    assert np.allclose(stacked['annual_total'], stacked['total'].sum(axis=-1))
@@ -0,0 +1,342 @@
+"""
+Bulk PDF report generation.
+
+Reads a CSV or Parquet table with one customer scenario per row, runs the scenario pipeline
+for every row across a process pool and streams each finished report into a zip archive or
+an output directory.
+
+Usage (from the SolarConnect directory):
+    python -m utils.batch_reports leads.csv --output proposals.zip --workers 4
+
+Columns named after scenario pipeline inputs (daily_energy_kwh, panel_cost_per_wp, ...) set
+those inputs; missing columns and empty cells keep the pipeline defaults. A 'county' column
+takes the location and solar resource from the county database. Customer details come from
+the 'name', 'email', 'phone' and 'date' columns, and 'report_id' names the output file (repeated
+ids get the row number appended).
+"""
+import argparse
+import contextlib
+import math
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import pandas as pd
+from utils.pipeline import ScenarioPipeline, DEFAULT_INPUTS
+from utils.pdf_generator import write_pdf_report
+from utils.pvgis_api import simulate_kenya_irradiance_data
+from data.kenya_counties import get_kenya_counties
+
+# Pipeline inputs that cannot be given as a single table cell
+NON_TABULAR_INPUTS = {'irradiance_data', 'consumption_by_year', 'customer_info', 'location'}
+
+CUSTOMER_COLUMNS = ['name', 'email', 'phone', 'date']
+
+# Pipeline inputs used as counts or indices. A blank cell turns a pandas integer column into
+# floats, so whole-number values of these inputs are converted back to int.
+INTEGER_INPUTS = {
+    'analysis_period', 'financing_years', 'battery_replacement_years', 'autonomy_days',
+    'panel_wattage', 'battery_voltage', 'expansion_horizon_years'
+}
+
+
+def read_scenario_table(path: str) -> pd.DataFrame:
+    """
+    Read a table of customer scenarios from a CSV or Parquet file.
+
+    Parameters:
+    path (str): Path to a .csv or .parquet file
+
+    Returns:
+    pd.DataFrame: One row per report
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return pd.read_csv(path)
+    if extension in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported scenario file type: {extension} (use .csv or .parquet)")
+
+
+def _cell(value: Any) -> Any:
+    """Return a table cell as a plain Python value, or None when it is empty."""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NA:
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_') or 'report'
+
+
+def row_to_inputs(row: Dict[str, Any], offline: bool = False) -> Dict[str, Any]:
+    """
+    Translate a scenario table row into scenario pipeline inputs.
+
+    Parameters:
+    row (Dict[str, Any]): Table row by column name
+    offline (bool): Use the simulated Kenya irradiance for coordinates instead of the PVGIS API
+
+    Returns:
+    Dict[str, Any]: Keyword arguments for ScenarioPipeline
+    """
+    row = {name: _cell(value) for name, value in row.items()}
+    inputs = {
+        name: value for name, value in row.items()
+        if name in DEFAULT_INPUTS and name not in NON_TABULAR_INPUTS and value is not None
+    }
+    for name in INTEGER_INPUTS & inputs.keys():
+        if isinstance(inputs[name], float) and inputs[name].is_integer():
+            inputs[name] = int(inputs[name])
+
+    location = None
+    county = row.get('county')
+    if county is not None:
+        counties = get_kenya_counties()
+        if county not in counties:
+            raise ValueError(f"Unknown county: {county}")
+        county_data = counties[county]
+        peak_sun_hours = county_data['climate']['peak_sun_hours']
+        inputs.setdefault('peak_sun_hours', peak_sun_hours)
+        inputs['irradiance_data'] = {
+            'peak_sun_hours': peak_sun_hours,
+            'avg_irradiance': peak_sun_hours * 1000,
+            'monthly_averages': [peak_sun_hours * 1000] * 12,
+            'source': "Kenya Counties Database"
+        }
+        location = {
+            'latitude': county_data['coordinates']['latitude'],
+            'longitude': county_data['coordinates']['longitude'],
+            'location_name': county,
+            'region': county_data['region']
+        }
+    elif inputs.get('latitude') is not None and inputs.get('longitude') is not None:
+        location = {
+            'latitude': inputs['latitude'],
+            'longitude': inputs['longitude'],
+            'location_name': row.get('location_name') or f"Custom Location ({inputs['latitude']:.6f}, {inputs['longitude']:.6f})"
+        }
+        if offline:
+            inputs['irradiance_data'] = simulate_kenya_irradiance_data(inputs['latitude'], inputs['longitude'])
+
+    inputs['location'] = location
+    inputs['customer_info'] = {
+        'name': str(row.get('name') or ''),
+        'email': str(row.get('email') or ''),
+        'phone': str(row.get('phone') or ''),
+        'date': str(row.get('date') or date.today().strftime("%Y-%m-%d"))
+    }
+    return inputs
+
+
+def render_scenario_report(task: Tuple[int, Dict[str, Any], bool, Optional[str]]) -> Tuple[int, Optional[bytes], int, Optional[str]]:
+    """
+    Run the scenario pipeline for one table row and render its report.
+
+    With a destination path the worker writes the PDF straight to that file, so the report
+    never passes back through the parent process; otherwise the PDF bytes are returned.
+    Runs in the worker processes, so failures are returned rather than raised.
+
+    Parameters:
+    task (Tuple[int, Dict[str, Any], bool, Optional[str]]): Row position, table row, the
+        offline flag and the destination file path (None to return the bytes)
+
+    Returns:
+    Tuple[int, Optional[bytes], int, Optional[str]]: Row position, PDF bytes (None when
+        written to a file or on failure), size in bytes and the error message (None on success)
+    """
+    position, row, offline, path = task
+    try:
+        pipeline = ScenarioPipeline(**row_to_inputs(row, offline))
+        if path is None:
+            pdf_bytes = pipeline.get('report')
+            return position, pdf_bytes, len(pdf_bytes), None
+        write_pdf_report(pipeline.get('report_data'), path)
+        return position, None, os.path.getsize(path), None
+    except Exception as e:
+        return position, None, 0, f"{type(e).__name__}: {e}"
+
+
+def report_filename(position: int, row: Dict[str, Any]) -> str:
+    """
+    Return the output file name of a row's report.
+
+    Parameters:
+    position (int): Row position in the table
+    row (Dict[str, Any]): Table row
+
+    Returns:
+    str: File name, from 'report_id' if given, otherwise the row number and customer name
+    """
+    report_id = _cell(row.get('report_id'))
+    if report_id is not None:
+        return f"{_slug(str(report_id))}.pdf"
+    return f"{position + 1:05d}_{_slug(str(_cell(row.get('name')) or 'report'))}.pdf"
+
+
+def report_filenames(rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Return unique output file names for the reports of all rows.
+
+    Rows whose report_id gives an already used name have their row number appended, so no
+    report overwrites another file or zip member.
+
+    Parameters:
+    rows (List[Dict[str, Any]]): Table rows in order
+
+    Returns:
+    List[str]: File name of each row's report
+    """
+    filenames = [report_filename(position, row) for position, row in enumerate(rows)]
+    counts: Dict[str, int] = {}
+    for filename in filenames:
+        counts[filename.lower()] = counts.get(filename.lower(), 0) + 1
+
+    used = set()
+    unique = []
+    for position, filename in enumerate(filenames):
+        if counts[filename.lower()] > 1:
+            stem = filename[:-len('.pdf')]
+            filename = f"{stem}_{position + 1}.pdf"
+            suffix = 2
+            while filename.lower() in used or filename.lower() in counts:
+                filename = f"{stem}_{position + 1}_{suffix}.pdf"
+                suffix += 1
+        used.add(filename.lower())
+        unique.append(filename)
+    return unique
+
+
+class ZipReportWriter:
+    """Streams finished reports one at a time into a zip archive."""
+
+    def __init__(self, output: str):
+        self.archive = zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, filename: str, pdf_bytes: bytes) -> None:
+        with self.archive.open(filename, 'w') as member:
+            member.write(pdf_bytes)
+
+    def close(self) -> None:
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _render_all(tasks: Iterator[tuple], workers: int) -> Iterator[Tuple[int, Optional[bytes], int, Optional[str]]]:
+    """Yield rendered reports as they finish, keeping only a few reports in flight per worker."""
+    if workers <= 1:
+        for task in tasks:
+            yield render_scenario_report(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(render_scenario_report, task))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def generate_reports(
+    table: pd.DataFrame,
+    output: str,
+    workers: Optional[int] = None,
+    offline: bool = False,
+    progress_every: int = 0
+) -> Dict[str, Any]:
+    """
+    Render a report for every row of a scenario table.
+
+    Reports are rendered across a process pool. For an output directory each worker writes
+    its PDFs straight to their files; for a zip archive finished reports are streamed into
+    the archive as they arrive, so only a bounded number of PDFs is ever held in memory.
+    Duplicate report_ids are made unique with the row number (see report_filenames()).
+
+    Parameters:
+    table (pd.DataFrame): Scenario table from read_scenario_table()
+    output (str): Zip archive path (ending in .zip) or output directory
+    workers (int, optional): Number of worker processes, defaults to the CPU count; 1 renders in-process
+    offline (bool): Use simulated irradiance instead of the PVGIS API for coordinate rows
+    progress_every (int): Print progress every this many reports, 0 for no progress output
+
+    Returns:
+    Dict[str, Any]: Dictionary with the number of 'reports' written, the 'failed' rows and
+        their errors, elapsed 'seconds', 'reports_per_second' and 'bytes_written'
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = table.to_dict('records')
+    filenames = report_filenames(rows)
+    to_zip = output.lower().endswith('.zip')
+    if not to_zip:
+        os.makedirs(output, exist_ok=True)
+    tasks = (
+        (position, row, offline, None if to_zip else os.path.join(output, filenames[position]))
+        for position, row in enumerate(rows)
+    )
+
+    written = 0
+    bytes_written = 0
+    failed: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        writer = stack.enter_context(ZipReportWriter(output)) if to_zip else None
+        for position, pdf_bytes, size, error in _render_all(tasks, workers):
+            if error is not None:
+                failed.append({'row': position, 'error': error})
+                continue
+            if writer is not None:
+                writer.write(filenames[position], pdf_bytes)
+            written += 1
+            bytes_written += size
+            if progress_every and written % progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{written}/{len(rows)} reports ({written / elapsed:.1f} reports/s)", file=sys.stderr)
+    seconds = time.perf_counter() - start
+
+    return {
+        'reports': written,
+        'failed': failed,
+        'seconds': seconds,
+        'reports_per_second': written / seconds if seconds > 0 else 0.0,
+        'bytes_written': bytes_written
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate solar proposal PDFs for every row of a scenario table.")
+    parser.add_argument('scenarios', help="CSV or Parquet file with one customer scenario per row")
+    parser.add_argument('--output', '-o', default='reports.zip', help="Zip archive (.zip) or output directory")
+    parser.add_argument('--workers', '-w', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--offline', action='store_true', help="Use simulated irradiance instead of the PVGIS API")
+    parser.add_argument('--progress', type=int, default=50, help="Print progress every N reports (0 to disable)")
+    args = parser.parse_args(argv)
+
+    summary = generate_reports(
+        read_scenario_table(args.scenarios),
+        args.output,
+        workers=args.workers,
+        offline=args.offline,
+        progress_every=args.progress
+    )
+    for failure in summary['failed']:
+        print(f"Row {failure['row'] + 1} failed: {failure['error']}", file=sys.stderr)
+    print(f"Wrote {summary['reports']} reports to {args.output} in {summary['seconds']:.1f} s "
+          f"({summary['reports_per_second']:.1f} reports/s, {summary['bytes_written'] / 1e6:.1f} MB)")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
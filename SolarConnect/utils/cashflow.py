@@ -0,0 +1,305 @@
+import numpy as np
+from typing import Dict, Any, Optional, Union
+from utils.roi_calculator import _batch, calculate_npv, calculate_irr, solve_payback_periods
+from utils.tariff_engine import calculate_bill
+
+MONTHS_PER_YEAR = 12
+MAX_MONTHS = 300  # 25-year analysis period
+
+# Relative monthly household consumption (January-December, mean 1.0). Water heating
+# raises consumption in the cool June-August season and holidays raise it in December.
+MONTHLY_CONSUMPTION_PROFILE = (1.00, 0.97, 0.97, 0.96, 0.98, 1.04, 1.08, 1.07, 1.00, 0.96, 0.95, 1.02)
+
+
+def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    term_months: int,
+    months: int
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the monthly amortization schedule of a fixed-payment loan.
+
+    Balances come from the closed-form annuity formula, so the whole schedule of every
+    loan in a batch is computed at once without a month-by-month loop. Payments stop
+    after term_months, which need not be a whole number of years; a fractional last
+    month pays off the remaining balance and its interest.
+
+    Parameters:
+    principal (float): Loan amount in KES
+    annual_rate (float): Annual interest rate as a decimal (compounded monthly)
+    term_months (int): Loan term in months
+    months (int): Number of months in the schedule
+
+    Returns:
+    Dict[str, np.ndarray]: Dictionary with the monthly 'payment', 'interest', 'principal'
+        and closing 'balance', each of shape (..., months), and the fixed 'monthly_payment'
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(annual_rate, dtype=float) / MONTHS_PER_YEAR
+    term = np.asarray(term_months, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monthly_payment = np.where(
+            rate > 0,
+            principal * rate / (1 - (1 + rate) ** -term),
+            principal / term
+        )
+
+    # Closing balance after month k (k = 1..months) of the annuity, zero after the term
+    elapsed = np.minimum(np.arange(1, months + 1), _batch(term))
+    growth = (1 + _batch(rate)) ** elapsed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        paid_off = np.where(_batch(rate) > 0, (growth - 1) / _batch(rate), elapsed)
+    balance = np.maximum(_batch(principal) * growth - _batch(monthly_payment) * paid_off, 0.0)
+    balance = np.where(np.arange(1, months + 1) >= _batch(term), 0.0, balance)
+
+    opening_balance = np.concatenate(
+        [np.broadcast_to(_batch(principal), balance.shape[:-1] + (1,)), balance[..., :-1]], axis=-1
+    )
+    in_term = np.arange(months) < _batch(term)
+    interest = np.where(in_term, opening_balance * _batch(rate), 0.0)
+    # The last month of a fractional term only pays off what is left
+    payment = np.where(in_term, np.minimum(_batch(monthly_payment), opening_balance + interest), 0.0)
+
+    return {
+        'payment': payment,
+        'interest': interest,
+        'principal': payment - interest,
+        'balance': balance,
+        'monthly_payment': monthly_payment
+    }
+
+
+def monthly_grid_bills(
+    annual_energy_kwh: float,
+    energy_charge: float,
+    fixed_charge: float,
+    inflation_rate: float = 0.05,
+    months: int = 240,
+    consumption_profile: Optional[np.ndarray] = None,
+    start_month: int = 1,
+    tariff: Optional[Union[str, Dict[str, Any]]] = None,
+    consumption_by_year: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate monthly grid electricity bills with seasonal consumption.
+
+    Tariffs escalate once a year with inflation_rate, in line with calculate_grid_costs().
+    As there, a tariff bills every month with the tariff engine instead of energy_charge
+    and fixed_charge, and a consumption forecast replaces annual_energy_kwh year by year.
+
+    Parameters:
+    annual_energy_kwh (float): Annual energy consumption in kWh
+    energy_charge (float): Energy charge per kWh in KES
+    fixed_charge (float): Fixed monthly charge in KES
+    inflation_rate (float): Annual inflation rate for electricity costs
+    months (int): Number of months
+    consumption_profile (np.ndarray, optional): 12 relative monthly consumption values
+        (January-December), defaulting to MONTHLY_CONSUMPTION_PROFILE
+    start_month (int): Calendar month (1-12) of the first month
+    tariff (str or Dict[str, Any], optional): Consumer type or tariff for utils.tariff_engine.calculate_bill()
+    consumption_by_year (np.ndarray, optional): Annual consumption in kWh for every year,
+        shape (..., years) covering all months
+
+    Returns:
+    Dict[str, np.ndarray]: Dictionary with the monthly 'energy_kwh' and 'bills', shape (..., months)
+    """
+    if consumption_profile is None:
+        consumption_profile = MONTHLY_CONSUMPTION_PROFILE
+    profile = np.asarray(consumption_profile, dtype=float)
+    profile = profile / profile.mean()
+
+    calendar_month = (np.arange(months) + start_month - 1) % MONTHS_PER_YEAR
+    year = np.arange(months) // MONTHS_PER_YEAR
+
+    if consumption_by_year is not None:
+        consumption_by_year = np.asarray(consumption_by_year, dtype=float)
+        years = (months + MONTHS_PER_YEAR - 1) // MONTHS_PER_YEAR
+        if consumption_by_year.shape[-1] < years:
+            raise ValueError(f"consumption_by_year covers {consumption_by_year.shape[-1]} years, {years} are needed")
+        annual_kwh = consumption_by_year[..., year]
+    else:
+        annual_kwh = _batch(annual_energy_kwh)
+    energy_kwh = annual_kwh / MONTHS_PER_YEAR * profile[calendar_month]
+    escalation = (1 + _batch(inflation_rate)) ** year
+    if tariff is not None:
+        bills = calculate_bill(energy_kwh, tariff)['total'] * escalation
+    else:
+        bills = (energy_kwh * _batch(energy_charge) + _batch(fixed_charge)) * escalation
+
+    return {
+        'energy_kwh': energy_kwh,
+        'bills': bills
+    }
+
+
+def solve_monthly_payback(solar_cumulative: np.ndarray, grid_cumulative: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Find the payback period of monthly cumulative costs on the origin of calculate_roi().
+
+    The annual payback of calculate_roi() is counted from the end of the first year, so the
+    break-even month found at monthly resolution is counted from month 12 as well (payback
+    within the first year is 0, as in the annual engine).
+
+    Parameters:
+    solar_cumulative (np.ndarray): Cumulative solar costs from month 0, shape (..., months + 1)
+    grid_cumulative (np.ndarray): Cumulative grid costs from month 0, shape (..., months + 1)
+
+    Returns:
+    Dict[str, np.ndarray]: Dictionary with 'payback_period' (months, inf if never) and
+        'pays_back' (whether break-even is reached within the schedule)
+    """
+    payback = solve_payback_periods(solar_cumulative, grid_cumulative)
+    return {
+        'payback_period': np.maximum(payback['payback_period'] - MONTHS_PER_YEAR, 0.0),
+        'pays_back': payback['pays_back']
+    }
+
+
+def monthly_cash_flows(
+    total_initial_cost: float,
+    annual_maintenance: float,
+    battery_replacement_cost: float,
+    battery_replacement_years: int,
+    annual_energy_kwh: float,
+    energy_charge: float,
+    fixed_charge: float,
+    inflation_rate: float = 0.05,
+    analysis_period: int = 20,
+    financing_percentage: float = 0.7,
+    financing_months: int = 84,
+    financing_interest: float = 0.12,
+    discount_rate: float = 0.10,
+    consumption_profile: Optional[np.ndarray] = None,
+    start_month: int = 1,
+    tariff: Optional[Union[str, Dict[str, Any]]] = None,
+    consumption_by_year: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Calculate the monthly cash flows of a solar system compared to grid electricity.
+
+    The down payment is paid upfront (month 0) and loan payments start one month later, so
+    the first year no longer lumps the down payment together with twelve loan payments.
+    Maintenance is spread evenly over the months and batteries are replaced at the start of
+    every battery_replacement_years-th year. Every numeric parameter except analysis_period
+    and start_month may be an array, in which case all scenarios are evaluated at once.
+
+    payback_months is counted from the end of the first year, like the payback_period of
+    calculate_roi() (see solve_monthly_payback()).
+
+    Parameters:
+    total_initial_cost (float): Total initial cost of the solar system in KES
+    annual_maintenance (float): Annual maintenance cost in KES
+    battery_replacement_cost (float): Cost to replace batteries in KES
+    battery_replacement_years (int): Years between battery replacements
+    annual_energy_kwh (float): Annual energy consumption in kWh
+    energy_charge (float): Energy charge per kWh in KES
+    fixed_charge (float): Fixed monthly charge in KES
+    inflation_rate (float): Annual inflation rate for electricity costs
+    analysis_period (int): Number of years for the analysis (at most 25)
+    financing_percentage (float): Percentage of system cost that's financed (0.0-1.0)
+    financing_months (int): Loan term in months
+    financing_interest (float): Annual interest rate on financing
+    discount_rate (float): Annual discount rate for the net present value
+    consumption_profile (np.ndarray, optional): 12 relative monthly consumption values
+    start_month (int): Calendar month (1-12) in which the system is commissioned
+    tariff (str or Dict[str, Any], optional): Consumer type or tariff billed with the tariff engine
+    consumption_by_year (np.ndarray, optional): Annual consumption forecast in kWh, shape (..., years)
+
+    Returns:
+    Dict[str, Any]: Dictionary with the upfront payment, monthly arrays of shape (..., months)
+        for the loan schedule, grid bills, solar costs and savings, and the payback period,
+        NPV and IRR at monthly resolution
+    """
+    months = int(analysis_period) * MONTHS_PER_YEAR
+    if months > MAX_MONTHS:
+        raise ValueError(f"The monthly cash-flow engine covers at most {MAX_MONTHS // MONTHS_PER_YEAR} years")
+
+    total_initial_cost = np.asarray(total_initial_cost, dtype=float)
+    financed_amount = total_initial_cost * np.asarray(financing_percentage, dtype=float)
+    down_payment = total_initial_cost - financed_amount
+
+    loan = amortization_schedule(financed_amount, financing_interest, financing_months, months)
+    grid = monthly_grid_bills(annual_energy_kwh, energy_charge, fixed_charge, inflation_rate,
+                              months, consumption_profile, start_month, tariff, consumption_by_year)
+
+    month_index = np.arange(months)
+    year = month_index // MONTHS_PER_YEAR
+    replacement = (
+        (month_index % MONTHS_PER_YEAR == 0) & (year > 0) & (year % _batch(battery_replacement_years) == 0)
+    ) * _batch(battery_replacement_cost)
+    maintenance = np.broadcast_to(_batch(annual_maintenance) / MONTHS_PER_YEAR, replacement.shape)
+
+    solar_costs = loan['payment'] + maintenance + replacement
+    grid_bills, solar_costs = np.broadcast_arrays(grid['bills'], solar_costs)
+    savings = grid_bills - solar_costs
+
+    # Month-0 column for the down payment, then one column per month
+    upfront = np.broadcast_to(down_payment, savings.shape[:-1])
+    net_cash_flows = np.concatenate([-upfront[..., np.newaxis], savings], axis=-1)
+    solar_cumulative = upfront[..., np.newaxis] + np.cumsum(solar_costs, axis=-1)
+    grid_cumulative = np.cumsum(grid_bills, axis=-1)
+    cumulative_savings = grid_cumulative - solar_cumulative
+
+    payback = solve_monthly_payback(
+        np.concatenate([upfront[..., np.newaxis], solar_cumulative], axis=-1),
+        np.concatenate([np.zeros(upfront.shape + (1,)), grid_cumulative], axis=-1)
+    )
+
+    monthly_discount_rate = (1 + np.asarray(discount_rate, dtype=float)) ** (1 / MONTHS_PER_YEAR) - 1
+    monthly_irr = calculate_irr(net_cash_flows, lower=-0.5)
+
+    return {
+        'months': months,
+        'upfront': upfront,
+        'loan_payment': loan['payment'],
+        'loan_interest': loan['interest'],
+        'loan_principal': loan['principal'],
+        'loan_balance': loan['balance'],
+        'monthly_payment': loan['monthly_payment'],
+        'maintenance': maintenance,
+        'battery_replacement': replacement,
+        'energy_kwh': grid['energy_kwh'],
+        'grid_bills': grid_bills,
+        'solar_costs': solar_costs,
+        'savings': savings,
+        'cumulative_savings': cumulative_savings,
+        'net_cash_flows': net_cash_flows,
+        'pays_back': payback['pays_back'],
+        'payback_months': payback['payback_period'],
+        'npv': calculate_npv(net_cash_flows, monthly_discount_rate),
+        'irr': (1 + monthly_irr) ** MONTHS_PER_YEAR - 1
+    }
+
+
+def annual_view(cash_flows: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Aggregate monthly cash flows into years by reshaping, without recomputing anything.
+
+    The upfront down payment is included in the first year, matching calculate_roi().
+
+    Parameters:
+    cash_flows (Dict[str, Any]): Result of monthly_cash_flows()
+
+    Returns:
+    Dict[str, np.ndarray]: Annual totals of shape (..., years) for every monthly flow, plus
+        the year-end loan balance and cumulative savings
+    """
+    def by_year(values):
+        values = np.asarray(values)
+        return values.reshape(values.shape[:-1] + (-1, MONTHS_PER_YEAR))
+
+    annual = {
+        name: by_year(cash_flows[name]).sum(axis=-1)
+        for name in ['loan_payment', 'loan_interest', 'loan_principal', 'maintenance',
+                     'battery_replacement', 'energy_kwh', 'grid_bills', 'solar_costs', 'savings']
+    }
+    upfront = np.asarray(cash_flows['upfront'])[..., np.newaxis]
+    first_year = np.arange(annual['solar_costs'].shape[-1]) == 0
+    annual['solar_costs'] = annual['solar_costs'] + first_year * upfront
+    annual['savings'] = annual['savings'] - first_year * upfront
+
+    annual['loan_balance'] = by_year(cash_flows['loan_balance'])[..., -1]
+    annual['cumulative_savings'] = by_year(cash_flows['cumulative_savings'])[..., -1]
+    return annual
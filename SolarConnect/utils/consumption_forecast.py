@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
+from utils.cashflow import MONTHLY_CONSUMPTION_PROFILE, MONTHS_PER_YEAR
+from utils.solar_calculator import EXPANSION_SIZING_SHARE
+
+
+def fit_consumption_growth(monthly_kwh: np.ndarray, start_month: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Fit an exponential growth model to a history of monthly consumption.
+
+    The growth rate is the least-squares slope of log consumption against time, computed
+    in closed form so that a batch of histories (one per row) is fitted at once. Missing
+    or non-positive months are ignored. If the calendar month of the first value is given,
+    the seasonal consumption profile is removed before fitting.
+
+    Parameters:
+    monthly_kwh (np.ndarray): Monthly consumption in kWh, oldest first, shape (..., months)
+    start_month (int, optional): Calendar month (1-12) of the first value
+
+    Returns:
+    Dict[str, np.ndarray]: Dictionary with the annual 'growth_rate', the fitted
+        'base_annual_kwh' at the end of the history and the fit's 'r_squared'
+    """
+    kwh = np.asarray(monthly_kwh, dtype=float)
+    months = kwh.shape[-1]
+    if start_month is not None:
+        profile = np.asarray(MONTHLY_CONSUMPTION_PROFILE, dtype=float)
+        profile = profile / profile.mean()
+        kwh = kwh / profile[(np.arange(months) + start_month - 1) % MONTHS_PER_YEAR]
+
+    valid = np.isfinite(kwh) & (kwh > 0)
+    log_kwh = np.where(valid, np.log(np.where(valid, kwh, 1.0)), 0.0)
+    t = np.arange(months, dtype=float)
+
+    count = valid.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_mean = (valid * t).sum(axis=-1) / count
+        y_mean = log_kwh.sum(axis=-1) / count
+        t_dev = np.where(valid, t - t_mean[..., np.newaxis], 0.0)
+        y_dev = np.where(valid, log_kwh - y_mean[..., np.newaxis], 0.0)
+        slope = (t_dev * y_dev).sum(axis=-1) / (t_dev ** 2).sum(axis=-1)
+        residual = y_dev - slope[..., np.newaxis] * t_dev
+        r_squared = 1 - (residual ** 2).sum(axis=-1) / (y_dev ** 2).sum(axis=-1)
+
+    # Histories with fewer than two usable months have no trend
+    slope = np.where(count >= 2, slope, 0.0)
+    monthly_at_end = np.exp(y_mean + slope * (months - 1 - t_mean))
+
+    return {
+        'growth_rate': np.exp(slope * MONTHS_PER_YEAR) - 1,
+        'base_annual_kwh': monthly_at_end * MONTHS_PER_YEAR,
+        'r_squared': np.where(count >= 3, r_squared, np.nan)
+    }
+
+
+def forecast_consumption(
+    base_annual_kwh: float,
+    growth_rate: float = 0.0,
+    years: int = 25,
+    saturation_multiple: Optional[float] = None
+) -> np.ndarray:
+    """
+    Forecast annual consumption for every year of the analysis period.
+
+    Consumption grows exponentially at growth_rate, or, if a saturation multiple is given,
+    along a logistic curve with the same initial growth that levels off at that multiple of
+    the first year's consumption. All parameters may be arrays for batch runs.
+
+    Parameters:
+    base_annual_kwh (float): Consumption in the first year in kWh
+    growth_rate (float): Annual consumption growth rate as a decimal
+    years (int): Number of years to forecast
+    saturation_multiple (float, optional): Long-run consumption as a multiple of the first year
+
+    Returns:
+    np.ndarray: Annual consumption in kWh, shape (..., years)
+    """
+    base = np.asarray(base_annual_kwh, dtype=float)[..., np.newaxis]
+    growth = np.asarray(growth_rate, dtype=float)[..., np.newaxis]
+    t = np.arange(years)
+
+    if saturation_multiple is None:
+        return base * (1 + growth) ** t
+
+    capacity = np.maximum(np.asarray(saturation_multiple, dtype=float)[..., np.newaxis], 1 + 1e-9)
+    rate = np.log1p(growth) * capacity / (capacity - 1)
+    return base * capacity / (1 + (capacity - 1) * np.exp(-rate * t))
+
+
+def forecast_from_appliance_additions(
+    base_annual_kwh: float,
+    additions: Union[float, List[Dict[str, Any]]],
+    years: int = 25
+) -> np.ndarray:
+    """
+    Forecast annual consumption from planned or assumed appliance additions.
+
+    Parameters:
+    base_annual_kwh (float): Consumption in the first year in kWh
+    additions (float or List[Dict[str, Any]]): Either the daily kWh added every year, or a
+        list of additions with the 'year' (1 = first year) and the 'daily_kwh' they add
+    years (int): Number of years to forecast
+
+    Returns:
+    np.ndarray: Annual consumption in kWh, shape (..., years)
+    """
+    base = np.asarray(base_annual_kwh, dtype=float)[..., np.newaxis]
+    t = np.arange(years)
+
+    if isinstance(additions, (list, tuple)):
+        added_daily = np.zeros(years)
+        for addition in additions:
+            first_year = max(int(addition['year']) - 1, 0)
+            added_daily[first_year:] += float(addition['daily_kwh'])
+    else:
+        added_daily = np.asarray(additions, dtype=float)[..., np.newaxis] * t
+
+    return base + added_daily * 365
+
+
+def expansion_factor(consumption_by_year: np.ndarray, horizon_years: Optional[int] = None) -> np.ndarray:
+    """
+    Return the future expansion allowance that covers forecast consumption growth.
+
+    The growth is the peak consumption within the horizon relative to the first year, minus
+    one. calculate_system_size() adds only EXPANSION_SIZING_SHARE of its future_expansion to
+    the load, so the growth is scaled up to size the system for the full peak consumption.
+
+    Parameters:
+    consumption_by_year (np.ndarray): Annual consumption in kWh, shape (..., years)
+    horizon_years (int, optional): Number of years the system should cover, defaulting to all
+
+    Returns:
+    np.ndarray: future_expansion allowance as a decimal, shape (...)
+    """
+    consumption = np.asarray(consumption_by_year, dtype=float)
+    if horizon_years is not None:
+        consumption = consumption[..., :max(int(horizon_years), 1)]
+    growth = np.maximum(consumption.max(axis=-1) / consumption[..., 0] - 1, 0.0)
+    return growth / EXPANSION_SIZING_SHARE
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from data.kenya_counties import get_kenya_counties
+from data.load_profiles import get_reference_load_profiles
+from utils.solar_calculator import calculate_system_sizes, calculate_inverter_sizes
+from utils.tariff_engine import effective_tariff
+from utils.roi_calculator import evaluate_scenarios
+
+# Sizing assumptions for the nationwide comparison, as on the Solar Sizing page
+SIZING_DEFAULTS = {
+    'panel_wattage': 400,
+    'battery_voltage': 24,
+    'battery_dod': 0.8,
+    'autonomy_days': 1,
+    'system_efficiency': 0.85,
+    'future_expansion': 0.2
+}
+
+
+def county_payback_table(
+    load_profiles: Optional[List[Dict[str, Any]]] = None,
+    counties: Optional[Dict[str, Dict[str, Any]]] = None,
+    sizing: Optional[Dict[str, Any]] = None,
+    **scenario_inputs
+) -> pd.DataFrame:
+    """
+    Size, cost and evaluate a solar system for every county and load profile in one batch.
+
+    Profiles and counties form a (profiles, counties) grid: every profile's daily energy is
+    broadcast against every county's peak sun hours for the sizing, and the costs and
+    returns of all systems are evaluated with a single call to evaluate_scenarios(). Each
+    profile is billed at the all-in tariff of its consumer type and consumption, and the
+    savings cover the share of that consumption the array delivers in the county.
+
+    Parameters:
+    load_profiles (List[Dict[str, Any]], optional): Load profiles, defaulting to
+        data.load_profiles.get_reference_load_profiles()
+    counties (Dict[str, Dict[str, Any]], optional): County data, defaulting to all 47 counties
+    sizing (Dict[str, Any], optional): Overrides of SIZING_DEFAULTS
+    **scenario_inputs: Cost, grid and financing keyword arguments for evaluate_scenarios()
+
+    Returns:
+    pd.DataFrame: Tidy table with one row per county and profile, holding the county's
+        location and climate, the system size and cost, the share of consumption delivered by
+        solar, payback, ROI, NPV and LCOE
+    """
+    if load_profiles is None:
+        load_profiles = get_reference_load_profiles()
+    if counties is None:
+        counties = get_kenya_counties()
+    sizing = {**SIZING_DEFAULTS, **(sizing or {})}
+
+    county_names = list(counties)
+    peak_sun_hours = np.array([county['climate']['peak_sun_hours'] for county in counties.values()])
+    daily_energy = np.array([float(profile['daily_energy_kwh']) for profile in load_profiles])[:, np.newaxis]
+    ac_load_peak = np.array([float(profile.get('ac_load_peak_kw') or 0.0) for profile in load_profiles])[:, np.newaxis]
+
+    # Every profile in every county, shape (profiles, counties)
+    systems = calculate_system_sizes(daily_energy, peak_sun_hours[np.newaxis, :], **sizing)
+    panel_capacity = systems['total_panel_capacity_kw']
+    inverter_size = calculate_inverter_sizes(panel_capacity, ac_load_peak)
+
+    # Savings are credited for the consumption the array actually delivers at the county's
+    # solar resource, which falls short where the panel count is capped
+    delivered_energy = panel_capacity * peak_sun_hours[np.newaxis, :] * sizing['system_efficiency']
+    solar_fraction = np.minimum(1.0, delivered_energy / daily_energy)
+
+    # All-in tariff of each profile at its monthly consumption
+    tariffs = [effective_tariff(float(profile['daily_energy_kwh']) * 30, profile.get('consumer_type', 'Domestic'))
+               for profile in load_profiles]
+    energy_charge = np.array([tariff['energy_charge'] for tariff in tariffs])[:, np.newaxis]
+    fixed_charge = np.array([tariff['fixed_charge'] for tariff in tariffs])[:, np.newaxis]
+
+    results = evaluate_scenarios(
+        panel_capacity_kw=panel_capacity,
+        battery_capacity_kwh=systems['battery_capacity_kwh'],
+        inverter_size_kw=inverter_size,
+        annual_energy_kwh=daily_energy * 30 * 12 * solar_fraction,
+        **{'energy_charge': energy_charge, 'fixed_charge': fixed_charge, **scenario_inputs}
+    )
+
+    shape = panel_capacity.shape
+
+    def column(values):
+        return np.broadcast_to(np.asarray(values), shape).ravel()
+
+    return pd.DataFrame({
+        'county': column(np.array(county_names)[np.newaxis, :]),
+        'region': column(np.array([county['region'] for county in counties.values()])[np.newaxis, :]),
+        'latitude': column(np.array([county['coordinates']['latitude'] for county in counties.values()])),
+        'longitude': column(np.array([county['coordinates']['longitude'] for county in counties.values()])),
+        'peak_sun_hours': column(peak_sun_hours),
+        'profile': column(np.array([profile['name'] for profile in load_profiles])[:, np.newaxis]),
+        'daily_energy_kwh': column(daily_energy),
+        'number_of_panels': column(systems['number_of_panels']).astype(int),
+        'panel_capacity_kw': column(panel_capacity),
+        'battery_capacity_kwh': column(systems['battery_capacity_kwh']),
+        'inverter_size_kw': column(inverter_size),
+        'coverage_percentage': column(systems['coverage_percentage']),
+        'solar_fraction': column(solar_fraction),
+        'total_initial_cost': column(results['total_initial_cost']),
+        'payback_period': column(results['payback_period']),
+        'pays_back': column(results['pays_back']),
+        'roi_percent': column(results['roi_percent']),
+        'npv': column(results['npv']),
+        'lcoe_solar': column(results['lcoe_solar'])
+    })
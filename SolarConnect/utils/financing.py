@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from data.financing_offers import get_financing_offers
+from utils.cashflow import monthly_cash_flows, solve_monthly_payback, MONTHS_PER_YEAR
+from utils.roi_calculator import calculate_npv
+
+DAYS_PER_MONTH_AVERAGE = 365 / MONTHS_PER_YEAR
+
+
+def offer_payment_schedules(total_initial_cost: float, offers: List[Dict[str, Any]], months: int) -> Dict[str, np.ndarray]:
+    """
+    Build the upfront payment and monthly payment schedule of every financing offer at once.
+
+    Parameters:
+    total_initial_cost (float): System price in KES
+    offers (List[Dict[str, Any]]): Financing offers, see data.financing_offers.get_financing_offers()
+    months (int): Number of months in the schedules
+
+    Returns:
+    Dict[str, np.ndarray]: 'upfront' payments of shape (offers,) and monthly 'payments' of
+        shape (offers, months)
+    """
+    def column(name, default=0.0):
+        return np.array([float(offer.get(name, default)) for offer in offers])
+
+    structure = np.array([offer['structure'] for offer in offers])
+    unknown = set(structure) - {'amortizing', 'payg', 'balloon'}
+    if unknown:
+        raise ValueError(f"Unknown financing structure(s): {', '.join(sorted(unknown))}")
+
+    deposit = total_initial_cost * column('deposit_percent') / 100
+    financed = total_initial_cost - deposit
+    upfront = deposit + financed * column('fee_percent') / 100
+
+    term = column('term_months')[:, np.newaxis]
+    rate = column('annual_rate')[:, np.newaxis] / MONTHS_PER_YEAR
+    balloon = (financed * column('balloon_percent') / 100)[:, np.newaxis]
+    balloon = np.where((structure == 'balloon')[:, np.newaxis], balloon, 0.0)
+
+    # Annuity payment on the financed amount less the present value of any balloon
+    with np.errstate(divide='ignore', invalid='ignore'):
+        amortized = financed[:, np.newaxis] - balloon * (1 + rate) ** -term
+        annuity = np.where(rate > 0, amortized * rate / (1 - (1 + rate) ** -term), amortized / term)
+    payg = (total_initial_cost * column('daily_rate_percent') / 100 * DAYS_PER_MONTH_AVERAGE)[:, np.newaxis]
+    monthly_payment = np.where((structure == 'payg')[:, np.newaxis], payg, annuity)
+
+    month = np.arange(1, months + 1)
+    payments = np.where(month <= term, monthly_payment, 0.0) + np.where(month == term, balloon, 0.0)
+
+    return {
+        'upfront': upfront,
+        'payments': payments
+    }
+
+
+def evaluate_financing_offers(
+    total_initial_cost: float,
+    annual_maintenance: float,
+    battery_replacement_cost: float,
+    battery_replacement_years: int,
+    annual_energy_kwh: float,
+    energy_charge: float,
+    fixed_charge: float,
+    inflation_rate: float = 0.05,
+    analysis_period: int = 20,
+    discount_rate: float = 0.10,
+    offers: Optional[List[Dict[str, Any]]] = None,
+    include_cash: bool = True
+) -> pd.DataFrame:
+    """
+    Evaluate and rank a catalog of financing offers for one system in a single batched pass.
+
+    The grid bills, maintenance and battery replacements are the same for every offer, so
+    they are computed once with the monthly cash-flow engine; the payment schedules of all
+    offers are then built as one (offers, months) matrix and every metric is a reduction
+    over its month axis.
+
+    Parameters:
+    total_initial_cost (float): System price in KES
+    annual_maintenance (float): Annual maintenance cost in KES
+    battery_replacement_cost (float): Cost to replace batteries in KES
+    battery_replacement_years (int): Years between battery replacements
+    annual_energy_kwh (float): Annual energy consumption in kWh
+    energy_charge (float): Energy charge per kWh in KES
+    fixed_charge (float): Fixed monthly charge in KES
+    inflation_rate (float): Annual inflation rate for electricity costs
+    analysis_period (int): Number of years for the analysis
+    discount_rate (float): Annual discount rate for the net present value
+    offers (List[Dict[str, Any]], optional): Financing offers, defaulting to the catalog
+    include_cash (bool): Also evaluate paying the full price upfront
+
+    Returns:
+    pd.DataFrame: One row per offer with upfront payment, monthly burden, total cost,
+        cost of financing, NPV and payback, sorted by NPV with ranks for each criterion
+    """
+    if offers is None:
+        offers = get_financing_offers()
+    offers = list(offers)
+    if include_cash:
+        offers.append({"name": "Cash Purchase", "provider_type": "Cash", "structure": "amortizing",
+                       "deposit_percent": 100, "term_months": 0})
+
+    # Savings before financing: a cash purchase with the upfront price taken out
+    base = monthly_cash_flows(
+        total_initial_cost=total_initial_cost,
+        annual_maintenance=annual_maintenance,
+        battery_replacement_cost=battery_replacement_cost,
+        battery_replacement_years=battery_replacement_years,
+        annual_energy_kwh=annual_energy_kwh,
+        energy_charge=energy_charge,
+        fixed_charge=fixed_charge,
+        inflation_rate=inflation_rate,
+        analysis_period=analysis_period,
+        financing_percentage=0.0,
+        discount_rate=discount_rate
+    )
+    months = base['months']
+    operating_savings = base['grid_bills'] - base['maintenance'] - base['battery_replacement']
+
+    schedules = offer_payment_schedules(total_initial_cost, offers, months)
+    upfront = schedules['upfront']
+    payments = schedules['payments']
+
+    net_cash_flows = np.concatenate([-upfront[:, np.newaxis], operating_savings - payments], axis=-1)
+    monthly_discount_rate = (1 + discount_rate) ** (1 / MONTHS_PER_YEAR) - 1
+    npv = calculate_npv(net_cash_flows, monthly_discount_rate)
+    payments_pv = upfront + calculate_npv(np.concatenate([np.zeros((len(offers), 1)), payments], axis=-1),
+                                          monthly_discount_rate)
+
+    solar_cumulative = np.concatenate(
+        [upfront[:, np.newaxis], upfront[:, np.newaxis] + np.cumsum(payments + base['maintenance'] + base['battery_replacement'], axis=-1)],
+        axis=-1
+    )
+    grid_cumulative = np.concatenate([[0.0], np.cumsum(base['grid_bills'])])
+    payback = solve_monthly_payback(solar_cumulative, grid_cumulative)
+
+    total_paid = upfront + payments.sum(axis=-1)
+    first_year_net = (operating_savings[:MONTHS_PER_YEAR] - payments[:, :MONTHS_PER_YEAR]).sum(axis=-1) - upfront
+
+    results = pd.DataFrame({
+        'name': [offer['name'] for offer in offers],
+        'provider_type': [offer.get('provider_type', '') for offer in offers],
+        'structure': [offer['structure'] for offer in offers],
+        'term_months': [int(offer.get('term_months', 0)) for offer in offers],
+        'upfront_payment': upfront,
+        'monthly_payment': payments[:, 0],
+        'peak_monthly_payment': payments.max(axis=-1),
+        'monthly_burden': (payments[:, :MONTHS_PER_YEAR].sum(axis=-1)
+                           - operating_savings[:MONTHS_PER_YEAR].sum()) / MONTHS_PER_YEAR,
+        'total_paid': total_paid,
+        'cost_of_financing': total_paid - total_initial_cost,
+        'payments_present_value': payments_pv,
+        'first_year_net_savings': first_year_net,
+        'npv': npv,
+        'pays_back': payback['pays_back'],
+        'payback_years': np.where(payback['pays_back'], payback['payback_period'] / MONTHS_PER_YEAR, np.nan)
+    })
+
+    results['rank_total_cost'] = results['total_paid'].rank(method='min').astype(int)
+    results['rank_monthly_burden'] = results['monthly_burden'].rank(method='min').astype(int)
+    results['rank_npv'] = results['npv'].rank(method='min', ascending=False).astype(int)
+    return results.sort_values('rank_npv').reset_index(drop=True)
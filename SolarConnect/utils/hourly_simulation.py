@@ -0,0 +1,240 @@
+import numpy as np
+from typing import Dict, Any, Optional
+
+HOURS_PER_DAY = 24
+DAYS_PER_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+HOURS_PER_YEAR = int(DAYS_PER_MONTH.sum()) * HOURS_PER_DAY
+
+# Typical Kenyan household load shape (relative weight per hour, 00:00-23:00)
+# Low overnight base load, a small morning peak and a pronounced evening peak
+RESIDENTIAL_LOAD_SHAPE = np.array([
+    0.020, 0.018, 0.018, 0.018, 0.020, 0.030,  # 00-05
+    0.050, 0.055, 0.045, 0.035, 0.032, 0.032,  # 06-11
+    0.035, 0.035, 0.032, 0.032, 0.035, 0.045,  # 12-17
+    0.070, 0.085, 0.085, 0.070, 0.045, 0.028   # 18-23
+])
+RESIDENTIAL_LOAD_SHAPE = RESIDENTIAL_LOAD_SHAPE / RESIDENTIAL_LOAD_SHAPE.sum()
+
+# Typical commercial load shape (offices, shops, light manufacturing)
+# Base load overnight and a working-day plateau from 08:00 to 17:00
+COMMERCIAL_LOAD_SHAPE = np.array([
+    0.015, 0.015, 0.015, 0.015, 0.015, 0.020,  # 00-05
+    0.030, 0.050, 0.065, 0.068, 0.070, 0.070,  # 06-11
+    0.068, 0.068, 0.070, 0.070, 0.066, 0.055,  # 12-17
+    0.040, 0.030, 0.025, 0.020, 0.018, 0.016   # 18-23
+])
+COMMERCIAL_LOAD_SHAPE = COMMERCIAL_LOAD_SHAPE / COMMERCIAL_LOAD_SHAPE.sum()
+
+
+def monthly_peak_sun_hours(irradiance_data: Dict[str, Any]) -> np.ndarray:
+    """
+    Derive twelve monthly peak sun hour values from an irradiance data dictionary.
+
+    The different irradiance sources (PVGIS, simulated data, county database) store
+    monthly averages in different units, so the monthly values are only used for their
+    shape and scaled so that their mean matches the reported peak sun hours.
+
+    Parameters:
+    irradiance_data (Dict[str, Any]): Irradiance data with 'peak_sun_hours' and 'monthly_averages'
+
+    Returns:
+    np.ndarray: Peak sun hours for each month (Jan-Dec)
+    """
+    peak_sun_hours = float(irradiance_data['peak_sun_hours'])
+    monthly = np.asarray(irradiance_data.get('monthly_averages', []), dtype=float)
+
+    # Fall back to a flat profile if the monthly data is missing or unusable
+    if monthly.size != 12 or monthly.mean() <= 0:
+        return np.full(12, peak_sun_hours)
+
+    return monthly / monthly.mean() * peak_sun_hours
+
+
+def daily_irradiance_shape(sunrise: float = 6.5, sunset: float = 18.75) -> np.ndarray:
+    """
+    Calculate the normalized hourly shape of a clear day's irradiance.
+
+    Parameters:
+    sunrise (float): Sunrise time in decimal hours
+    sunset (float): Sunset time in decimal hours
+
+    Returns:
+    np.ndarray: 24 hourly weights summing to 1
+    """
+    hour_centres = np.arange(HOURS_PER_DAY) + 0.5
+    shape = np.sin(np.pi * (hour_centres - sunrise) / (sunset - sunrise))
+    shape = np.where((hour_centres > sunrise) & (hour_centres < sunset), shape, 0.0)
+    return shape / shape.sum()
+
+
+def hourly_irradiance(
+    monthly_psh: np.ndarray,
+    sunrise: float = 6.5,
+    sunset: float = 18.75,
+    variability: float = 0.0,
+    seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Synthesize an hourly irradiance series for a typical year from monthly peak sun hours.
+
+    Each day's energy is spread over daylight hours with a sine-shaped profile. Optional
+    day-to-day variability (cloudy and clear days) is added while preserving each month's mean.
+
+    Parameters:
+    monthly_psh (np.ndarray): Peak sun hours per month, shape (..., 12) for batches of locations
+    sunrise (float): Sunrise time in decimal hours
+    sunset (float): Sunset time in decimal hours
+    variability (float): Standard deviation of the daily clearness factor (0 for none)
+    seed (int, optional): Random seed for reproducible variability
+
+    Returns:
+    np.ndarray: Hourly irradiance in kW/m² (sun hours per hour), shape (..., 8760)
+    """
+    monthly_psh = np.asarray(monthly_psh, dtype=float)
+    month_of_day = np.repeat(np.arange(12), DAYS_PER_MONTH)
+
+    # Daily energy for every day of the year
+    daily_psh = monthly_psh[..., month_of_day]
+
+    if variability > 0:
+        rng = np.random.default_rng(seed)
+        factors = np.clip(rng.normal(1.0, variability, daily_psh.shape), 0.1, None)
+
+        # Rescale so every month keeps its average energy
+        month_sums = np.zeros(factors.shape[:-1] + (12,))
+        np.add.at(month_sums, (..., month_of_day), factors)
+        factors = factors / (month_sums / DAYS_PER_MONTH)[..., month_of_day]
+        daily_psh = daily_psh * factors
+
+    shape = daily_irradiance_shape(sunrise, sunset)
+    hourly = daily_psh[..., :, np.newaxis] * shape
+    return hourly.reshape(daily_psh.shape[:-1] + (HOURS_PER_YEAR,))
+
+
+def hourly_load_profile(daily_energy_kwh: float, load_shape: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Build an hourly load series for a typical year from daily energy consumption.
+
+    Parameters:
+    daily_energy_kwh (float): Daily energy consumption in kWh (scalar or array for batches)
+    load_shape (np.ndarray, optional): 24 hourly weights, defaults to RESIDENTIAL_LOAD_SHAPE
+
+    Returns:
+    np.ndarray: Hourly load in kW, shape (..., 8760)
+    """
+    if load_shape is None:
+        load_shape = RESIDENTIAL_LOAD_SHAPE
+    load_shape = np.asarray(load_shape, dtype=float)
+    load_shape = load_shape / load_shape.sum()
+
+    daily = np.asarray(daily_energy_kwh, dtype=float)[..., np.newaxis] * load_shape
+    return np.tile(daily, HOURS_PER_YEAR // HOURS_PER_DAY)
+
+
+def simulate_battery_dispatch(
+    pv_kw: np.ndarray,
+    load_kw: np.ndarray,
+    battery_capacity_kwh: float,
+    battery_dod: float = 0.8,
+    round_trip_efficiency: float = 0.9,
+    initial_soc: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Simulate hourly battery operation for a solar system with grid backup.
+
+    Surplus PV charges the battery, deficits are served from the battery down to the
+    depth-of-discharge limit and any remaining load is imported from the grid. The time
+    loop is sequential, but every step is vectorized over any leading batch dimensions.
+
+    Parameters:
+    pv_kw (np.ndarray): Hourly PV output in kW, shape (..., hours)
+    load_kw (np.ndarray): Hourly load in kW, shape (..., hours)
+    battery_capacity_kwh (float): Nominal battery capacity in kWh (scalar or batch array)
+    battery_dod (float): Battery depth of discharge as a decimal (0.0-1.0)
+    round_trip_efficiency (float): Battery round-trip efficiency as a decimal (0.0-1.0)
+    initial_soc (float): State of charge at the start of the simulation (0.0-1.0)
+
+    Returns:
+    Dict[str, Any]: Dictionary containing hourly state of charge and energy flows
+    """
+    pv_kw, load_kw = np.broadcast_arrays(np.asarray(pv_kw, dtype=float), np.asarray(load_kw, dtype=float))
+    batch_shape = pv_kw.shape[:-1]
+    hours = pv_kw.shape[-1]
+
+    capacity = np.broadcast_to(np.asarray(battery_capacity_kwh, dtype=float), batch_shape)
+    min_soc = np.broadcast_to(1 - np.asarray(battery_dod, dtype=float), batch_shape)
+    one_way_efficiency = np.sqrt(round_trip_efficiency)
+
+    # Avoid division by zero for systems without storage
+    safe_capacity = np.where(capacity > 0, capacity, 1.0)
+    has_battery = capacity > 0
+
+    net_kw = pv_kw - load_kw
+    soc = np.empty(batch_shape + (hours,))
+    grid_import = np.empty(batch_shape + (hours,))
+    curtailed = np.empty(batch_shape + (hours,))
+
+    current_soc = np.broadcast_to(np.asarray(initial_soc, dtype=float), batch_shape).copy()
+    for hour in range(hours):
+        net = net_kw[..., hour]
+
+        # Charging with surplus PV, limited by the headroom in the battery
+        headroom_kwh = (1.0 - current_soc) * safe_capacity
+        charge_kwh = np.where(has_battery, np.minimum(np.maximum(net, 0.0) * one_way_efficiency, headroom_kwh), 0.0)
+
+        # Discharging to cover deficits, limited by the depth of discharge
+        available_kwh = np.maximum(current_soc - min_soc, 0.0) * safe_capacity
+        discharge_kwh = np.where(has_battery, np.minimum(np.maximum(-net, 0.0) / one_way_efficiency, available_kwh), 0.0)
+
+        current_soc = current_soc + (charge_kwh - discharge_kwh) / safe_capacity
+        soc[..., hour] = current_soc
+        grid_import[..., hour] = np.maximum(-net, 0.0) - discharge_kwh * one_way_efficiency
+        curtailed[..., hour] = np.maximum(net, 0.0) - charge_kwh / one_way_efficiency
+
+    return {
+        'soc': soc,
+        'grid_import_kwh': grid_import,
+        'curtailed_kwh': curtailed,
+        'total_grid_import_kwh': grid_import.sum(axis=-1),
+        'total_load_kwh': load_kw.sum(axis=-1),
+        'solar_fraction': 1 - grid_import.sum(axis=-1) / np.maximum(load_kw.sum(axis=-1), 1e-9)
+    }
+
+
+def simulate_system_year(
+    system_results: Dict[str, Any],
+    irradiance_data: Dict[str, Any],
+    battery_dod: float = 0.8,
+    system_efficiency: float = 0.85,
+    load_shape: Optional[np.ndarray] = None,
+    pv_kw: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Run an hourly simulation for a typical year of a system sized by calculate_system_size().
+
+    Parameters:
+    system_results (Dict[str, Any]): System sizing results from calculate_system_size()
+    irradiance_data (Dict[str, Any]): Irradiance data for the location
+    battery_dod (float): Battery depth of discharge as a decimal (0.0-1.0)
+    system_efficiency (float): Overall system efficiency as a decimal (0.0-1.0)
+    load_shape (np.ndarray, optional): 24 hourly load weights
+    pv_kw (np.ndarray, optional): Hourly array output in kW, e.g. of a split roof from
+        transposition.simulate_sub_arrays(); defaults to a single horizontal-equivalent array
+
+    Returns:
+    Dict[str, Any]: Hourly simulation results from simulate_battery_dispatch() plus the input series
+    """
+    if pv_kw is None:
+        irradiance = hourly_irradiance(monthly_peak_sun_hours(irradiance_data))
+        pv_kw = irradiance * system_results['total_panel_capacity_kw'] * system_efficiency
+    load_kw = hourly_load_profile(system_results['daily_energy_kwh'], load_shape)
+
+    simulation = simulate_battery_dispatch(
+        pv_kw,
+        load_kw,
+        battery_capacity_kwh=system_results['battery_capacity_kwh'],
+        battery_dod=battery_dod
+    )
+    simulation['pv_kw'] = pv_kw
+    simulation['load_kw'] = load_kw
+    return simulation
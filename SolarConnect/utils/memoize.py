@@ -0,0 +1,160 @@
+import copy
+import functools
+import hashlib
+import inspect
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Any, Callable
+
+# All memoized functions, keyed by qualified name, for stats and cache clearing
+_registry: Dict[str, Callable] = {}
+
+
+class UncacheableArgument(TypeError):
+    """Raised when an argument cannot be turned into a stable cache key."""
+
+
+def normalize_key(value: Any) -> Any:
+    """
+    Convert a function argument into a hashable, normalized cache key component.
+
+    Numbers are normalized to floats rounded to 12 significant digits so that 5, 5.0 and
+    np.float64(5.0) share a cache entry, containers are converted recursively and NumPy
+    arrays are hashed by content.
+
+    Parameters:
+    value (Any): Argument value
+
+    Returns:
+    Any: Hashable key component
+
+    Raises:
+    UncacheableArgument: If the value has no stable key representation
+    """
+    if value is None or isinstance(value, (str, bool, np.bool_)):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(f"{float(value):.12g}")
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(k), normalize_key(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ('seq', tuple(normalize_key(v) for v in value))
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return ('seq', tuple(normalize_key(v) for v in value.ravel().tolist()), value.shape)
+        digest = hashlib.sha1(value.tobytes()).hexdigest()
+        return ('ndarray', value.shape, value.dtype.str, digest)
+    raise UncacheableArgument(f"Cannot build a cache key for {type(value).__name__}")
+
+
+def _result_nbytes(value: Any) -> int:
+    """Estimate the memory held by NumPy arrays inside a (nested) result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_result_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_result_nbytes(v) for v in value)
+    return 0
+
+
+def memoize(maxsize: int = 256, max_entry_bytes: int = 8 * 1024 * 1024) -> Callable:
+    """
+    Decorator that memoizes a pure calculator on its normalized arguments.
+
+    Arguments are bound to the function signature with defaults applied, so positional
+    and keyword calls share entries. The cache is a bounded LRU and every call returns a
+    deep copy of the cached result, so callers can modify results freely. Calls with
+    arguments that cannot be keyed are passed straight through, and results holding more
+    than max_entry_bytes of array data (large batch evaluations) are not stored.
+
+    The wrapped function gains cache_info() and cache_clear() methods.
+
+    Parameters:
+    maxsize (int): Maximum number of cached results
+    max_entry_bytes (int): Largest result, in bytes of array data, that will be cached
+
+    Returns:
+    Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        cache: OrderedDict = OrderedDict()
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'uncacheable': 0, 'oversize': 0}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = normalize_key(bound.arguments)
+            except UncacheableArgument:
+                with lock:
+                    stats['uncacheable'] += 1
+                return func(*args, **kwargs)
+
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    stats['hits'] += 1
+                    return copy.deepcopy(cache[key])
+                stats['misses'] += 1
+
+            result = func(*args, **kwargs)
+
+            if _result_nbytes(result) > max_entry_bytes:
+                with lock:
+                    stats['oversize'] += 1
+                return result
+
+            with lock:
+                cache[key] = copy.deepcopy(result)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    stats['evictions'] += 1
+
+            return result
+
+        def cache_info() -> Dict[str, Any]:
+            with lock:
+                calls = stats['hits'] + stats['misses']
+                return {
+                    **stats,
+                    'currsize': len(cache),
+                    'maxsize': maxsize,
+                    'hit_rate': stats['hits'] / calls if calls else 0.0
+                }
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                for name in stats:
+                    stats[name] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _registry[f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return cache statistics for every memoized function.
+
+    Returns:
+    Dict[str, Dict[str, Any]]: Cache statistics keyed by function name
+    """
+    return {name: func.cache_info() for name, func in _registry.items()}
+
+
+def clear_all_caches() -> None:
+    """
+    Clear the caches of every memoized function.
+    """
+    for func in _registry.values():
+        func.cache_clear()
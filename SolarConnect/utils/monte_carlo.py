@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+from utils.roi_calculator import calculate_system_costs, calculate_roi
+
+# Default uncertainty assumptions for Kenyan residential systems
+RISK_ASSUMPTIONS = {
+    # Year-to-year noise on grid tariff escalation (fuel cost charge, forex adjustment)
+    'escalation_volatility': 0.04,
+    # Chance of an ERC tariff review in any year and its average size
+    'tariff_review_probability': 0.15,
+    'tariff_review_size': 0.12,
+    # Spread (lognormal sigma) of quoted equipment and replacement battery prices
+    'equipment_cost_uncertainty': 0.10,
+    'battery_cost_uncertainty': 0.20,
+    # Panel output degradation per year and its spread between systems
+    'degradation_rate': 0.005,
+    'degradation_uncertainty': 0.002,
+    # Spread (lognormal sigma) of the battery service life
+    'battery_life_uncertainty': 0.25
+}
+
+RISK_METRICS = {
+    'payback_period': 'Payback Period (years)',
+    'npv': 'Net Present Value (KES)',
+    'irr': 'Internal Rate of Return',
+    'lcoe_solar': 'Solar LCOE (KES/kWh)',
+    'total_savings': 'Total Savings (KES)'
+}
+
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+def _simulate_shard(
+    base_inputs: Dict[str, Any],
+    assumptions: Dict[str, float],
+    discount_rate: float,
+    paths: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """Simulate one shard of paths; a module-level function so process pools can run it."""
+    rng = np.random.default_rng(seed)
+    years = int(base_inputs['analysis_period'])
+
+    costs = calculate_system_costs.__wrapped__(
+        panel_capacity_kw=base_inputs['panel_capacity_kw'],
+        battery_capacity_kwh=base_inputs['battery_capacity_kwh'],
+        inverter_size_kw=base_inputs['inverter_size_kw'],
+        panel_cost_per_wp=base_inputs['panel_cost_per_wp'],
+        battery_cost_per_kwh=base_inputs['battery_cost_per_kwh'],
+        inverter_cost_per_kw=base_inputs['inverter_cost_per_kw'],
+        installation_percent=base_inputs['installation_percent']
+    )
+
+    # Lognormal cost multipliers with a mean of 1
+    def cost_multiplier(sigma):
+        return rng.lognormal(-sigma ** 2 / 2, sigma, paths)
+
+    initial_cost = costs['total_initial_cost'] * cost_multiplier(assumptions['equipment_cost_uncertainty'])
+    replacement_cost = costs['battery_cost'] * cost_multiplier(assumptions['battery_cost_uncertainty'])
+    battery_life = np.maximum(np.round(
+        base_inputs['battery_replacement_years'] * cost_multiplier(assumptions['battery_life_uncertainty'])
+    ), 1)
+
+    # Tariff escalation paths: noisy annual escalation plus occasional tariff reviews.
+    # The drift is reduced by the expected review increase so that the mean escalation
+    # equals the deterministic inflation rate.
+    review_probability = assumptions['tariff_review_probability']
+    review_size = assumptions['tariff_review_size']
+    reviews = rng.random((paths, years)) < review_probability
+    escalation = (
+        base_inputs['inflation_rate'] - review_probability * review_size
+        + assumptions['escalation_volatility'] * rng.standard_normal((paths, years))
+        + reviews * rng.normal(review_size, review_size / 2, (paths, years))
+    )
+    escalation = np.maximum(escalation, -0.5)
+    escalation[:, 0] = 0.0
+    tariff_index = np.cumprod(1 + escalation, axis=1)
+
+    # Panel degradation reduces the share of the grid energy bill that solar avoids
+    degradation = np.clip(
+        rng.normal(assumptions['degradation_rate'], assumptions['degradation_uncertainty'], paths), 0, None
+    )
+    yield_factor = (1 - degradation[:, np.newaxis]) ** np.arange(years)
+
+    consumption_by_year = base_inputs['annual_energy_kwh'] * (
+        1 + base_inputs.get('consumption_growth', 0.0)
+    ) ** np.arange(years)
+    annual_energy_cost = consumption_by_year * base_inputs['energy_charge']
+    annual_fixed_cost = base_inputs['fixed_charge'] * 12
+    avoided_grid_costs = (annual_energy_cost * yield_factor + annual_fixed_cost) * tariff_index
+
+    roi = calculate_roi.__wrapped__(
+        total_initial_cost=initial_cost,
+        annual_maintenance=base_inputs['maintenance_annual'],
+        battery_replacement_cost=replacement_cost,
+        battery_replacement_years=battery_life,
+        grid_costs={'annual_costs': avoided_grid_costs},
+        analysis_period=years,
+        financing_percentage=base_inputs['financing_percentage'],
+        financing_years=base_inputs['financing_years'],
+        financing_interest=base_inputs['financing_interest'],
+        discount_rate=discount_rate,
+        annual_energy_kwh=np.broadcast_to(consumption_by_year, (paths, years))
+    )
+
+    return {
+        'payback_period': roi['payback_period'],
+        'pays_back': roi['pays_back'],
+        'npv': roi['npv'],
+        'irr': roi['irr'],
+        'lcoe_solar': roi['lcoe_solar'],
+        'total_savings': roi['total_savings'],
+        'initial_cost': initial_cost,
+        'battery_replacement_years': battery_life,
+        'final_tariff_index': tariff_index[:, -1]
+    }
+
+
+def simulate_financial_risk(
+    base_inputs: Dict[str, Any],
+    paths: int = 10000,
+    discount_rate: Optional[float] = None,
+    assumptions: Optional[Dict[str, float]] = None,
+    seed: Optional[int] = None,
+    shard_size: int = 50000,
+    n_jobs: int = 1
+) -> Dict[str, Any]:
+    """
+    Run a Monte Carlo analysis of payback, NPV and IRR under tariff and cost uncertainty.
+
+    Every path samples its own grid tariff escalation path (annual noise plus occasional
+    tariff reviews), equipment and replacement battery prices, panel degradation rate and
+    battery life. All paths of a shard are evaluated as one vectorized batch through
+    calculate_roi(). Paths are always generated in shards of shard_size with independent
+    seeds, so a given seed gives the same results whether the shards run in this process
+    or, with n_jobs > 1, in a process pool.
+
+    Parameters:
+    base_inputs (Dict[str, Any]): Base scenario as keyword arguments for evaluate_scenarios()
+        (for example from ScenarioPipeline.evaluation_inputs())
+    paths (int): Number of Monte Carlo paths
+    discount_rate (float, optional): Annual discount rate for the NPV and LCOE, defaulting to
+        the base scenario's discount_rate (or 10%)
+    assumptions (Dict[str, float], optional): Overrides for RISK_ASSUMPTIONS
+    seed (int, optional): Random seed for reproducible results
+    shard_size (int): Number of paths evaluated per vectorized batch
+    n_jobs (int): Number of worker processes; 1 runs every shard in this process
+
+    Returns:
+    Dict[str, Any]: Dictionary containing the per-path samples, a percentile table, the
+        probability of paying back within the analysis period and the assumptions used.
+        Paths that do not pay back have a NaN payback period, and payback percentiles that
+        fall among them are NaN
+
+    Raises:
+    ValueError: If paths is less than 1
+    """
+    assumptions = {**RISK_ASSUMPTIONS, **(assumptions or {})}
+    if discount_rate is None:
+        discount_rate = base_inputs.get('discount_rate', 0.10)
+    paths = int(paths)
+    if paths < 1:
+        raise ValueError(f"paths must be at least 1, got {paths}")
+    shard_size = max(int(shard_size), 1)
+
+    shard_paths = [min(shard_size, paths - start) for start in range(0, paths, shard_size)]
+    shard_seeds = np.random.SeedSequence(seed).spawn(len(shard_paths))
+    shard_args = [
+        (base_inputs, assumptions, discount_rate, count, shard_seed)
+        for count, shard_seed in zip(shard_paths, shard_seeds)
+    ]
+
+    if n_jobs > 1 and len(shard_args) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            shards = list(executor.map(_simulate_shard, *zip(*shard_args)))
+    else:
+        shards = [_simulate_shard(*args) for args in shard_args]
+
+    samples = pd.DataFrame({
+        name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]
+    })
+
+    # Paths that never pay back have no payback period rather than the period + 1 placeholder
+    samples['payback_period'] = samples['payback_period'].where(samples['pays_back'])
+
+    def summary(metric):
+        if metric != 'payback_period':
+            return [np.nanmean(samples[metric])] + list(np.nanpercentile(samples[metric], PERCENTILES))
+        # Percentiles over all paths, counting the non-paying ones as the longest; a percentile
+        # that falls among them is NaN ("not within the analysis period"), as is the mean
+        payback = samples['payback_period'].fillna(np.inf).to_numpy()
+        values = np.percentile(payback, PERCENTILES, method='inverted_cdf')
+        mean = payback.mean() if np.isfinite(payback).all() else np.inf
+        return [np.nan if not np.isfinite(value) else value for value in [mean, *values]]
+
+    percentiles = pd.DataFrame(
+        {metric: summary(metric) for metric in RISK_METRICS},
+        index=['mean'] + [f'P{p}' for p in PERCENTILES]
+    ).T
+    percentiles.insert(0, 'label', [RISK_METRICS[metric] for metric in percentiles.index])
+
+    return {
+        'samples': samples,
+        'percentiles': percentiles,
+        'probability_of_payback': float(samples['pays_back'].mean()),
+        'probability_positive_npv': float((samples['npv'] > 0).mean()),
+        'paths': paths,
+        'assumptions': assumptions
+    }
@@ -0,0 +1,163 @@
+import numpy as np
+from typing import Dict, Any, Optional
+from data.grid_reliability import get_regional_outage_statistics, OUTAGE_START_HOUR_WEIGHTS
+from utils.hourly_simulation import daily_irradiance_shape, RESIDENTIAL_LOAD_SHAPE, HOURS_PER_DAY
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def sample_outages(
+    statistics: Dict[str, float],
+    years: int,
+    rng: np.random.Generator,
+    max_duration_hours: float = 72
+) -> Dict[str, np.ndarray]:
+    """
+    Sample the outage events of many simulated years at once.
+
+    Parameters:
+    statistics (Dict[str, float]): Outage statistics of a region (see data.grid_reliability)
+    years (int): Number of simulated years
+    rng (np.random.Generator): Random number generator
+    max_duration_hours (float): Longest outage considered; longer outages are truncated
+
+    Returns:
+    Dict[str, np.ndarray]: The 'year' index, 'start_hour' (hour of day) and 'duration_hours'
+        of every event, and the number of 'events_per_year'
+    """
+    events_per_year = rng.poisson(statistics['outages_per_year'], years)
+    year = np.repeat(np.arange(years), events_per_year)
+    count = len(year)
+
+    start_weights = np.asarray(OUTAGE_START_HOUR_WEIGHTS, dtype=float)
+    start_hour = rng.choice(HOURS_PER_DAY, size=count, p=start_weights / start_weights.sum())
+    duration = rng.lognormal(np.log(statistics['median_duration_hours']), statistics['duration_sigma'], count)
+
+    return {
+        'year': year,
+        'start_hour': start_hour,
+        'duration_hours': np.minimum(duration, max_duration_hours),
+        'events_per_year': events_per_year
+    }
+
+
+def simulate_outage_coverage(
+    region: str,
+    battery_capacity_kwh: float,
+    daily_energy_kwh: float,
+    battery_dod: float = 0.8,
+    panel_capacity_kw: float = 0.0,
+    peak_sun_hours: float = 5.5,
+    load_shape: Optional[np.ndarray] = None,
+    critical_load_fraction: float = 1.0,
+    outage_cost_per_hour: float = 150.0,
+    initial_state_of_charge: float = 1.0,
+    round_trip_efficiency: float = 0.9,
+    years: int = 5000,
+    max_duration_hours: float = 72,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Simulate how much of the grid outage time a solar and battery system covers.
+
+    Thousands of years of outages are sampled for the region and all events are simulated
+    together, stepping through the hours of the outages: the backed-up load is served by
+    the panels first and the battery second, and surplus solar recharges the battery. An
+    hour is covered in the proportion of its load that is served.
+
+    Parameters:
+    region (str): Region name from get_county_regions()
+    battery_capacity_kwh (float): Battery capacity in kWh
+    daily_energy_kwh (float): Daily energy consumption in kWh
+    battery_dod (float): Battery depth of discharge as a decimal (0.0-1.0)
+    panel_capacity_kw (float): Solar panel capacity in kW, 0 for battery-only backup
+    peak_sun_hours (float): Peak sun hours for the location
+    load_shape (np.ndarray, optional): 24 hourly load weights, defaults to RESIDENTIAL_LOAD_SHAPE
+    critical_load_fraction (float): Share of the load kept on during outages
+    outage_cost_per_hour (float): Cost of an hour without power in KES (lost sales,
+        generator fuel, spoiled goods)
+    initial_state_of_charge (float): Usable battery charge when an outage starts (0.0-1.0)
+    round_trip_efficiency (float): Battery round-trip efficiency as a decimal
+    years (int): Number of simulated years
+    max_duration_hours (float): Longest outage considered
+    seed (int, optional): Random seed for reproducible results
+
+    Returns:
+    Dict[str, Any]: Dictionary with the overall 'coverage_fraction' of outage hours, per-year
+        arrays of outage hours, covered hours, unserved energy and avoided losses, their
+        means and 'percentiles', and the region's outage statistics
+
+    Raises:
+    ValueError: If the region has no outage statistics or fewer than one year is simulated
+    """
+    if years < 1:
+        raise ValueError("At least one year must be simulated")
+    statistics = get_regional_outage_statistics().get(region)
+    if statistics is None:
+        raise ValueError(f"No outage statistics for region: {region}")
+    if load_shape is None:
+        load_shape = RESIDENTIAL_LOAD_SHAPE
+    load_shape = np.asarray(load_shape, dtype=float) / np.sum(load_shape)
+
+    rng = np.random.default_rng(seed)
+    events = sample_outages(statistics, years, rng, max_duration_hours)
+    start_hour = events['start_hour']
+    duration = events['duration_hours']
+
+    hourly_load = daily_energy_kwh * critical_load_fraction * load_shape
+    hourly_pv = panel_capacity_kw * peak_sun_hours * daily_irradiance_shape()
+    usable_capacity = battery_capacity_kwh * battery_dod
+    efficiency = np.sqrt(round_trip_efficiency)
+
+    # Step through the outage hours of all events at once. Events are ordered longest first,
+    # so the events still running in a given hour are always a leading slice.
+    order = np.argsort(-duration, kind='stable')
+    year = events['year'][order]
+    start_hour = start_hour[order]
+    duration = duration[order]
+    hours = np.arange(int(np.ceil(duration.max(initial=0))))
+    running = len(duration) - np.searchsorted(duration[::-1], hours, side='right')
+
+    state_of_charge = np.full(len(duration), usable_capacity * initial_state_of_charge)
+    covered_hours = np.zeros(len(duration))
+    unserved_kwh = np.zeros(len(duration))
+    for hour, count in enumerate(running):
+        active = slice(0, count)
+        share = np.minimum(duration[active] - hour, 1.0)
+        hour_of_day = (start_hour[active] + hour) % HOURS_PER_DAY
+        load = hourly_load[hour_of_day] * share
+        pv = hourly_pv[hour_of_day] * share
+
+        soc = state_of_charge[active]
+        from_battery = np.minimum(np.maximum(load - pv, 0.0), soc * efficiency)
+        surplus = np.maximum(pv - load, 0.0)
+        state_of_charge[active] = np.minimum(soc - from_battery / efficiency + surplus * efficiency, usable_capacity)
+
+        served = np.minimum(load, pv) + from_battery
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covered_hours[active] += np.where(load > 0, served / load, 1.0) * share
+        unserved_kwh[active] += np.maximum(load - served, 0.0)
+
+    # Annual totals per simulated year
+    outage_hours = np.bincount(year, weights=duration, minlength=years)
+    covered = np.bincount(year, weights=covered_hours, minlength=years)
+    unserved = np.bincount(year, weights=unserved_kwh, minlength=years)
+    avoided_loss = covered * outage_cost_per_hour
+
+    annual = {
+        'outage_hours': outage_hours,
+        'covered_hours': covered,
+        'unserved_kwh': unserved,
+        'avoided_loss': avoided_loss
+    }
+    total_outage_hours = outage_hours.sum()
+
+    return {
+        'coverage_fraction': float(covered.sum() / total_outage_hours) if total_outage_hours > 0 else 1.0,
+        'annual': annual,
+        'mean': {name: float(values.mean()) for name, values in annual.items()},
+        'percentiles': {name: dict(zip(PERCENTILES, np.percentile(values, PERCENTILES))) for name, values in annual.items()},
+        'events_per_year': events['events_per_year'],
+        'statistics': statistics,
+        'years': years
+    }
@@ -1,123 +1,105 @@
 import io
+import math
+import os
+import threading
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-import matplotlib.pyplot as plt
+from reportlab.graphics.shapes import Drawing, String, Circle, Group
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.legends import LineLegend
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List, Callable, Optional, Union, BinaryIO
 import base64
 
-def generate_pdf_report(data: Dict[str, Any]) -> bytes:
+# Shared look of the label/value tables in every section
+KEY_VALUE_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+NARROW_LABEL_WIDTHS = (1.5*inch, 4*inch)
+WIDE_LABEL_WIDTHS = (2*inch, 3.5*inch)
+
+DISCLAIMER_TEXT = """
+This report provides an estimate based on the information provided and general assumptions.
+Actual costs, savings, and payback period may vary depending on specific installation
+conditions, equipment used, and future electricity prices. It is recommended to consult
+with qualified solar professionals before making any investment decisions.
+"""
+
+NEXT_STEPS_TEXT = """
+1. Contact qualified solar installers for a detailed assessment and quotation.
+2. Verify available space for panel installation at your property.
+3. Check for any local permits or regulations that may apply to solar installations.
+4. Inquire about available incentives or financing options for solar systems.
+
+Thank you for using the Kenya Solar System Sizing App!
+"""
+
+
+class ReportSection:
     """
-    Generate a PDF report with solar system details, cost analysis, and ROI.
-    
-    Parameters:
-    data (Dict[str, Any]): Dictionary containing all data for the report
-    
-    Returns:
-    bytes: PDF report as bytes
+    A titled report section.
+
+    The builder receives the report data and returns the rows of a label/value table, or
+    for sections with table=False a list of flowables; returning None skips the section.
+    fields names the report data the builder reads, by top-level key, as a list of sub-keys
+    or None for the whole value. The report cache keys reports on these fields only; a
+    section without fields is keyed on all of the report data.
     """
-    # Create a file-like buffer to receive PDF data
-    buffer = io.BytesIO()
-    
-    # Create the PDF object
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Container for the elements to be added to the PDF
-    elements = []
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
-    
-    # Create custom styles
-    section_title_style = ParagraphStyle(
-        'SectionTitle',
-        parent=styles['Heading2'],
-        spaceBefore=10,
-        spaceAfter=6,
-        textColor=colors.darkorange
-    )
-    
-    # Add title
-    elements.append(Paragraph("Solar System Report", title_style))
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add customer information
-    elements.append(Paragraph("Customer Information", section_title_style))
-    customer_info = [
+
+    def __init__(self, title: str, build: Callable, table: bool = True, col_widths=WIDE_LABEL_WIDTHS,
+                 fields: Optional[Dict[str, Optional[List[str]]]] = None):
+        self.title = title
+        self.build = build
+        self.table = table
+        self.col_widths = col_widths
+        self.fields = fields
+
+
+def _customer_rows(data, styles):
+    return [
         ["Name:", data['customer_info']['name']],
         ["Email:", data['customer_info']['email']],
         ["Phone:", data['customer_info']['phone']],
         ["Date:", data['customer_info']['date']]
     ]
-    t = Table(customer_info, colWidths=[1.5*inch, 4*inch])
-    t.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add location information
-    if 'location' in data:
-        elements.append(Paragraph("Location", section_title_style))
-        location_info = [
-            ["Location:", data['location']['location_name']],
-            ["Latitude:", f"{data['location']['latitude']:.6f}"],
-            ["Longitude:", f"{data['location']['longitude']:.6f}"]
-        ]
-        t = Table(location_info, colWidths=[1.5*inch, 4*inch])
-        t.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        elements.append(t)
-        elements.append(Spacer(1, 0.25*inch))
-    
-    # Add energy usage information
-    elements.append(Paragraph("Energy Consumption", section_title_style))
-    energy_info = [
+
+
+def _location_rows(data, styles):
+    if 'location' not in data:
+        return None
+    return [
+        ["Location:", data['location']['location_name']],
+        ["Latitude:", f"{data['location']['latitude']:.6f}"],
+        ["Longitude:", f"{data['location']['longitude']:.6f}"]
+    ]
+
+
+def _energy_rows(data, styles):
+    return [
         ["Daily Energy Consumption:", f"{data['energy_usage']['daily_kwh']:.2f} kWh"],
         ["Monthly Energy Consumption:", f"{data['energy_usage']['monthly_kwh']:.2f} kWh"],
         ["Annual Energy Consumption:", f"{data['energy_usage']['monthly_kwh'] * 12:.2f} kWh"]
     ]
-    t = Table(energy_info, colWidths=[2*inch, 3.5*inch])
-    t.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add solar system details
-    elements.append(Paragraph("Recommended Solar System", section_title_style))
-    solar_info = [
+
+
+def _solar_rows(data, styles):
+    return [
         ["Solar Array Size:", f"{data['solar_sizing']['total_panel_capacity_kw']:.2f} kWp"],
         ["Number of Panels:", f"{data['solar_sizing']['number_of_panels']}"],
         ["Battery Capacity:", f"{data['solar_sizing']['battery_capacity_kwh']:.2f} kWh"],
         ["Battery Voltage:", f"{data['solar_sizing']['battery_voltage']} V"],
         ["Array Area (approx.):", f"{data['solar_sizing']['array_area_sqm']:.2f} m²"]
     ]
-    t = Table(solar_info, colWidths=[2*inch, 3.5*inch])
-    t.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add cost analysis
-    elements.append(Paragraph("Cost Analysis", section_title_style))
-    cost_info = [
+
+
+def _cost_rows(data, styles):
+    return [
         ["Initial Investment:", f"KES {data['cost_analysis']['total_initial_cost']:,.2f}"],
         ["Solar Panels:", f"KES {data['cost_analysis']['panel_cost']:,.2f}"],
         ["Battery System:", f"KES {data['cost_analysis']['battery_cost']:,.2f}"],
@@ -125,106 +107,280 @@ def generate_pdf_report(data: Dict[str, Any]) -> bytes:
         ["Installation:", f"KES {data['cost_analysis']['installation_cost']:,.2f}"],
         ["Annual Maintenance:", f"KES {data['cost_analysis']['maintenance_annual']:,.2f}"]
     ]
-    t = Table(cost_info, colWidths=[2*inch, 3.5*inch])
-    t.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Add ROI analysis
-    elements.append(Paragraph("Return on Investment", section_title_style))
+
+
+def _roi_rows(data, styles):
     roi_info = [
-        ["Payback Period:", f"{data['roi_data']['payback_period']:.1f} years"],
+        ["Payback Period:", f"{data['roi_data']['payback_period']:.1f} years" if data['roi_data'].get('pays_back', True)
+                            else f"Over {data['cost_analysis']['analysis_period']} years"],
         ["ROI:", f"{data['roi_data']['roi_percent']:.1f}%"],
         ["Lifetime Savings:", f"KES {data['roi_data']['total_savings']:,.2f}"],
         ["Analysis Period:", f"{data['cost_analysis']['analysis_period']} years"]
     ]
-    t = Table(roi_info, colWidths=[2*inch, 3.5*inch])
-    t.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Generate cost comparison chart
-    fig, ax = plt.subplots(figsize=(7, 4))
-    years = list(range(1, data['cost_analysis']['analysis_period'] + 1))
-    
+    if 'npv' in data['roi_data']:
+        roi_data = data['roi_data']
+        roi_info += [
+            ["Net Present Value:", f"KES {roi_data['npv']:,.2f} (at {roi_data['discount_rate'] * 100:.0f}% discount rate)"],
+            ["Internal Rate of Return:", "n/a" if np.isnan(roi_data['irr']) else f"{roi_data['irr'] * 100:.1f}%"],
+            ["Cost of Energy:", f"Solar KES {roi_data['lcoe_solar']:.2f}/kWh vs grid KES {roi_data['lcoe_grid']:.2f}/kWh"]
+        ]
+    return roi_info
+
+
+def _nice_step(span: float, target_steps: int = 5) -> float:
+    """Return a 1, 2 or 5 times power-of-ten axis step giving about target_steps steps."""
+    if span <= 0:
+        return 1.0
+    raw = span / target_steps
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 5, 10):
+        if raw <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def _cost_chart_flowables(data, styles):
+    analysis_period = data['cost_analysis']['analysis_period']
+    years = list(range(1, analysis_period + 1))
+
     # Extract cumulative costs
-    grid_costs = data['roi_data']['grid_cumulative_costs']
-    solar_costs = data['roi_data']['solar_cumulative_costs']
-    
-    # Plot cumulative costs
-    ax.plot(years, grid_costs, 'b-', label='Grid Electricity')
-    ax.plot(years, solar_costs, 'g-', label='Solar System')
-    
+    grid_costs = [float(cost) for cost in data['roi_data']['grid_cumulative_costs']]
+    solar_costs = [float(cost) for cost in data['roi_data']['solar_cumulative_costs']]
+
+    drawing = Drawing(6*inch, 3.5*inch)
+    plot = LinePlot()
+    plot.x, plot.y = 75, 40
+    plot.width, plot.height = drawing.width - 95, drawing.height - 80
+    plot.data = [list(zip(years, grid_costs)), list(zip(years, solar_costs))]
+    plot.lines[0].strokeColor = colors.blue
+    plot.lines[1].strokeColor = colors.green
+
+    # Fixed axis ranges so the payback marker can be placed in drawing coordinates
+    x_min, x_max = 1, max(analysis_period, 2)
+    y_step = _nice_step(max(grid_costs + solar_costs + [1.0]))
+    y_max = math.ceil(max(grid_costs + solar_costs + [1.0]) / y_step) * y_step
+    plot.xValueAxis.valueMin, plot.xValueAxis.valueMax = x_min, x_max
+    plot.xValueAxis.valueStep = _nice_step(x_max - x_min, 10)
+    plot.yValueAxis.valueMin, plot.yValueAxis.valueMax, plot.yValueAxis.valueStep = 0, y_max, y_step
+    plot.yValueAxis.labelTextFormat = lambda value: f"{value:,.0f}"
+    for axis in (plot.xValueAxis, plot.yValueAxis):
+        axis.visibleGrid = True
+        axis.gridStrokeColor = colors.lightgrey
+        axis.labels.fontName = 'Helvetica'
+        axis.labels.fontSize = 7
+    drawing.add(plot)
+
+    def to_drawing(year, cost):
+        return (plot.x + (year - x_min) / (x_max - x_min) * plot.width,
+                plot.y + cost / y_max * plot.height)
+
     # Mark the payback point
     payback_period = data['roi_data']['payback_period']
-    if payback_period <= data['cost_analysis']['analysis_period']:
+    if payback_period <= analysis_period:
         # Find the approximate cost at payback point
         payback_year = int(payback_period)
         payback_fraction = payback_period - payback_year
-        
+
         if payback_year < len(solar_costs):
             if payback_year > 0:
                 payback_cost = solar_costs[payback_year-1] + (solar_costs[payback_year] - solar_costs[payback_year-1]) * payback_fraction
             else:
                 payback_cost = solar_costs[0] * payback_fraction
-            
-            ax.plot(payback_period, payback_cost, 'ro', markersize=8)
-            ax.annotate(f'Payback: {payback_period:.1f} years', 
-                        xy=(payback_period, payback_cost),
-                        xytext=(payback_period+1, payback_cost),
-                        arrowprops=dict(facecolor='black', shrink=0.05, width=1.5))
-    
-    ax.set_xlabel('Years')
-    ax.set_ylabel('Cumulative Cost (KES)')
-    ax.set_title('Grid vs Solar: Cumulative Cost Over Time')
-    ax.legend()
-    ax.grid(True)
-    
-    # Save the figure to a buffer
-    chart_buffer = io.BytesIO()
-    plt.savefig(chart_buffer, format='png')
-    chart_buffer.seek(0)
-    
-    # Add the chart to the PDF
-    elements.append(Paragraph("Cost Comparison Chart", section_title_style))
-    img = Image(chart_buffer, width=6*inch, height=3.5*inch)
-    elements.append(img)
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Generate disclaimer text
-    elements.append(Paragraph("Disclaimer", section_title_style))
-    disclaimer_text = """
-    This report provides an estimate based on the information provided and general assumptions. 
-    Actual costs, savings, and payback period may vary depending on specific installation 
-    conditions, equipment used, and future electricity prices. It is recommended to consult 
-    with qualified solar professionals before making any investment decisions.
+
+            x, y = to_drawing(max(payback_period, x_min), payback_cost)
+            drawing.add(Circle(x, y, 4, fillColor=colors.red, strokeColor=colors.red))
+            # Label to the right of the marker, or to the left near the end of the period
+            if x < plot.x + plot.width * 0.7:
+                drawing.add(String(x + 8, y - 3, f'Payback: {payback_period:.1f} years', fontName='Helvetica', fontSize=8))
+            else:
+                drawing.add(String(x - 8, y - 3, f'Payback: {payback_period:.1f} years', fontName='Helvetica', fontSize=8, textAnchor='end'))
+
+    legend = LineLegend()
+    # One row above the plot area, clear of both lines
+    legend.x, legend.y = plot.x, plot.y + plot.height + 12
+    legend.alignment = 'right'
+    legend.columnMaximum = 1
+    legend.deltax = 110
+    legend.fontName = 'Helvetica'
+    legend.fontSize = 8
+    legend.colorNamePairs = [(colors.blue, 'Grid Electricity'), (colors.green, 'Solar System')]
+    drawing.add(legend)
+
+    drawing.add(String(drawing.width / 2, drawing.height - 15, 'Grid vs Solar: Cumulative Cost Over Time',
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+    drawing.add(String(plot.x + plot.width / 2, 8, 'Years', fontName='Helvetica', fontSize=8, textAnchor='middle'))
+    y_label = Group(String(0, 0, 'Cumulative Cost (KES)', fontName='Helvetica', fontSize=8, textAnchor='middle'))
+    y_label.transform = (0, 1, -1, 0, 12, plot.y + plot.height / 2)
+    drawing.add(y_label)
+
+    return [drawing]
+
+
+def _disclaimer_flowables(data, styles):
+    return [Paragraph(DISCLAIMER_TEXT, styles['normal'])]
+
+
+def _next_steps_flowables(data, styles):
+    return [Paragraph(NEXT_STEPS_TEXT, styles['normal'])]
+
+
+REPORT_SECTIONS = [
+    ReportSection("Customer Information", _customer_rows, col_widths=NARROW_LABEL_WIDTHS,
+                  fields={'customer_info': ['name', 'email', 'phone', 'date']}),
+    ReportSection("Location", _location_rows, col_widths=NARROW_LABEL_WIDTHS,
+                  fields={'location': ['location_name', 'latitude', 'longitude']}),
+    ReportSection("Energy Consumption", _energy_rows,
+                  fields={'energy_usage': ['daily_kwh', 'monthly_kwh']}),
+    ReportSection("Recommended Solar System", _solar_rows,
+                  fields={'solar_sizing': ['total_panel_capacity_kw', 'number_of_panels', 'battery_capacity_kwh',
+                                           'battery_voltage', 'array_area_sqm']}),
+    ReportSection("Cost Analysis", _cost_rows,
+                  fields={'cost_analysis': ['total_initial_cost', 'panel_cost', 'battery_cost', 'inverter_cost',
+                                            'installation_cost', 'maintenance_annual']}),
+    ReportSection("Return on Investment", _roi_rows,
+                  fields={'roi_data': ['payback_period', 'pays_back', 'roi_percent', 'total_savings', 'npv',
+                                       'discount_rate', 'irr', 'lcoe_solar', 'lcoe_grid'],
+                          'cost_analysis': ['analysis_period']}),
+    ReportSection("Cost Comparison Chart", _cost_chart_flowables, table=False,
+                  fields={'roi_data': ['grid_cumulative_costs', 'solar_cumulative_costs', 'payback_period'],
+                          'cost_analysis': ['analysis_period']}),
+    ReportSection("Disclaimer", _disclaimer_flowables, table=False, fields={}),
+    ReportSection("Next Steps", _next_steps_flowables, table=False, fields={})
+]
+
+
+def build_report_styles() -> Dict[str, ParagraphStyle]:
+    """
+    Build the paragraph styles used in reports.
+
+    Returns:
+    Dict[str, ParagraphStyle]: Styles for the 'title', 'subtitle', 'normal' text and 'section_title'
+    """
+    styles = getSampleStyleSheet()
+    return {
+        'title': styles['Heading1'],
+        'subtitle': styles['Heading2'],
+        'normal': styles['Normal'],
+        'section_title': ParagraphStyle(
+            'SectionTitle',
+            parent=styles['Heading2'],
+            spaceBefore=10,
+            spaceAfter=6,
+            textColor=colors.darkorange
+        )
+    }
+
+
+class ReportRenderer:
+    """
+    Renders report data to PDF through a fixed list of sections.
+
+    Styles are built once when the renderer is created and shared by every report it
+    renders, so a renderer should be kept and reused rather than created per report.
     """
-    elements.append(Paragraph(disclaimer_text, normal_style))
-    elements.append(Spacer(1, 0.25*inch))
-    
-    # Closing message
-    elements.append(Paragraph("Next Steps", section_title_style))
-    next_steps = """
-    1. Contact qualified solar installers for a detailed assessment and quotation.
-    2. Verify available space for panel installation at your property.
-    3. Check for any local permits or regulations that may apply to solar installations.
-    4. Inquire about available incentives or financing options for solar systems.
-    
-    Thank you for using the Kenya Solar System Sizing App!
+
+    def __init__(self, sections: Optional[List[ReportSection]] = None, title: str = "Solar System Report", pagesize=A4):
+        self.sections = list(REPORT_SECTIONS if sections is None else sections)
+        self.title = title
+        self.pagesize = pagesize
+        self.styles = build_report_styles()
+
+    def flowables(self, data: Dict[str, Any]) -> list:
+        """
+        Lay out the report as a list of flowables.
+
+        Parameters:
+        data (Dict[str, Any]): Dictionary containing all data for the report
+
+        Returns:
+        list: Flowables of the title and every section that applies to the data
+        """
+        elements = [Paragraph(self.title, self.styles['title']), Spacer(1, 0.25*inch)]
+        for section in self.sections:
+            content = section.build(data, self.styles)
+            if content is None:
+                continue
+            if section.table:
+                table = Table(content, colWidths=list(section.col_widths))
+                table.setStyle(KEY_VALUE_TABLE_STYLE)
+                content = [table]
+            elements.append(Paragraph(section.title, self.styles['section_title']))
+            elements.extend(content)
+            elements.append(Spacer(1, 0.25*inch))
+        # No spacer after the closing section
+        return elements[:-1]
+
+    def write(self, data: Dict[str, Any], target: Union[str, os.PathLike, BinaryIO]) -> None:
+        """
+        Render a report straight to a file path or writable binary stream.
+
+        Any object with a write() method works, e.g. an open file, a zip archive member or
+        an HTTP response stream. This only avoids the BytesIO buffer of render() and its
+        getvalue() copy: reportlab still assembles the whole document in memory before
+        writing it, so memory use grows with the size of the report.
+
+        Parameters:
+        data (Dict[str, Any]): Dictionary containing all data for the report
+        target (Union[str, os.PathLike, BinaryIO]): File path or writable binary stream
+        """
+        if isinstance(target, os.PathLike):
+            target = os.fspath(target)
+        doc = SimpleDocTemplate(target, pagesize=self.pagesize, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+        doc.build(self.flowables(data))
+
+    def render(self, data: Dict[str, Any]) -> bytes:
+        """
+        Render a report to PDF in memory.
+
+        Parameters:
+        data (Dict[str, Any]): Dictionary containing all data for the report
+
+        Returns:
+        bytes: PDF report as bytes
+        """
+        buffer = io.BytesIO()
+        self.write(data, buffer)
+        return buffer.getvalue()
+
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_report_renderer() -> ReportRenderer:
+    """
+    Return the shared renderer with the standard report sections, creating it on first use.
+
+    Returns:
+    ReportRenderer: The shared report renderer
+    """
+    global _default_renderer
+    if _default_renderer is None:
+        with _default_renderer_lock:
+            if _default_renderer is None:
+                _default_renderer = ReportRenderer()
+    return _default_renderer
+
+
+def generate_pdf_report(data: Dict[str, Any]) -> bytes:
+    """
+    Generate a PDF report with solar system details, cost analysis, and ROI.
+
+    Parameters:
+    data (Dict[str, Any]): Dictionary containing all data for the report
+
+    Returns:
+    bytes: PDF report as bytes
+    """
+    return get_report_renderer().render(data)
+
+
+def write_pdf_report(data: Dict[str, Any], target: Union[str, os.PathLike, BinaryIO]) -> None:
+    """
+    Write a PDF report to a file path or writable binary stream.
+
+    Parameters:
+    data (Dict[str, Any]): Dictionary containing all data for the report
+    target (Union[str, os.PathLike, BinaryIO]): File path or writable binary stream
     """
-    elements.append(Paragraph(next_steps, normal_style))
-    
-    # Build the PDF
-    doc.build(elements)
-    
-    # Get the PDF value from the buffer and return it
-    buffer.seek(0)
-    return buffer.getvalue()
+    get_report_renderer().write(data, target)
@@ -0,0 +1,402 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Iterable, Optional, Set
+from utils.memoize import normalize_key, UncacheableArgument
+from utils.pvgis_api import get_irradiance_data
+from utils.solar_calculator import calculate_system_size, calculate_inverter_size
+from utils.roi_calculator import calculate_system_costs, calculate_grid_costs, calculate_roi
+from utils.consumption_forecast import forecast_consumption, expansion_factor
+
+# Default values for every scenario input, matching the calculator defaults
+DEFAULT_INPUTS = {
+    # Energy
+    'daily_energy_kwh': None,
+    'monthly_energy_kwh': None,
+    'consumption_growth': 0.0,
+    'consumption_by_year': None,
+    # Location
+    'irradiance_data': None,
+    'latitude': None,
+    'longitude': None,
+    'peak_sun_hours': None,
+    # Sizing
+    'panel_wattage': 400,
+    'battery_voltage': 24,
+    'battery_dod': 0.8,
+    'autonomy_days': 1,
+    'system_efficiency': 0.85,
+    'future_expansion': 0.2,         # None sizes for the consumption forecast
+    'expansion_horizon_years': 10,
+    'ac_load_peak_kw': None,
+    # Costs
+    'panel_cost_per_wp': 90,
+    'battery_cost_per_kwh': 40000,
+    'inverter_cost_per_kw': 30000,
+    'installation_percent': 15,
+    'maintenance_annual': 10000,
+    'battery_replacement_years': 10,
+    # Grid
+    'energy_charge': 21.0,
+    'fixed_charge': 200,
+    'tariff': None,                  # Consumer type billed with the tariff engine instead of the charges above
+    'inflation_rate': 0.05,
+    'analysis_period': 20,
+    # Financing
+    'financing_percentage': 0.7,
+    'financing_years': 7,
+    'financing_interest': 0.12,
+    'discount_rate': 0.10,
+    # Report
+    'customer_info': None,
+    'location': None
+}
+
+# Scenario inputs passed through to evaluate_scenarios() for batch analyses
+EVALUATION_INPUTS = [
+    'panel_cost_per_wp', 'battery_cost_per_kwh', 'inverter_cost_per_kw', 'installation_percent',
+    'maintenance_annual', 'battery_replacement_years', 'energy_charge', 'fixed_charge',
+    'inflation_rate', 'analysis_period', 'financing_percentage', 'financing_years', 'financing_interest',
+    'discount_rate', 'consumption_growth'
+]
+
+
+class PipelineNode:
+    """A named computation step with declared inputs (scenario inputs or other nodes)."""
+
+    def __init__(self, name: str, func: Callable, inputs: List[str], description: str = ""):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.description = description
+
+
+def _energy_node(daily_energy_kwh, monthly_energy_kwh):
+    if daily_energy_kwh is None and monthly_energy_kwh is None:
+        raise ValueError("Either daily_energy_kwh or monthly_energy_kwh must be set")
+    if monthly_energy_kwh is None:
+        monthly_energy_kwh = daily_energy_kwh * 30
+    if daily_energy_kwh is None:
+        daily_energy_kwh = monthly_energy_kwh / 30
+    return {
+        'daily_kwh': daily_energy_kwh,
+        'monthly_kwh': monthly_energy_kwh,
+        'annual_kwh': monthly_energy_kwh * 12
+    }
+
+
+def _consumption_node(energy, consumption_growth, consumption_by_year, analysis_period):
+    if consumption_by_year is not None:
+        return consumption_by_year
+    return forecast_consumption(energy['annual_kwh'], consumption_growth, analysis_period)
+
+
+def _irradiance_node(irradiance_data, latitude, longitude, peak_sun_hours):
+    if irradiance_data is None:
+        if latitude is None or longitude is None:
+            raise ValueError("Either irradiance_data or latitude and longitude must be set")
+        irradiance_data = get_irradiance_data(latitude, longitude)
+    return {
+        'irradiance_data': irradiance_data,
+        'peak_sun_hours': peak_sun_hours if peak_sun_hours is not None else irradiance_data['peak_sun_hours']
+    }
+
+
+def _sizing_node(energy, consumption, irradiance, panel_wattage, battery_voltage, battery_dod,
+                 autonomy_days, system_efficiency, future_expansion, expansion_horizon_years):
+    if future_expansion is None:
+        future_expansion = float(expansion_factor(consumption, expansion_horizon_years))
+    return calculate_system_size(
+        daily_energy_kwh=energy['daily_kwh'],
+        peak_sun_hours=irradiance['peak_sun_hours'],
+        panel_wattage=panel_wattage,
+        battery_voltage=battery_voltage,
+        battery_dod=battery_dod,
+        autonomy_days=autonomy_days,
+        system_efficiency=system_efficiency,
+        future_expansion=future_expansion
+    )
+
+
+def _inverter_node(sizing, ac_load_peak_kw):
+    return calculate_inverter_size(sizing['total_panel_capacity_kw'], ac_load_peak_kw)
+
+
+def _costs_node(sizing, inverter, panel_cost_per_wp, battery_cost_per_kwh, inverter_cost_per_kw, installation_percent):
+    return calculate_system_costs(
+        panel_capacity_kw=sizing['total_panel_capacity_kw'],
+        battery_capacity_kwh=sizing['battery_capacity_kwh'],
+        inverter_size_kw=inverter,
+        panel_cost_per_wp=panel_cost_per_wp,
+        battery_cost_per_kwh=battery_cost_per_kwh,
+        inverter_cost_per_kw=inverter_cost_per_kw,
+        installation_percent=installation_percent
+    )
+
+
+def _grid_costs_node(energy, consumption, energy_charge, fixed_charge, tariff, inflation_rate, analysis_period):
+    return calculate_grid_costs(
+        annual_energy_kwh=energy['annual_kwh'],
+        energy_charge=energy_charge,
+        fixed_charge=fixed_charge,
+        inflation_rate=inflation_rate,
+        years=analysis_period,
+        tariff=tariff,
+        consumption_by_year=consumption
+    )
+
+
+def _roi_node(costs, grid_costs, maintenance_annual, battery_replacement_years, analysis_period,
+              financing_percentage, financing_years, financing_interest, discount_rate):
+    return calculate_roi(
+        total_initial_cost=costs['total_initial_cost'],
+        annual_maintenance=maintenance_annual,
+        battery_replacement_cost=costs['battery_cost'],
+        battery_replacement_years=battery_replacement_years,
+        grid_costs=grid_costs,
+        analysis_period=analysis_period,
+        financing_percentage=financing_percentage,
+        financing_years=financing_years,
+        financing_interest=financing_interest,
+        discount_rate=discount_rate
+    )
+
+
+def _report_data_node(customer_info, location, energy, sizing, costs, roi, maintenance_annual, analysis_period):
+    report_data = {
+        'customer_info': customer_info,
+        'energy_usage': {
+            'daily_kwh': energy['daily_kwh'],
+            'monthly_kwh': energy['monthly_kwh']
+        },
+        'solar_sizing': sizing,
+        'cost_analysis': {
+            **costs,
+            'maintenance_annual': maintenance_annual,
+            'analysis_period': analysis_period
+        },
+        'roi_data': roi
+    }
+    if location:
+        report_data['location'] = location
+    return report_data
+
+
+def _report_node(report_data):
+    # Imported here so the PDF stack is only loaded when a report is requested
+    from utils.pdf_generator import generate_pdf_report
+
+    return generate_pdf_report(report_data)
+
+
+def build_scenario_nodes() -> List[PipelineNode]:
+    """
+    Return the nodes of the standard energy-to-report scenario pipeline.
+
+    Returns:
+    List[PipelineNode]: Pipeline nodes in dependency order
+    """
+    return [
+        PipelineNode('energy', _energy_node, ['daily_energy_kwh', 'monthly_energy_kwh'],
+                     "Daily, monthly and annual energy consumption"),
+        PipelineNode('consumption', _consumption_node, ['energy', 'consumption_growth', 'consumption_by_year',
+                                                        'analysis_period'],
+                     "Annual consumption forecast over the analysis period"),
+        PipelineNode('irradiance', _irradiance_node, ['irradiance_data', 'latitude', 'longitude', 'peak_sun_hours'],
+                     "Solar resource for the location"),
+        PipelineNode('sizing', _sizing_node, ['energy', 'consumption', 'irradiance', 'panel_wattage', 'battery_voltage',
+                                              'battery_dod', 'autonomy_days', 'system_efficiency', 'future_expansion',
+                                              'expansion_horizon_years'],
+                     "Panel array and battery sizing"),
+        PipelineNode('inverter', _inverter_node, ['sizing', 'ac_load_peak_kw'],
+                     "Inverter sizing"),
+        PipelineNode('costs', _costs_node, ['sizing', 'inverter', 'panel_cost_per_wp', 'battery_cost_per_kwh',
+                                            'inverter_cost_per_kw', 'installation_percent'],
+                     "Initial system costs"),
+        PipelineNode('grid_costs', _grid_costs_node, ['energy', 'consumption', 'energy_charge', 'fixed_charge',
+                                                      'tariff', 'inflation_rate', 'analysis_period'],
+                     "Grid electricity costs over the analysis period"),
+        PipelineNode('roi', _roi_node, ['costs', 'grid_costs', 'maintenance_annual', 'battery_replacement_years',
+                                        'analysis_period', 'financing_percentage', 'financing_years',
+                                        'financing_interest', 'discount_rate'],
+                     "Return on investment and payback"),
+        PipelineNode('report_data', _report_data_node, ['customer_info', 'location', 'energy', 'sizing', 'costs',
+                                                        'roi', 'maintenance_annual', 'analysis_period'],
+                     "Report contents, for writing the PDF to a file or stream"),
+        PipelineNode('report', _report_node, ['report_data'],
+                     "PDF report")
+    ]
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    try:
+        return normalize_key(old) == normalize_key(new)
+    except UncacheableArgument:
+        return old is new
+
+
+class ScenarioPipeline:
+    """
+    Incremental scenario pipeline from energy consumption to sizing, costs, ROI and report.
+
+    Nodes are evaluated lazily and their results kept until one of their inputs changes.
+    Setting an input only invalidates the nodes downstream of it, so for example changing
+    battery_dod recomputes sizing, inverter, costs, roi and report but leaves energy,
+    irradiance and grid_costs untouched. Every node evaluation is timed.
+    """
+
+    def __init__(self, nodes: Optional[List[PipelineNode]] = None, **inputs):
+        self.nodes: Dict[str, PipelineNode] = OrderedDict()
+        self.inputs: Dict[str, Any] = dict(DEFAULT_INPUTS)
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.last_recomputed: List[str] = []
+        self._values: Dict[str, Any] = {}
+
+        for node in nodes if nodes is not None else build_scenario_nodes():
+            self.add_node(node)
+        self.set_inputs(**inputs)
+
+    def add_node(self, node: PipelineNode) -> None:
+        """
+        Add a node to the pipeline. All of its inputs must already be scenario inputs or nodes.
+
+        Parameters:
+        node (PipelineNode): Node to add
+        """
+        unknown = [name for name in node.inputs if name not in self.inputs and name not in self.nodes]
+        if unknown:
+            raise ValueError(f"Node '{node.name}' depends on unknown inputs: {', '.join(unknown)}")
+        if node.name in self.inputs:
+            self.inputs.pop(node.name)
+        self.nodes[node.name] = node
+
+    def downstream(self, names: Iterable[str]) -> Set[str]:
+        """
+        Return every node that depends, directly or indirectly, on the given inputs or nodes.
+
+        Parameters:
+        names (Iterable[str]): Input or node names
+
+        Returns:
+        Set[str]: Names of the dependent nodes
+        """
+        affected = set()
+        frontier = set(names)
+        # Nodes are stored in dependency order, so one forward pass is enough
+        for node in self.nodes.values():
+            if frontier.intersection(node.inputs):
+                affected.add(node.name)
+                frontier.add(node.name)
+        return affected
+
+    def set_inputs(self, **changes) -> Set[str]:
+        """
+        Update scenario inputs and invalidate the nodes that depend on changed values.
+
+        Parameters:
+        **changes: Input names and their new values
+
+        Returns:
+        Set[str]: Names of the invalidated nodes
+        """
+        unknown = [name for name in changes if name not in self.inputs]
+        if unknown:
+            raise KeyError(f"Unknown pipeline inputs: {', '.join(unknown)}")
+
+        changed = [name for name, value in changes.items() if not _same_value(self.inputs[name], value)]
+        self.inputs.update(changes)
+
+        invalidated = self.downstream(changed)
+        for name in invalidated:
+            self._values.pop(name, None)
+        return invalidated
+
+    def provide(self, name: str, value: Any) -> Set[str]:
+        """
+        Supply a node's value directly, e.g. results computed on another page.
+
+        Downstream nodes are only invalidated if the value differs from the current one.
+
+        Parameters:
+        name (str): Node name
+        value (Any): Node value
+
+        Returns:
+        Set[str]: Names of the invalidated nodes
+        """
+        if name in self._values and _same_value(self._values[name], value):
+            return set()
+        invalidated = self.downstream([name])
+        for dependent in invalidated:
+            self._values.pop(dependent, None)
+        self._values[name] = value
+        return invalidated
+
+    def is_current(self, name: str) -> bool:
+        """Return whether a node has an up-to-date value."""
+        return name in self._values
+
+    def get(self, name: str) -> Any:
+        """
+        Return a node's value, computing it and any stale upstream nodes first.
+
+        Parameters:
+        name (str): Node name
+
+        Returns:
+        Any: Node value
+        """
+        self.last_recomputed = []
+        return self._evaluate(name)
+
+    def _evaluate(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+
+        node = self.nodes[name]
+        arguments = {
+            dependency: self._evaluate(dependency) if dependency in self.nodes else self.inputs[dependency]
+            for dependency in node.inputs
+        }
+
+        start = time.perf_counter()
+        value = node.func(**arguments)
+        elapsed = time.perf_counter() - start
+
+        timing = self.timings.setdefault(name, {'runs': 0, 'last_seconds': 0.0, 'total_seconds': 0.0})
+        timing['runs'] += 1
+        timing['last_seconds'] = elapsed
+        timing['total_seconds'] += elapsed
+
+        self._values[name] = value
+        self.last_recomputed.append(name)
+        return value
+
+    def evaluation_inputs(self) -> Dict[str, Any]:
+        """
+        Return the current scenario as keyword arguments for evaluate_scenarios().
+
+        Returns:
+        Dict[str, Any]: System sizes, annual energy and all cost, grid and financing inputs
+        """
+        sizing = self.get('sizing')
+        inverter = self.get('inverter')
+        energy = self.get('energy')
+        return {
+            'panel_capacity_kw': sizing['total_panel_capacity_kw'],
+            'battery_capacity_kwh': sizing['battery_capacity_kwh'],
+            'inverter_size_kw': inverter,
+            'annual_energy_kwh': energy['annual_kwh'],
+            **{name: self.inputs[name] for name in EVALUATION_INPUTS}
+        }
+
+    def timing_report(self) -> List[Dict[str, Any]]:
+        """
+        Return the recorded timings of every node, in pipeline order.
+
+        Returns:
+        List[Dict[str, Any]]: One row per node with run count and timings in seconds
+        """
+        return [
+            {'node': name, **self.timings.get(name, {'runs': 0, 'last_seconds': 0.0, 'total_seconds': 0.0})}
+            for name in self.nodes
+        ]
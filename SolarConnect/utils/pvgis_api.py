@@ -5,6 +5,12 @@ import numpy as np
 from typing import Dict, Any, Optional
 import time
 
+# Typical irradiance data for Kenya (monthly averages in W/m²)
+# These are approximate values and should be replaced with actual data
+KENYA_MONTHLY_AVERAGES = (
+    620, 650, 630, 580, 540, 520, 540, 580, 620, 630, 610, 600  # Jan-Dec
+)
+
 def get_irradiance_data(latitude: float, longitude: float) -> Dict[str, Any]:
     """
     Get solar irradiance data from the PVGIS API for a specific location.
@@ -101,11 +107,7 @@ def simulate_kenya_irradiance_data(latitude: float, longitude: float) -> Dict[st
     Returns:
     Dict[str, Any]: Simulated solar irradiance data
     """
-    # Typical irradiance data for Kenya (monthly averages in W/m²)
-    # These are approximate values and should be replaced with actual data
-    kenya_monthly_averages = [
-        620, 650, 630, 580, 540, 520, 540, 580, 620, 630, 610, 600  # Jan-Dec
-    ]
+    kenya_monthly_averages = list(KENYA_MONTHLY_AVERAGES)
     
     # Calculate yearly average
     yearly_average = np.mean(kenya_monthly_averages)
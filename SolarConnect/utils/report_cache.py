@@ -0,0 +1,280 @@
+import hashlib
+import os
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, Any, Callable, List, Optional
+from utils.memoize import normalize_key, UncacheableArgument
+from utils.pdf_generator import generate_pdf_report, get_report_renderer, ReportSection
+
+# Bump when report output changes outside the section builders' own code, e.g. in the
+# styles, the renderer or helper functions the builders call
+REPORT_CACHE_VERSION = 1
+
+
+def _prepare(value: Any) -> Any:
+    """Convert report data values that normalize_key() does not handle into keyable ones."""
+    if isinstance(value, dict):
+        return {k: _prepare(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_prepare(v) for v in value]
+    if isinstance(value, pd.DataFrame):
+        return {'columns': [str(column) for column in value.columns],
+                'values': [_prepare(value[column].to_numpy()) for column in value.columns]}
+    if isinstance(value, pd.Series):
+        return _prepare(value.to_numpy())
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'OMmU':
+        return {'shape': list(value.shape), 'values': [_prepare(v) for v in value.ravel().tolist()]}
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'iu':
+        # Integer and float arrays of equal values render identically
+        return value.astype(float)
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        return value.isoformat()
+    return value
+
+
+def _code_fingerprint(code) -> str:
+    """Return a hash of a function's bytecode, names and constants, including nested functions."""
+    digest = hashlib.sha256(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for constant in code.co_consts:
+        if hasattr(constant, 'co_code'):
+            digest.update(_code_fingerprint(constant).encode('utf-8'))
+        else:
+            digest.update(repr(constant).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def report_fields(data: Dict[str, Any], sections: List[ReportSection]) -> Dict[str, Any]:
+    """
+    Return the part of the report data that the report sections read.
+
+    Parameters:
+    data (Dict[str, Any]): Dictionary containing all data for the report
+    sections (List[ReportSection]): Sections of the report
+
+    Returns:
+    Dict[str, Any]: The fields named by the sections, or all data if a section names none
+    """
+    if any(section.fields is None for section in sections):
+        return data
+
+    wanted: Dict[str, Optional[set]] = {}
+    for section in sections:
+        for name, keys in section.fields.items():
+            if keys is None or wanted.get(name, set()) is None:
+                wanted[name] = None
+            else:
+                wanted[name] = wanted.get(name, set()) | set(keys)
+
+    fields = {}
+    for name, keys in wanted.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if keys is not None and isinstance(value, dict):
+            value = {key: value[key] for key in sorted(keys) if key in value}
+        fields[name] = value
+    return fields
+
+
+def report_cache_key(data: Dict[str, Any]) -> str:
+    """
+    Return a stable content hash of report data.
+
+    Only the fields the report sections read are hashed (see report_fields()), so data the
+    report does not show never changes the key. Numbers are normalized as in normalize_key(),
+    so equal values of different numeric types share a key. The key also covers the cache
+    version and the sections of the shared report renderer, including the code of every
+    section builder, so an edited section does not serve stale reports from the disk cache.
+    Changes outside the builders require bumping REPORT_CACHE_VERSION.
+
+    Parameters:
+    data (Dict[str, Any]): Dictionary containing all data for the report
+
+    Returns:
+    str: Hexadecimal SHA-256 digest
+    """
+    sections = get_report_renderer().sections
+    template = [(section.title, section.build.__qualname__, _code_fingerprint(section.build.__code__), section.table)
+                for section in sections]
+    key = normalize_key([REPORT_CACHE_VERSION, template, _prepare(report_fields(data, sections))])
+    return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """
+    Content-addressed cache of rendered PDF reports.
+
+    Reports are kept in memory in a least-recently-used order up to max_bytes, and are
+    optionally also written to a directory, where they survive restarts and are shared
+    between processes. Lookups that miss memory fall back to the directory.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, directory: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'uncacheable': 0}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _store(self, key: str, pdf_bytes: bytes) -> None:
+        # Callers hold the lock
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = pdf_bytes
+        self._bytes += len(pdf_bytes)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._stats['evictions'] += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return a cached report, or None if it is not cached.
+
+        Parameters:
+        key (str): Key from report_cache_key()
+
+        Returns:
+        Optional[bytes]: PDF report as bytes
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with open(self._path(key), 'rb') as file:
+                pdf_bytes = file.read()
+            with self._lock:
+                self._stats['disk_hits'] += 1
+                self._store(key, pdf_bytes)
+            return pdf_bytes
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key: str, pdf_bytes: bytes) -> None:
+        """
+        Cache a rendered report.
+
+        Parameters:
+        key (str): Key from report_cache_key()
+        pdf_bytes (bytes): PDF report as bytes
+        """
+        with self._lock:
+            self._store(key, pdf_bytes)
+
+        if self.directory is not None and not os.path.exists(self._path(key)):
+            # Write to a temporary file first so readers never see a partial report
+            handle, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    file.write(pdf_bytes)
+                os.replace(temporary_path, self._path(key))
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+
+    def get_or_render(self, data: Dict[str, Any], render: Callable[[Dict[str, Any]], bytes] = generate_pdf_report) -> bytes:
+        """
+        Return the cached report for the data, rendering and caching it on a miss.
+
+        Data that cannot be hashed is rendered without caching.
+
+        Parameters:
+        data (Dict[str, Any]): Dictionary containing all data for the report
+        render (Callable): Function rendering report data to PDF bytes
+
+        Returns:
+        bytes: PDF report as bytes
+        """
+        try:
+            key = report_cache_key(data)
+        except UncacheableArgument:
+            with self._lock:
+                self._stats['uncacheable'] += 1
+            return render(data)
+
+        pdf_bytes = self.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = render(data)
+            self.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics.
+
+        Returns:
+        Dict[str, Any]: Memory and disk hits, misses, evictions and uncacheable requests, the
+            'hit_rate', the number of 'entries' and the 'bytes_stored' in memory
+        """
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['disk_hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': (self._stats['hits'] + self._stats['disk_hits']) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes_stored': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self) -> None:
+        """Empty the in-memory cache and reset the statistics; files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+_default_cache = ReportCache()
+
+
+def configure_report_cache(max_bytes: int = 64 * 1024 * 1024, directory: Optional[str] = None) -> ReportCache:
+    """
+    Replace the shared report cache, e.g. to enable the on-disk cache.
+
+    Parameters:
+    max_bytes (int): Largest total size of the reports kept in memory
+    directory (str, optional): Directory for the on-disk cache
+
+    Returns:
+    ReportCache: The new shared cache
+    """
+    global _default_cache
+    _default_cache = ReportCache(max_bytes, directory)
+    return _default_cache
+
+
+def get_report_cache() -> ReportCache:
+    """Return the shared report cache."""
+    return _default_cache
+
+
+def cached_pdf_report(data: Dict[str, Any]) -> bytes:
+    """
+    Generate a PDF report through the shared report cache.
+
+    Parameters:
+    data (Dict[str, Any]): Dictionary containing all data for the report
+
+    Returns:
+    bytes: PDF report as bytes
+    """
+    return _default_cache.get_or_render(data)
@@ -0,0 +1,166 @@
+import itertools
+import numpy as np
+from typing import Dict, Any, List, Optional
+from utils.roi_calculator import evaluate_scenarios
+
+# Default grid of the what-if dimensions, matching the slider ranges of the Cost Comparison page
+SURFACE_AXES = {
+    'inflation_rate': np.linspace(0.02, 0.15, 7),
+    'analysis_period': np.array([5, 9, 13, 17, 21, 25]),  # Cell centres fall on whole years
+    'installation_percent': np.linspace(5, 30, 6),
+    'financing_percentage': np.linspace(0.5, 0.9, 5),
+    'financing_interest': np.linspace(0.06, 0.20, 5)
+}
+
+# IRR is left out: many financed scenarios have no sign change in their cash flows and thus
+# no IRR, so the surface could not interpolate or bound it
+SURFACE_METRICS = ['payback_period', 'npv', 'roi_percent', 'total_savings', 'lcoe_solar']
+
+# Safety factor on the interpolation error measured at cell centres (over 99% of random
+# what-if points on the default grid fall within the resulting bounds, including points
+# near the edge between scenarios that pay back within their own period and those that do not)
+ERROR_BOUND_FACTOR = 2.0
+
+
+def build_response_surface(
+    base_inputs: Dict[str, Any],
+    axes: Optional[Dict[str, np.ndarray]] = None,
+    metrics: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate the ROI engine once over a coarse grid of what-if dimensions.
+
+    Every grid point is a scenario of one batch passed to evaluate_scenarios(); all other
+    inputs stay at their base values. The same batch evaluates the centre of every grid
+    cell, and the interpolation error there is stored so that interpolate_surface() can
+    bound its error.
+
+    Parameters:
+    base_inputs (Dict[str, Any]): Keyword arguments for evaluate_scenarios() describing the base case
+    axes (Dict[str, np.ndarray], optional): Increasing grid values per parameter, defaulting to SURFACE_AXES
+    metrics (List[str], optional): Metrics to tabulate, defaulting to SURFACE_METRICS
+
+    Returns:
+    Dict[str, Any]: Dictionary with the 'axes', the 'metrics', their 'values' on the grid
+        (shape (metrics, *axes)), their 'cell_error' per grid cell and the 'base_inputs'
+    """
+    if axes is None:
+        axes = SURFACE_AXES
+    if metrics is None:
+        metrics = SURFACE_METRICS
+    axes = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+    shape = tuple(len(values) for values in axes.values())
+    midpoints = {name: (values[:-1] + values[1:]) / 2 if len(values) > 1 else values for name, values in axes.items()}
+    cell_shape = tuple(len(values) for values in midpoints.values())
+
+    # One batch with the grid points followed by the centre of every grid cell
+    grid = np.meshgrid(*axes.values(), indexing='ij')
+    centres = np.meshgrid(*midpoints.values(), indexing='ij')
+    batch = dict(base_inputs)
+    batch.update({
+        name: np.concatenate([points.ravel(), centre.ravel()])
+        for name, points, centre in zip(axes, grid, centres)
+    })
+    results = evaluate_scenarios(**batch)
+
+    grid_size = int(np.prod(shape))
+    values = np.stack([np.asarray(results[metric], dtype=float)[:grid_size].reshape(shape) for metric in metrics])
+    exact_centres = np.stack([np.asarray(results[metric], dtype=float)[grid_size:].reshape(cell_shape)
+                              for metric in metrics])
+
+    # Interpolation error at the centre of each cell, where it is largest for smooth metrics;
+    # the interpolated centre value is the mean of the cell's corners
+    centre_estimate = values
+    for axis, points in enumerate(axes.values(), start=1):
+        if len(points) > 1:
+            upper = np.take(centre_estimate, np.arange(1, len(points)), axis=axis)
+            lower = np.take(centre_estimate, np.arange(len(points) - 1), axis=axis)
+            centre_estimate = (lower + upper) / 2
+
+    # Each cell takes the largest centre error of itself and its neighbours, which also
+    # covers the steeper parts of a cell that its centre misses
+    cell_error = np.abs(centre_estimate - exact_centres)
+    for axis in range(1, cell_error.ndim):
+        count = cell_error.shape[axis]
+        previous = np.take(cell_error, np.r_[0, np.arange(count - 1)], axis=axis)
+        following = np.take(cell_error, np.r_[np.arange(1, count), count - 1], axis=axis)
+        cell_error = np.maximum(cell_error, np.maximum(previous, following))
+
+    return {
+        'axes': axes,
+        'metrics': list(metrics),
+        'values': values,
+        'cell_error': cell_error,
+        'base_inputs': dict(base_inputs)
+    }
+
+
+def interpolate_surface(surface: Dict[str, Any], **point) -> Dict[str, Any]:
+    """
+    Answer a what-if query by multilinear interpolation over a response surface.
+
+    Dimensions that are not given stay at their base values. Each metric is returned with an
+    error bound of ERROR_BOUND_FACTOR times the largest interpolation error measured at the
+    centres of the enclosing cell and its neighbours. Points outside the grid are clamped to its edge and flagged as
+    extrapolated.
+
+    Parameters:
+    surface (Dict[str, Any]): Response surface from build_response_surface()
+    **point: Value of each what-if dimension (scalars or arrays of the same shape)
+
+    Returns:
+    Dict[str, Any]: Dictionary with the interpolated value and '<metric>_error_bound' of each
+        metric, and 'extrapolated' (whether any dimension was clamped)
+    """
+    axes = surface['axes']
+    unknown = set(point) - set(axes)
+    if unknown:
+        raise ValueError(f"Not a response surface dimension: {', '.join(sorted(unknown))}")
+
+    lower_index = []
+    fraction = []
+    extrapolated = False
+    for name, points in axes.items():
+        value = np.asarray(point.get(name, surface['base_inputs'][name]), dtype=float)
+        extrapolated = extrapolated | (value < points[0]) | (value > points[-1])
+        value = np.clip(value, points[0], points[-1])
+        index = np.clip(np.searchsorted(points, value, side='right') - 1, 0, max(len(points) - 2, 0))
+        if len(points) > 1:
+            fraction.append((value - points[index]) / (points[index + 1] - points[index]))
+        else:
+            fraction.append(np.zeros(value.shape))
+        lower_index.append(index)
+    lower_index = np.stack(np.broadcast_arrays(*lower_index), axis=-1)
+    fraction = np.stack(np.broadcast_arrays(*fraction), axis=-1)
+
+    # Gather the 2^d corners of each enclosing cell and weight them by the product of the
+    # fractional positions along every axis
+    corners = np.array(list(itertools.product((0, 1), repeat=len(axes))))
+    corner_index = np.minimum(lower_index[..., np.newaxis, :] + corners, np.array(surface['values'].shape[1:]) - 1)
+    weights = np.where(corners, fraction[..., np.newaxis, :], 1 - fraction[..., np.newaxis, :]).prod(axis=-1)
+    corner_values = surface['values'][(slice(None),) + tuple(np.moveaxis(corner_index, -1, 0))]
+    values = (corner_values * weights).sum(axis=-1)
+    error_bound = ERROR_BOUND_FACTOR * surface['cell_error'][(slice(None),) + tuple(np.moveaxis(lower_index, -1, 0))]
+
+    results = {}
+    for metric, value, error in zip(surface['metrics'], values, error_bound):
+        results[metric] = value
+        results[f'{metric}_error_bound'] = error
+    results['extrapolated'] = extrapolated
+    return results
+
+
+def exact_scenario(surface: Dict[str, Any], **point) -> Dict[str, Any]:
+    """
+    Recompute a what-if query exactly with the ROI engine, for comparison with the interpolation.
+
+    Parameters:
+    surface (Dict[str, Any]): Response surface from build_response_surface()
+    **point: Value of each what-if dimension
+
+    Returns:
+    Dict[str, Any]: Results of evaluate_scenarios() at the point
+    """
+    inputs = dict(surface['base_inputs'])
+    inputs.update(point)
+    return evaluate_scenarios(**inputs)
@@ -1,53 +1,138 @@
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
+from utils.memoize import memoize
+from utils.tariff_engine import calculate_bill
 
+@memoize()
+def calculate_system_costs(
+    panel_capacity_kw: float,
+    battery_capacity_kwh: float,
+    inverter_size_kw: float,
+    panel_cost_per_wp: float = 90,
+    battery_cost_per_kwh: float = 40000,
+    inverter_cost_per_kw: float = 30000,
+    installation_percent: float = 15
+) -> Dict[str, Any]:
+    """
+    Calculate the initial cost of a solar system from its component sizes.
+    
+    Parameters:
+    panel_capacity_kw (float): Total solar panel capacity in kW
+    battery_capacity_kwh (float): Battery capacity in kWh
+    inverter_size_kw (float): Inverter size in kW
+    panel_cost_per_wp (float): Solar panel cost in KES per Wp
+    battery_cost_per_kwh (float): Battery cost in KES per kWh
+    inverter_cost_per_kw (float): Inverter cost in KES per kW
+    installation_percent (float): Installation cost as a percentage of equipment cost
+    
+    Returns:
+    Dict[str, Any]: Dictionary containing component, equipment, installation and total costs
+    """
+    panel_cost = panel_capacity_kw * 1000 * panel_cost_per_wp
+    battery_cost = battery_capacity_kwh * battery_cost_per_kwh
+    inverter_cost = inverter_size_kw * inverter_cost_per_kw
+    
+    equipment_cost = panel_cost + battery_cost + inverter_cost
+    installation_cost = equipment_cost * (installation_percent / 100)
+    
+    return {
+        'panel_cost': panel_cost,
+        'battery_cost': battery_cost,
+        'inverter_cost': inverter_cost,
+        'equipment_cost': equipment_cost,
+        'installation_cost': installation_cost,
+        'total_initial_cost': equipment_cost + installation_cost
+    }
+
+def _batch(value: Any) -> np.ndarray:
+    """Convert a scalar or batch parameter to an array with a trailing year axis."""
+    return np.asarray(value, dtype=float)[..., np.newaxis]
+
+def _to_output(value: np.ndarray, as_lists: bool) -> Any:
+    """Return scalars as floats and arrays as arrays, or everything as lists if requested."""
+    value = np.asarray(value)
+    if as_lists:
+        return value.tolist()
+    return float(value) if value.ndim == 0 else value
+
+@memoize()
 def calculate_grid_costs(
     annual_energy_kwh: float,
     energy_charge: float,
     fixed_charge: float,
     inflation_rate: float = 0.05,
-    years: int = 25
+    years: int = 25,
+    tariff: Optional[Union[str, Dict[str, Any]]] = None,
+    consumption_by_year: Optional[np.ndarray] = None,
+    as_lists: bool = False
 ) -> Dict[str, Any]:
     """
     Calculate the cost of grid electricity over a specified period.
     
+    Every numeric parameter except years may be an array, in which case the costs are
+    calculated for the whole batch of scenarios at once and gain a leading batch dimension.
+    If a tariff is given, the base annual cost is the full itemized bill of the tariff
+    engine (consumption bands, pass-through charges, levies and VAT) and energy_charge
+    and fixed_charge are not used. If a consumption forecast is given (see
+    utils.consumption_forecast), each year is billed at that year's consumption instead of
+    annual_energy_kwh, so growth can also move a household into a higher tariff band.
+    
     Parameters:
     annual_energy_kwh (float): Annual energy consumption in kWh
     energy_charge (float): Energy charge per kWh in KES
     fixed_charge (float): Fixed monthly charge in KES
     inflation_rate (float): Annual inflation rate for electricity costs
     years (int): Number of years to calculate costs for
+    tariff (str or Dict[str, Any], optional): Consumer type or tariff for utils.tariff_engine.calculate_bill()
+    consumption_by_year (np.ndarray, optional): Annual consumption in kWh for every year,
+        shape (..., years) or longer
+    as_lists (bool): Return Python lists instead of NumPy arrays (for compatibility)
     
     Returns:
     Dict[str, Any]: Dictionary containing grid electricity cost data
     """
-    # Calculate base annual cost
-    annual_energy_cost = annual_energy_kwh * energy_charge
-    annual_fixed_cost = fixed_charge * 12
-    base_annual_cost = annual_energy_cost + annual_fixed_cost
+    # Consumption billed in each year: constant, or the forecast for the period
+    if consumption_by_year is not None:
+        consumption_by_year = np.asarray(consumption_by_year, dtype=float)
+        if consumption_by_year.shape[-1] < years:
+            raise ValueError(f"consumption_by_year covers {consumption_by_year.shape[-1]} years, {years} are needed")
+        energy_kwh = consumption_by_year[..., :years]
+    else:
+        energy_kwh = _batch(annual_energy_kwh)
+    
+    # Calculate the annual cost at today's prices
+    if tariff is not None:
+        monthly_bill = calculate_bill(energy_kwh / 12, tariff)
+        annual_cost_today = monthly_bill['total'] * 12
+    else:
+        annual_energy_cost = energy_kwh * _batch(energy_charge)
+        annual_fixed_cost = _batch(fixed_charge) * 12
+        annual_cost_today = annual_energy_cost + annual_fixed_cost
+    base_annual_cost = annual_cost_today[..., 0]
     
-    # Calculate costs for each year with inflation
-    annual_costs = []
-    for year in range(years):
-        year_cost = base_annual_cost * ((1 + inflation_rate) ** year)
-        annual_costs.append(year_cost)
+    # Calculate costs for each year with inflation as a power vector
+    inflation_factors = (1 + _batch(inflation_rate)) ** np.arange(years)
+    annual_costs = annual_cost_today * inflation_factors
     
     # Calculate total cost over the period
-    total_cost = sum(annual_costs)
+    total_cost = annual_costs.sum(axis=-1)
     
     return {
-        'annual_costs': annual_costs,
-        'total_cost': total_cost,
-        'base_annual_cost': base_annual_cost,
+        'annual_costs': _to_output(annual_costs, as_lists),
+        'total_cost': _to_output(total_cost, as_lists),
+        'base_annual_cost': _to_output(base_annual_cost, as_lists),
         'parameters': {
             'annual_energy_kwh': annual_energy_kwh,
             'energy_charge': energy_charge,
             'fixed_charge': fixed_charge,
             'inflation_rate': inflation_rate,
-            'years': years
+            'years': years,
+            'tariff': tariff,
+            'consumption_by_year': consumption_by_year
         }
     }
 
+@memoize()
 def calculate_roi(
     total_initial_cost: float,
     annual_maintenance: float,
@@ -56,12 +141,19 @@ def calculate_roi(
     grid_costs: Dict[str, Any],
     analysis_period: int = 25,
     financing_percentage: float = 0.7,  # Typical bank financing percentage
-    financing_years: int = 7,  # Typical solar loan term
-    financing_interest: float = 0.12  # Annual interest rate
+    financing_years: float = 7,  # Typical solar loan term
+    financing_interest: float = 0.12,  # Annual interest rate
+    discount_rate: float = 0.10,
+    annual_energy_kwh: Optional[float] = None,
+    as_lists: bool = False
 ) -> Dict[str, Any]:
     """
     Calculate return on investment for a solar system compared to grid electricity.
     
+    Every numeric parameter except analysis_period may be an array (and grid_costs may come
+    from a batch call to calculate_grid_costs()), in which case all scenarios are evaluated
+    at once and the results gain a leading batch dimension.
+    
     Parameters:
     total_initial_cost (float): Total initial cost of the solar system in KES
     annual_maintenance (float): Annual maintenance cost in KES
@@ -70,99 +162,430 @@ def calculate_roi(
     grid_costs (Dict[str, Any]): Grid cost data from calculate_grid_costs()
     analysis_period (int): Number of years for the analysis
     financing_percentage (float): Percentage of system cost that's financed (0.0-1.0)
-    financing_years (int): Years over which financing is spread
+    financing_years (float): Years over which financing is spread (may end mid-year)
     financing_interest (float): Annual interest rate on financing
+    discount_rate (float): Annual discount rate for the net present value and LCOE
+    annual_energy_kwh (float, optional): Annual energy consumption in kWh for the LCOE,
+        constant per scenario or for every year with shape (..., analysis_period), defaulting
+        to the consumption recorded in grid_costs
+    as_lists (bool): Return Python lists instead of NumPy arrays (for compatibility)
     
     Returns:
     Dict[str, Any]: Dictionary containing ROI analysis data
     """
+    years = np.arange(analysis_period)
+    
     # Get annual grid costs
-    grid_annual_costs = grid_costs['annual_costs']
+    grid_annual_costs = np.asarray(grid_costs['annual_costs'], dtype=float)[..., :analysis_period]
     
     # Calculate financing
-    financed_amount = total_initial_cost * financing_percentage
+    total_initial_cost = np.asarray(total_initial_cost, dtype=float)
+    financed_amount = total_initial_cost * np.asarray(financing_percentage, dtype=float)
     down_payment = total_initial_cost - financed_amount
     
     # Calculate annual loan payment using PMT formula (principal + interest)
-    monthly_rate = financing_interest / 12
-    total_payments = financing_years * 12
-    monthly_payment = (financed_amount * monthly_rate) / (1 - (1 + monthly_rate) ** -total_payments)
+    monthly_rate = np.asarray(financing_interest, dtype=float) / 12
+    total_payments = np.asarray(financing_years, dtype=float) * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monthly_payment = np.where(
+            monthly_rate > 0,
+            (financed_amount * monthly_rate) / (1 - (1 + monthly_rate) ** -total_payments),
+            financed_amount / total_payments
+        )
     annual_loan_payment = monthly_payment * 12
     
-    # Calculate annual solar costs - spreading initial cost over financing period
-    solar_annual_costs = []
-    
-    # First year includes down payment and loan payments
-    solar_annual_costs.append(down_payment + annual_maintenance + annual_loan_payment)
-    
-    # Subsequent years
-    for year in range(1, analysis_period):
-        year_cost = annual_maintenance
-        
-        # Add loan payment if still in financing period
-        if year < financing_years:
-            year_cost += annual_loan_payment
-            
-        # Add battery replacement cost if needed
-        if year % battery_replacement_years == 0:
-            year_cost += battery_replacement_cost
-        
-        solar_annual_costs.append(year_cost)
+    # Calculate annual solar costs - down payment in the first year, loan payments for
+    # the months of each year within the financing period and battery replacements every
+    # battery_replacement_years (the annual totals of utils.cashflow.monthly_cash_flows())
+    loan_months = np.clip(_batch(total_payments) - years * 12, 0, 12)
+    replacement_mask = (years > 0) & (years % _batch(battery_replacement_years) == 0)
+    solar_annual_costs = (
+        _batch(annual_maintenance)
+        + np.where(years == 0, _batch(down_payment), 0.0)
+        + loan_months * _batch(monthly_payment)
+        + replacement_mask * _batch(battery_replacement_cost)
+    )
+    solar_annual_costs, grid_annual_costs = np.broadcast_arrays(solar_annual_costs, grid_annual_costs)
     
     # Calculate cumulative costs
-    grid_cumulative = np.cumsum(grid_annual_costs)
-    solar_cumulative = np.cumsum(solar_annual_costs)
-    
-    # Calculate annual savings (can be positive from year 1 with financing)
-    annual_savings = []
-    for i in range(analysis_period):
-        annual_savings.append(grid_annual_costs[i] - solar_annual_costs[i])
+    grid_cumulative = np.cumsum(grid_annual_costs, axis=-1)
+    solar_cumulative = np.cumsum(solar_annual_costs, axis=-1)
     
-    # Calculate cumulative savings
-    cumulative_savings = []
-    for i in range(analysis_period):
-        cumulative_savings.append(grid_cumulative[i] - solar_cumulative[i])
+    # Calculate annual and cumulative savings (can be positive from year 1 with financing)
+    annual_savings = grid_annual_costs - solar_annual_costs
+    cumulative_savings = grid_cumulative - solar_cumulative
     
-    # Calculate payback period
-    payback_period = calculate_payback_period(solar_cumulative, grid_cumulative)
+    # Calculate payback period, reporting a value larger than the analysis period
+    # for scenarios that never pay back
+    payback = solve_payback_periods(solar_cumulative, grid_cumulative)
+    pays_back = payback['pays_back']
+    payback_period = np.where(pays_back, payback['payback_period'], analysis_period + 1)
     
     # Calculate ROI percentage
-    if analysis_period < len(cumulative_savings):
-        total_savings = cumulative_savings[analysis_period - 1]
-    else:
-        total_savings = cumulative_savings[-1]
-    
+    total_savings = cumulative_savings[..., -1]
     roi_percent = (total_savings / total_initial_cost) * 100
     
     # Calculate first-year savings
-    first_year_savings = annual_savings[0] if annual_savings else 0
-    first_year_savings_percentage = (first_year_savings / grid_annual_costs[0]) * 100 if grid_annual_costs else 0
+    first_year_savings = annual_savings[..., 0]
+    first_year_savings_percentage = (first_year_savings / grid_annual_costs[..., 0]) * 100
     
     # Calculate average monthly savings in first year
-    monthly_first_year_savings = first_year_savings / 12 if first_year_savings else 0
+    monthly_first_year_savings = first_year_savings / 12
+    
+    # Calculate discounted metrics: NPV and IRR of the savings, and the levelized cost
+    # of energy from solar and from the grid (NaN if the consumption is unknown)
+    npv = calculate_npv(annual_savings, discount_rate)
+    irr = calculate_irr(annual_savings)
+    if annual_energy_kwh is None:
+        parameters = grid_costs.get('parameters', {})
+        if parameters.get('consumption_by_year') is not None:
+            annual_energy_kwh = np.broadcast_to(
+                np.asarray(parameters['consumption_by_year'], dtype=float)[..., :analysis_period],
+                solar_annual_costs.shape
+            )
+        else:
+            annual_energy_kwh = parameters.get('annual_energy_kwh', np.nan)
+    lcoe_solar = calculate_lcoe(solar_annual_costs, annual_energy_kwh, discount_rate)
+    lcoe_grid = calculate_lcoe(grid_annual_costs, annual_energy_kwh, discount_rate)
     
     return {
-        'payback_period': payback_period,
-        'roi_percent': roi_percent,
-        'total_savings': total_savings,
-        'annual_savings': annual_savings,
-        'cumulative_savings': cumulative_savings,
-        'solar_annual_costs': solar_annual_costs,
-        'solar_cumulative_costs': solar_cumulative.tolist(),
-        'grid_cumulative_costs': grid_cumulative.tolist(),
-        'first_year_savings': first_year_savings,
-        'first_year_savings_percentage': first_year_savings_percentage,
-        'monthly_first_year_savings': monthly_first_year_savings,
+        'payback_period': _to_output(payback_period, as_lists),
+        'pays_back': pays_back.tolist() if as_lists or pays_back.ndim == 0 else pays_back,
+        'roi_percent': _to_output(roi_percent, as_lists),
+        'total_savings': _to_output(total_savings, as_lists),
+        'annual_savings': _to_output(annual_savings, as_lists),
+        'cumulative_savings': _to_output(cumulative_savings, as_lists),
+        'solar_annual_costs': _to_output(solar_annual_costs, as_lists),
+        'solar_cumulative_costs': _to_output(solar_cumulative, as_lists),
+        'grid_cumulative_costs': _to_output(grid_cumulative, as_lists),
+        'first_year_savings': _to_output(first_year_savings, as_lists),
+        'first_year_savings_percentage': _to_output(first_year_savings_percentage, as_lists),
+        'monthly_first_year_savings': _to_output(monthly_first_year_savings, as_lists),
+        'npv': _to_output(npv, as_lists),
+        'irr': _to_output(irr, as_lists),
+        'lcoe_solar': _to_output(lcoe_solar, as_lists),
+        'lcoe_grid': _to_output(lcoe_grid, as_lists),
+        'discount_rate': discount_rate,
         'financing_details': {
-            'down_payment': down_payment,
-            'financed_amount': financed_amount,
-            'monthly_payment': monthly_payment,
-            'annual_payment': annual_loan_payment,
+            'down_payment': _to_output(down_payment, as_lists),
+            'financed_amount': _to_output(financed_amount, as_lists),
+            'monthly_payment': _to_output(monthly_payment, as_lists),
+            'annual_payment': _to_output(annual_loan_payment, as_lists),
             'financing_years': financing_years,
             'interest_rate': financing_interest
         }
     }
 
+def calculate_npv(cash_flows: np.ndarray, discount_rate: float) -> np.ndarray:
+    """
+    Calculate the net present value of annual cash flows.
+    
+    The first cash flow is undiscounted (it includes the upfront payment), the following
+    flows are discounted by one more year each. Both arguments broadcast, so a batch of
+    cash-flow rows and discount rates is evaluated at once.
+    
+    Parameters:
+    cash_flows (np.ndarray): Annual cash flows in KES, shape (..., years)
+    discount_rate (float): Annual discount rate as a decimal
+    
+    Returns:
+    np.ndarray: Net present value in KES, shape (...)
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    discount_factors = (1 + _batch(discount_rate)) ** -np.arange(cash_flows.shape[-1])
+    return np.sum(cash_flows * discount_factors, axis=-1)
+
+def _npv_and_derivative(cash_flows: np.ndarray, rate: np.ndarray):
+    """Evaluate the NPV of cash-flow rows and its derivative with respect to the rate by Horner's rule."""
+    discount = 1 / (1 + rate)
+    value = np.array(cash_flows[..., -1])
+    derivative = np.zeros_like(value)
+    for t in range(cash_flows.shape[-1] - 2, -1, -1):
+        derivative = derivative * discount + value
+        value = value * discount + cash_flows[..., t]
+    # d(NPV)/d(rate) = d(NPV)/d(discount) * d(discount)/d(rate)
+    return value, -derivative * discount ** 2
+
+def calculate_irr(
+    cash_flows: np.ndarray,
+    lower: float = -0.99,
+    upper: float = 10.0,
+    guess: float = 0.1,
+    tolerance: float = 1e-9,
+    max_iterations: int = 100
+) -> np.ndarray:
+    """
+    Calculate the internal rate of return of every row of a batch of annual cash flows.
+    
+    Uses the same timing convention as calculate_npv(). All rows are solved at once with a
+    safeguarded Newton method: every iterate narrows a bracket around the sign change of
+    the net present value, and a row whose Newton step leaves its bracket or shrinks too
+    slowly takes a bisection step instead. This converges quadratically for ordinary flows
+    and at least as fast as bisection for flows with several sign changes. Converged rows
+    drop out of the iteration, so a few slow rows do not hold up the batch. Rows without a
+    sign change of the net present value over [lower, upper] (for example cash flows that
+    are never negative) have no IRR and return NaN.
+    
+    Parameters:
+    cash_flows (np.ndarray): Annual cash flows in KES, shape (..., years)
+    lower (float): Lowest rate considered
+    upper (float): Highest rate considered
+    guess (float): Starting rate for the Newton iterations
+    tolerance (float): Step size at which a row is considered converged
+    max_iterations (int): Maximum number of iterations
+    
+    Returns:
+    np.ndarray: Internal rate of return as a decimal, shape (...), NaN where undefined
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    batch_shape = cash_flows.shape[:-1]
+    flows = cash_flows.reshape(-1, cash_flows.shape[-1])
+    
+    low = np.full(len(flows), float(lower))
+    high = np.full(len(flows), float(upper))
+    npv_low, _ = _npv_and_derivative(flows, low)
+    npv_high, _ = _npv_and_derivative(flows, high)
+    has_root = np.sign(npv_low) != np.sign(npv_high)
+    
+    rate = np.full(len(flows), min(max(float(guess), float(lower)), float(upper)))
+    step = high - low
+    previous_step = step.copy()
+    
+    # Only rows that have not converged yet are iterated
+    active = np.flatnonzero(has_root)
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        npv, slope = _npv_and_derivative(flows[active], rate[active])
+        
+        # Shrink the bracket to the side of the current rate that keeps the sign change
+        same_side = np.sign(npv) == np.sign(npv_low[active])
+        low[active] = np.where(same_side, rate[active], low[active])
+        npv_low[active] = np.where(same_side, npv, npv_low[active])
+        high[active] = np.where(same_side, high[active], rate[active])
+        
+        # Take the Newton step if it stays inside the bracket and at least halves the step
+        # before last, otherwise bisect
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton_step = npv / slope
+        newton_rate = rate[active] - newton_step
+        use_newton = (
+            np.isfinite(newton_step)
+            & (newton_rate > low[active]) & (newton_rate < high[active])
+            & (np.abs(2 * newton_step) < np.abs(previous_step[active]))
+        )
+        previous_step[active] = step[active]
+        step[active] = np.where(use_newton, newton_step, rate[active] - (low[active] + high[active]) / 2)
+        step[active] = np.where(npv == 0, 0.0, step[active])
+        rate[active] -= step[active]
+        
+        active = active[np.abs(step[active]) >= tolerance]
+    
+    return np.where(has_root, rate, np.nan).reshape(batch_shape)
+
+def calculate_lcoe(annual_costs: np.ndarray, annual_energy_kwh: np.ndarray, discount_rate: float) -> np.ndarray:
+    """
+    Calculate the levelized cost of energy: discounted costs over discounted energy.
+    
+    Uses the same timing convention as calculate_npv() for both costs and energy.
+    
+    Parameters:
+    annual_costs (np.ndarray): Annual costs in KES, shape (..., years)
+    annual_energy_kwh (np.ndarray): Energy delivered per year in kWh, either constant per
+        scenario with shape (...) or for every year with shape (..., years)
+    discount_rate (float): Annual discount rate as a decimal
+    
+    Returns:
+    np.ndarray: Levelized cost of energy in KES per kWh, shape (...)
+    """
+    annual_costs = np.asarray(annual_costs, dtype=float)
+    annual_energy_kwh = np.asarray(annual_energy_kwh, dtype=float)
+    if annual_energy_kwh.ndim < annual_costs.ndim:
+        annual_energy_kwh = annual_energy_kwh[..., np.newaxis]
+    annual_energy_kwh = np.broadcast_to(annual_energy_kwh, annual_costs.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return calculate_npv(annual_costs, discount_rate) / calculate_npv(annual_energy_kwh, discount_rate)
+
+def evaluate_scenarios(
+    panel_capacity_kw: float,
+    battery_capacity_kwh: float,
+    inverter_size_kw: float,
+    annual_energy_kwh: float,
+    panel_cost_per_wp: float = 90,
+    battery_cost_per_kwh: float = 40000,
+    inverter_cost_per_kw: float = 30000,
+    installation_percent: float = 15,
+    maintenance_annual: float = 10000,
+    battery_replacement_years: int = 10,
+    energy_charge: float = 21.0,
+    fixed_charge: float = 200,
+    inflation_rate: float = 0.05,
+    analysis_period: int = 20,
+    financing_percentage: float = 0.7,
+    financing_years: float = 7,
+    financing_interest: float = 0.12,
+    discount_rate: float = 0.10,
+    consumption_growth: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Evaluate system costs, grid costs and ROI for a batch of scenarios in one pass.
+    
+    Every parameter may be a scalar or an array; arrays are broadcast against each other.
+    Unlike calculate_roi(), the analysis period may also vary across the batch: all
+    scenarios are evaluated over the longest period and each row's results are then read
+    at its own period.
+    
+    Parameters:
+    panel_capacity_kw (float): Total solar panel capacity in kW
+    battery_capacity_kwh (float): Battery capacity in kWh
+    inverter_size_kw (float): Inverter size in kW
+    annual_energy_kwh (float): Annual energy consumption in kWh
+    panel_cost_per_wp (float): Solar panel cost in KES per Wp
+    battery_cost_per_kwh (float): Battery cost in KES per kWh
+    inverter_cost_per_kw (float): Inverter cost in KES per kW
+    installation_percent (float): Installation cost as a percentage of equipment cost
+    maintenance_annual (float): Annual maintenance cost in KES
+    battery_replacement_years (int): Years between battery replacements
+    energy_charge (float): Energy charge per kWh in KES
+    fixed_charge (float): Fixed monthly charge in KES
+    inflation_rate (float): Annual inflation rate for electricity costs
+    analysis_period (int): Number of years for the analysis
+    financing_percentage (float): Percentage of system cost that's financed (0.0-1.0)
+    financing_years (float): Years over which financing is spread (may end mid-year)
+    financing_interest (float): Annual interest rate on financing
+    discount_rate (float): Annual discount rate for the net present value
+    consumption_growth (float): Annual growth rate of consumption as a decimal
+    
+    Returns:
+    Dict[str, Any]: Dictionary of arrays with costs, payback period, ROI, savings, NPV, IRR and
+        LCOE, and the cumulative solar and grid costs over the longest period
+    """
+    costs = calculate_system_costs.__wrapped__(
+        panel_capacity_kw=np.asarray(panel_capacity_kw, dtype=float),
+        battery_capacity_kwh=np.asarray(battery_capacity_kwh, dtype=float),
+        inverter_size_kw=np.asarray(inverter_size_kw, dtype=float),
+        panel_cost_per_wp=np.asarray(panel_cost_per_wp, dtype=float),
+        battery_cost_per_kwh=np.asarray(battery_cost_per_kwh, dtype=float),
+        inverter_cost_per_kw=np.asarray(inverter_cost_per_kw, dtype=float),
+        installation_percent=np.asarray(installation_percent, dtype=float)
+    )
+    
+    period = np.asarray(analysis_period).astype(int)
+    max_period = int(period.max())
+    
+    # Exponential consumption forecast, the same as utils.consumption_forecast.forecast_consumption()
+    consumption_by_year = _batch(annual_energy_kwh) * (1 + _batch(consumption_growth)) ** np.arange(max_period)
+    
+    grid_costs = calculate_grid_costs.__wrapped__(
+        annual_energy_kwh=annual_energy_kwh,
+        energy_charge=energy_charge,
+        fixed_charge=fixed_charge,
+        inflation_rate=inflation_rate,
+        years=max_period,
+        consumption_by_year=consumption_by_year
+    )
+    roi = calculate_roi.__wrapped__(
+        total_initial_cost=costs['total_initial_cost'],
+        annual_maintenance=maintenance_annual,
+        battery_replacement_cost=costs['battery_cost'],
+        battery_replacement_years=battery_replacement_years,
+        grid_costs=grid_costs,
+        analysis_period=max_period,
+        financing_percentage=financing_percentage,
+        financing_years=financing_years,
+        financing_interest=financing_interest,
+        discount_rate=discount_rate
+    )
+    
+    # Read every scenario's results at its own analysis period
+    annual_savings = np.asarray(roi['annual_savings'])
+    batch_shape = np.broadcast_shapes(annual_savings.shape[:-1], period.shape)
+    annual_savings = np.broadcast_to(annual_savings, batch_shape + (max_period,))
+    period = np.broadcast_to(period, batch_shape)
+    in_period = np.arange(max_period) < period[..., np.newaxis]
+    
+    total_savings = np.take_along_axis(
+        np.broadcast_to(np.asarray(roi['cumulative_savings']), annual_savings.shape), (period - 1)[..., np.newaxis], axis=-1
+    )[..., 0]
+    # Payback is solved again over each row's own period: years after it are never a crossing
+    solar_cumulative = np.broadcast_to(np.asarray(roi['solar_cumulative_costs']), annual_savings.shape)
+    grid_cumulative = np.broadcast_to(np.asarray(roi['grid_cumulative_costs']), annual_savings.shape)
+    payback = solve_payback_periods(np.where(in_period, solar_cumulative, np.inf), grid_cumulative)
+    payback_period = payback['payback_period']
+    pays_back = payback['pays_back']
+    total_initial_cost = np.broadcast_to(costs['total_initial_cost'], batch_shape)
+    
+    # Discounted metrics over each scenario's own period; years after it are zeroed, which
+    # leaves the IRR unchanged. With a common period they are calculate_roi()'s already.
+    if np.all(period == max_period):
+        npv = np.broadcast_to(np.asarray(roi['npv']), batch_shape)
+        irr = np.broadcast_to(np.asarray(roi['irr']), batch_shape)
+        lcoe_solar = np.broadcast_to(np.asarray(roi['lcoe_solar']), batch_shape)
+    else:
+        savings_in_period = np.where(in_period, annual_savings, 0.0)
+        solar_costs_in_period = np.where(in_period, np.asarray(roi['solar_annual_costs']), 0.0)
+        energy_in_period = np.where(in_period, consumption_by_year, 0.0)
+        npv = calculate_npv(savings_in_period, discount_rate)
+        irr = calculate_irr(savings_in_period)
+        lcoe_solar = calculate_lcoe(solar_costs_in_period, energy_in_period, discount_rate)
+    
+    return {
+        'total_initial_cost': total_initial_cost,
+        'payback_period': np.where(pays_back, payback_period, period + 1),
+        'pays_back': pays_back,
+        'total_savings': total_savings,
+        'roi_percent': total_savings / total_initial_cost * 100,
+        'npv': npv,
+        'irr': irr,
+        'lcoe_solar': lcoe_solar,
+        'annual_savings': annual_savings,
+        'solar_cumulative_costs': np.asarray(roi['solar_cumulative_costs']),
+        'grid_cumulative_costs': np.asarray(roi['grid_cumulative_costs'])
+    }
+
+def solve_payback_periods(solar_cumulative: np.ndarray, grid_cumulative: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Find the payback period of every row of a batch of cumulative cost arrays at once.
+    
+    The first year in which cumulative grid costs exceed cumulative solar costs is found with
+    argmax over the sign change, and the fractional year is interpolated linearly between
+    the last year before break-even and the first year after it. If solar is already cheaper
+    in the first year the payback period is 0. Rows that never pay back within the analysis
+    period get an infinite payback period.
+    
+    Parameters:
+    solar_cumulative (np.ndarray): Cumulative solar costs, shape (..., years)
+    grid_cumulative (np.ndarray): Cumulative grid costs, shape (..., years)
+    
+    Returns:
+    Dict[str, np.ndarray]: Dictionary with 'payback_period' (years, inf if never) and
+        'pays_back' (whether break-even is reached within the analysis period)
+    """
+    solar_cumulative, grid_cumulative = np.broadcast_arrays(
+        np.asarray(solar_cumulative, dtype=float), np.asarray(grid_cumulative, dtype=float)
+    )
+    difference = solar_cumulative - grid_cumulative
+    crossed = difference < 0
+    
+    # Index of the first year where grid costs exceed solar costs
+    pays_back = crossed.any(axis=-1)
+    first_crossing = np.argmax(crossed, axis=-1)
+    
+    # Linear interpolation between the previous year and the crossing year
+    previous_index = np.maximum(first_crossing - 1, 0)[..., np.newaxis]
+    previous_diff = np.take_along_axis(difference, previous_index, axis=-1)[..., 0]
+    current_diff = np.take_along_axis(difference, first_crossing[..., np.newaxis], axis=-1)[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = previous_diff / (previous_diff - current_diff)
+    
+    payback_period = np.where(first_crossing > 0, first_crossing - 1 + fraction, 0.0)
+    payback_period = np.where(pays_back, payback_period, np.inf)
+    
+    return {
+        'payback_period': payback_period,
+        'pays_back': pays_back
+    }
+
 def calculate_payback_period(solar_cumulative: np.array, grid_cumulative: np.array) -> float:
     """
     Calculate the payback period by finding when cumulative grid costs exceed solar costs.
@@ -172,22 +595,12 @@ def calculate_payback_period(solar_cumulative: np.array, grid_cumulative: np.arr
     grid_cumulative (np.array): Cumulative grid costs
     
     Returns:
-    float: Payback period in years
-    """
-    # Find the point where grid costs exceed solar costs
-    for i in range(1, len(solar_cumulative)):
-        if grid_cumulative[i] > solar_cumulative[i]:
-            # Linear interpolation for more accurate payback period
-            prev_diff = solar_cumulative[i-1] - grid_cumulative[i-1]
-            curr_diff = solar_cumulative[i] - grid_cumulative[i]
-            
-            # If curr_diff is positive, we haven't reached break-even yet
-            if curr_diff >= 0:
-                continue
-            
-            # Calculate the fractional year where break-even occurs
-            fraction = prev_diff / (prev_diff - curr_diff)
-            return i - 1 + fraction
+    float: Payback period in years, or a value larger than the analysis period
+        if there is no break-even point
+    """
+    result = solve_payback_periods(solar_cumulative, grid_cumulative)
     
     # If no break-even point is found, return a value larger than the analysis period
-    return len(solar_cumulative) + 1
+    if not result['pays_back']:
+        return len(solar_cumulative) + 1
+    return float(result['payback_period'])
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+from utils.roi_calculator import evaluate_scenarios
+
+# Inputs varied by the sensitivity analysis, with their display label, how they are
+# perturbed by default ('relative' fraction or 'absolute' amount) and their valid range
+SENSITIVITY_PARAMETERS = {
+    'panel_cost_per_wp': {'label': 'Panel Cost (KES/Wp)', 'relative': 0.2, 'bounds': (0, None)},
+    'battery_cost_per_kwh': {'label': 'Battery Cost (KES/kWh)', 'relative': 0.2, 'bounds': (0, None)},
+    'inverter_cost_per_kw': {'label': 'Inverter Cost (KES/kW)', 'relative': 0.2, 'bounds': (0, None)},
+    'installation_percent': {'label': 'Installation Cost (%)', 'absolute': 5, 'bounds': (0, None)},
+    'maintenance_annual': {'label': 'Annual Maintenance (KES)', 'relative': 0.3, 'bounds': (0, None)},
+    'battery_replacement_years': {'label': 'Battery Replacement (years)', 'absolute': 3, 'bounds': (1, None), 'integer': True},
+    'energy_charge': {'label': 'Tariff (KES/kWh)', 'relative': 0.2, 'bounds': (0, None)},
+    'inflation_rate': {'label': 'Grid Inflation (%/year)', 'absolute': 0.03, 'bounds': (0, None)},
+    'analysis_period': {'label': 'Analysis Period (years)', 'absolute': 5, 'bounds': (1, 30), 'integer': True},
+    'financing_percentage': {'label': 'Financed Share', 'absolute': 0.2, 'bounds': (0, 1)},
+    'financing_years': {'label': 'Loan Term (years)', 'absolute': 2, 'bounds': (1, None)},
+    'financing_interest': {'label': 'Loan Interest Rate', 'absolute': 0.04, 'bounds': (0, None)},
+    'discount_rate': {'label': 'Discount Rate', 'absolute': 0.03, 'bounds': (0, None)},
+    'consumption_growth': {'label': 'Consumption Growth (%/year)', 'absolute': 0.03, 'bounds': (-0.1, None)}
+}
+
+SENSITIVITY_METRICS = {
+    'payback_period': 'Payback Period (years)',
+    'npv': 'Net Present Value (KES)',
+    'roi_percent': 'ROI (%)',
+    'irr': 'Internal Rate of Return',
+    'lcoe_solar': 'Solar LCOE (KES/kWh)'
+}
+
+
+def parameter_range(name: str, base_value: float) -> Tuple[float, float]:
+    """
+    Return the default low and high values of a sensitivity parameter around its base value.
+
+    Parameters:
+    name (str): Parameter name, one of SENSITIVITY_PARAMETERS
+    base_value (float): Base value of the parameter
+
+    Returns:
+    Tuple[float, float]: Low and high values
+    """
+    spec = SENSITIVITY_PARAMETERS[name]
+    if 'relative' in spec:
+        delta = abs(base_value) * spec['relative']
+    else:
+        delta = spec['absolute']
+
+    low, high = spec['bounds']
+    return (
+        max(base_value - delta, low) if low is not None else base_value - delta,
+        min(base_value + delta, high) if high is not None else base_value + delta
+    )
+
+
+def sensitivity_analysis(
+    base_inputs: Dict[str, Any],
+    ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    steps: int = 5
+) -> Dict[str, Any]:
+    """
+    Vary every cost, tariff and financing input over a range in one batched ROI evaluation.
+
+    Each parameter is swept from its low to its high value while all other inputs stay at
+    their base values. All sweeps are stacked into a single batch and evaluated with one
+    call to evaluate_scenarios(), so the analysis is fast enough to refresh on every
+    interaction.
+
+    Parameters:
+    base_inputs (Dict[str, Any]): Keyword arguments for evaluate_scenarios() describing the base case
+    ranges (Dict[str, Tuple[float, float]], optional): Low and high values per parameter,
+        defaulting to parameter_range() for every parameter in SENSITIVITY_PARAMETERS
+    steps (int): Number of points in each sweep (at least 2)
+
+    Returns:
+    Dict[str, Any]: Dictionary containing the base-case metrics, a tornado table with the
+        low/high results per parameter and a long-format sweep table for spider charts
+    """
+    if ranges is None:
+        ranges = {
+            name: parameter_range(name, float(base_inputs[name]))
+            for name in SENSITIVITY_PARAMETERS if name in base_inputs
+        }
+    steps = max(int(steps), 2)
+
+    # Batch layout: row 0 is the base case, then `steps` rows per parameter
+    names = list(ranges)
+    rows = 1 + len(names) * steps
+    batch = {key: np.full(rows, float(value)) for key, value in base_inputs.items()}
+    sweep_values = np.zeros(rows)
+
+    for i, name in enumerate(names):
+        low, high = ranges[name]
+        values = np.linspace(low, high, steps)
+        if SENSITIVITY_PARAMETERS.get(name, {}).get('integer'):
+            values = np.round(values)
+        block = slice(1 + i * steps, 1 + (i + 1) * steps)
+        batch[name][block] = values
+        sweep_values[block] = values
+
+    results = evaluate_scenarios(**batch)
+
+    base = {metric: float(results[metric][0]) for metric in SENSITIVITY_METRICS}
+    base['pays_back'] = bool(results['pays_back'][0])
+
+    # Long-format sweep table; payback is NaN where the scenario does not pay back within its
+    # period rather than the period + 1 placeholder
+    parameter_column = np.repeat(names, steps)
+    sweep = pd.DataFrame({
+        'parameter': parameter_column,
+        'label': [SENSITIVITY_PARAMETERS.get(name, {}).get('label', name) for name in parameter_column],
+        'value': sweep_values[1:],
+        **{metric: results[metric][1:] for metric in SENSITIVITY_METRICS},
+        'pays_back': results['pays_back'][1:]
+    })
+    sweep['payback_period'] = sweep['payback_period'].where(sweep['pays_back'])
+
+    # Tornado table from the ends of each sweep
+    low_rows = sweep.groupby('parameter', sort=False).head(1).set_index('parameter')
+    high_rows = sweep.groupby('parameter', sort=False).tail(1).set_index('parameter')
+    tornado = pd.DataFrame({
+        'label': low_rows['label'],
+        'low_value': low_rows['value'],
+        'high_value': high_rows['value'],
+        'base_value': [float(base_inputs[name]) for name in low_rows.index]
+    })
+    for metric in SENSITIVITY_METRICS:
+        tornado[f'{metric}_low'] = low_rows[metric]
+        tornado[f'{metric}_high'] = high_rows[metric]
+        tornado[f'{metric}_swing'] = (high_rows[metric] - low_rows[metric]).abs()
+    # An end that does not pay back is left out of the payback swing, which then runs from
+    # the base case to the end that does
+    if base['pays_back']:
+        low_payback = low_rows['payback_period'].fillna(base['payback_period'])
+        high_payback = high_rows['payback_period'].fillna(base['payback_period'])
+        tornado['payback_period_swing'] = (high_payback - low_payback).abs()
+    else:
+        tornado['payback_period_swing'] = (high_rows['payback_period'] - low_rows['payback_period']).abs().fillna(0.0)
+
+    return {
+        'base': base,
+        'tornado': tornado.reset_index(),
+        'sweep': sweep
+    }
+
+
+def tornado_data(analysis: Dict[str, Any], metric: str = 'npv') -> pd.DataFrame:
+    """
+    Return tornado-chart data for one metric, sorted with the largest swing first.
+
+    Parameters:
+    analysis (Dict[str, Any]): Result of sensitivity_analysis()
+    metric (str): Metric name, one of SENSITIVITY_METRICS
+
+    Returns:
+    pd.DataFrame: One row per parameter with the metric at the low and high values
+    """
+    tornado = analysis['tornado']
+    return tornado[['parameter', 'label', 'low_value', 'high_value', f'{metric}_low', f'{metric}_high', f'{metric}_swing']] \
+        .rename(columns={f'{metric}_low': 'low', f'{metric}_high': 'high', f'{metric}_swing': 'swing'}) \
+        .sort_values('swing', ascending=False) \
+        .reset_index(drop=True)
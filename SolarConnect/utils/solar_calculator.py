@@ -1,6 +1,12 @@
 import math
+import numpy as np
 from typing import Dict, Any
+from utils.memoize import memoize
 
+# Share of the future_expansion allowance that is added to the sized daily load
+EXPANSION_SIZING_SHARE = 0.5
+
+@memoize()
 def calculate_system_size(
     daily_energy_kwh: float,
     peak_sun_hours: float,
@@ -31,7 +37,7 @@ def calculate_system_size(
     """
     # Apply a more balanced approach for efficiency and future expansion
     # Reducing their impact to make calculations more realistic
-    adjusted_daily_energy = daily_energy_kwh * (1 + (future_expansion * 0.5)) / system_efficiency
+    adjusted_daily_energy = daily_energy_kwh * (1 + (future_expansion * EXPANSION_SIZING_SHARE)) / system_efficiency
     
     # Calculate panel array size (in kW)
     required_panel_output = adjusted_daily_energy / peak_sun_hours
@@ -81,6 +87,69 @@ def calculate_system_size(
         'battery_voltage': battery_voltage
     }
 
+def calculate_system_sizes(
+    daily_energy_kwh: np.ndarray,
+    peak_sun_hours: np.ndarray,
+    panel_wattage: int = 400,
+    battery_voltage: int = 24,
+    battery_dod: float = 0.8,
+    autonomy_days: int = 1,
+    system_efficiency: float = 0.85,
+    future_expansion: float = 0.2,
+    max_panels: int = 50
+) -> Dict[str, np.ndarray]:
+    """
+    Size a batch of solar systems at once, with the same rules as calculate_system_size().
+    
+    Every parameter may be an array; arrays are broadcast against each other, so for example
+    a column of daily energies and a row of peak sun hours size every combination.
+    
+    Parameters:
+    daily_energy_kwh (np.ndarray): Daily energy consumption in kWh
+    peak_sun_hours (np.ndarray): Peak sun hours for the location
+    panel_wattage (int): Wattage of individual solar panels in W
+    battery_voltage (int): Battery bank voltage in V
+    battery_dod (float): Battery depth of discharge as a decimal (0.0-1.0)
+    autonomy_days (int): Number of days of autonomy required
+    system_efficiency (float): Overall system efficiency as a decimal (0.0-1.0)
+    future_expansion (float): Future expansion factor as a decimal (0.0-1.0)
+    max_panels (int): Maximum number of panels for a feasible residential system
+    
+    Returns:
+    Dict[str, np.ndarray]: The system parameters of calculate_system_size() as arrays
+    """
+    daily_energy_kwh = np.asarray(daily_energy_kwh, dtype=float)
+    peak_sun_hours = np.asarray(peak_sun_hours, dtype=float)
+    adjusted_daily_energy = daily_energy_kwh * (1 + (np.asarray(future_expansion) * EXPANSION_SIZING_SHARE)) / system_efficiency
+    required_panel_output = adjusted_daily_energy / peak_sun_hours
+    
+    panel_capacity_kw = np.asarray(panel_wattage, dtype=float) / 1000
+    ideal_number_of_panels = np.ceil(required_panel_output / panel_capacity_kw)
+    number_of_panels = np.minimum(ideal_number_of_panels, max_panels)
+    total_panel_capacity_kw = number_of_panels * panel_capacity_kw
+    
+    energy_produced = total_panel_capacity_kw * peak_sun_hours
+    coverage_percentage = np.minimum(100, energy_produced * 100 / adjusted_daily_energy)
+    actual_coverage_ratio = np.minimum(1.0, energy_produced / adjusted_daily_energy)
+    battery_capacity_kwh = (adjusted_daily_energy * actual_coverage_ratio) * autonomy_days / battery_dod
+    
+    return {
+        'daily_energy_kwh': daily_energy_kwh,
+        'adjusted_daily_energy': adjusted_daily_energy,
+        'peak_sun_hours': peak_sun_hours,
+        'required_panel_output': required_panel_output,
+        'panel_capacity_kw': panel_capacity_kw,
+        'ideal_number_of_panels': ideal_number_of_panels,
+        'number_of_panels': number_of_panels,
+        'total_panel_capacity_kw': total_panel_capacity_kw,
+        'coverage_percentage': coverage_percentage,
+        'array_area_sqm': total_panel_capacity_kw * 6,
+        'battery_capacity_kwh': battery_capacity_kwh,
+        'battery_capacity_ah': battery_capacity_kwh * 1000 / battery_voltage,
+        'battery_voltage': battery_voltage
+    }
+
+@memoize()
 def calculate_inverter_size(panel_capacity_kw: float, ac_load_peak_kw: float = None) -> float:
     """
     Calculate the recommended inverter size based on panel capacity and AC loads.
@@ -92,15 +161,28 @@ def calculate_inverter_size(panel_capacity_kw: float, ac_load_peak_kw: float = N
     Returns:
     float: Recommended inverter size in kW
     """
+    return float(calculate_inverter_sizes(panel_capacity_kw, ac_load_peak_kw))
+
+def calculate_inverter_sizes(panel_capacity_kw: np.ndarray, ac_load_peak_kw: np.ndarray = None) -> np.ndarray:
+    """
+    Vectorized calculate_inverter_size() for arrays of systems.
+    
+    Parameters:
+    panel_capacity_kw (np.ndarray): Total solar panel capacity in kW
+    ac_load_peak_kw (np.ndarray, optional): Peak AC load in kW, 0 or None where not known
+    
+    Returns:
+    np.ndarray: Recommended inverter size in kW
+    """
     # If AC load is provided, use the larger of AC load or panel capacity
-    if ac_load_peak_kw:
-        base_size = max(panel_capacity_kw, ac_load_peak_kw)
-    else:
-        base_size = panel_capacity_kw
+    base_size = np.asarray(panel_capacity_kw, dtype=float)
+    if ac_load_peak_kw is not None:
+        base_size = np.maximum(base_size, np.asarray(ac_load_peak_kw, dtype=float))
     
     # Add 20% overhead for safety margin
     return base_size * 1.2
 
+@memoize()
 def calculate_wire_sizes(
     panel_capacity_kw: float,
     battery_voltage: int,
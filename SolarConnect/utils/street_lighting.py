@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+from data.kenya_counties import get_kenya_counties
+from utils.pvgis_api import KENYA_MONTHLY_AVERAGES
+from utils.hourly_simulation import HOURS_PER_DAY
+
+# Standard component sizes stocked by Kenyan street-lighting suppliers
+STANDARD_PANEL_SIZES_W = np.array([30, 50, 60, 80, 100, 120, 150, 180, 200, 250, 300, 350, 400])
+STANDARD_BATTERY_SIZES_AH = np.array([20, 30, 40, 50, 60, 80, 100, 120, 150, 200, 250, 300])
+BATTERY_VOLTAGE = 12.8  # LiFePO4 street-light batteries
+
+# Luminaire output for each hour of the night (00:00-23:00) as a fraction of full power.
+# Hours that are partly or fully daylight are masked out by the dusk-to-dawn window.
+DIMMING_PROFILES = {
+    "Full Brightness": np.ones(HOURS_PER_DAY),
+    "Standard Dimming": np.array([
+        0.5, 0.5, 0.5, 0.5, 0.7, 1.0,  # 00-05
+        1.0, 1.0, 1.0, 1.0, 1.0, 1.0,  # 06-11
+        1.0, 1.0, 1.0, 1.0, 1.0, 1.0,  # 12-17
+        1.0, 1.0, 1.0, 1.0, 0.7, 0.5   # 18-23
+    ]),
+    "Deep Dimming": np.array([
+        0.3, 0.3, 0.3, 0.3, 0.5, 1.0,  # 00-05
+        1.0, 1.0, 1.0, 1.0, 1.0, 1.0,  # 06-11
+        1.0, 1.0, 1.0, 1.0, 1.0, 1.0,  # 12-17
+        1.0, 1.0, 0.7, 0.5, 0.3, 0.3   # 18-23
+    ])
+}
+
+
+def dark_hours_fraction(sunrise: float = 6.5, sunset: float = 18.75) -> np.ndarray:
+    """
+    Calculate the fraction of each hour of the day that falls between dusk and dawn.
+
+    Parameters:
+    sunrise (float): Sunrise time in decimal hours
+    sunset (float): Sunset time in decimal hours
+
+    Returns:
+    np.ndarray: 24 values between 0 (daylight) and 1 (fully dark)
+    """
+    hour_start = np.arange(HOURS_PER_DAY)
+    daylight = np.clip(np.minimum(hour_start + 1, sunset) - np.maximum(hour_start, sunrise), 0, 1)
+    return 1 - daylight
+
+
+def nearest_county(latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest county centre in the Kenya counties database for each location.
+
+    Parameters:
+    latitudes (np.ndarray): Latitudes of the locations
+    longitudes (np.ndarray): Longitudes of the locations
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: County names and county peak sun hours for each location
+    """
+    counties = get_kenya_counties()
+    names = np.array(list(counties.keys()))
+    county_lat = np.array([c['coordinates']['latitude'] for c in counties.values()])
+    county_lon = np.array([c['coordinates']['longitude'] for c in counties.values()])
+    county_psh = np.array([c['climate']['peak_sun_hours'] for c in counties.values()])
+
+    # Equirectangular distance is accurate enough at Kenya's latitudes
+    latitudes = np.asarray(latitudes, dtype=float)[:, np.newaxis]
+    longitudes = np.asarray(longitudes, dtype=float)[:, np.newaxis]
+    distance = (latitudes - county_lat) ** 2 + ((longitudes - county_lon) * np.cos(np.radians(latitudes))) ** 2
+    nearest = np.argmin(distance, axis=1)
+
+    return names[nearest], county_psh[nearest]
+
+
+def round_up_to_standard(required: np.ndarray, standard_sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select stock components that cover the required sizes.
+
+    Requirements up to the biggest standard component are rounded up to the nearest standard
+    size; larger ones are met with several units of the biggest size.
+
+    Parameters:
+    required (np.ndarray): Required sizes
+    standard_sizes (np.ndarray): Sorted standard component sizes
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Standard size of each unit and the number of units
+    """
+    required = np.asarray(required, dtype=float)
+    index = np.searchsorted(standard_sizes, required)
+    fits = index < len(standard_sizes)
+    unit_size = np.where(fits, standard_sizes[np.minimum(index, len(standard_sizes) - 1)], standard_sizes[-1])
+    units = np.where(fits, 1, np.ceil(required / standard_sizes[-1])).astype(int)
+    return unit_size, units
+
+
+def design_street_lighting(
+    poles: pd.DataFrame,
+    dimming_profile: str = "Standard Dimming",
+    autonomy_days: float = 3.0,
+    battery_dod: float = 0.9,
+    system_efficiency: float = 0.75,
+    panel_cost_per_wp: float = 90,
+    battery_cost_per_kwh: float = 40000,
+    luminaire_cost_per_w: float = 150,
+    pole_fixed_cost: float = 35000
+) -> Dict[str, Any]:
+    """
+    Size the solar panel and battery of every pole in a street-lighting project.
+
+    The whole tender is processed as one vectorized batch. Each pole's irradiance comes from
+    its own 'peak_sun_hours' column if given, otherwise from the nearest county in the
+    database with Kenya's monthly irradiance profile applied. Panels are sized with the
+    worst-month rule so the lights run through the darkest month of the year.
+
+    Parameters:
+    poles (pd.DataFrame): One row per pole with 'latitude', 'longitude' and 'luminaire_w' columns,
+        and optional 'pole_id', 'dimming_profile' and 'peak_sun_hours' columns
+    dimming_profile (str): Default dimming profile, one of DIMMING_PROFILES
+    autonomy_days (float): Nights the battery must cover without any sun
+    battery_dod (float): Battery depth of discharge as a decimal (0.0-1.0)
+    system_efficiency (float): Combined panel, controller and battery efficiency (0.0-1.0)
+    panel_cost_per_wp (float): Solar panel cost in KES per Wp
+    battery_cost_per_kwh (float): Battery cost in KES per kWh
+    luminaire_cost_per_w (float): LED luminaire cost in KES per W
+    pole_fixed_cost (float): Pole, bracket, controller and installation cost per pole in KES
+
+    Returns:
+    Dict[str, Any]: Dictionary containing the per-pole design table and a bill of materials
+    """
+    poles = poles.reset_index(drop=True)
+    if 'pole_id' not in poles:
+        poles['pole_id'] = np.arange(1, len(poles) + 1)
+    luminaire_w = poles['luminaire_w'].to_numpy(dtype=float)
+
+    # Location-specific irradiance: explicit values first, then the county database
+    county, county_psh = nearest_county(poles['latitude'].to_numpy(), poles['longitude'].to_numpy())
+    if 'peak_sun_hours' in poles:
+        annual_psh = poles['peak_sun_hours'].fillna(pd.Series(county_psh)).to_numpy(dtype=float)
+    else:
+        annual_psh = county_psh
+
+    monthly_shape = np.asarray(KENYA_MONTHLY_AVERAGES, dtype=float)
+    monthly_shape = monthly_shape / monthly_shape.mean()
+    worst_month_psh = annual_psh * monthly_shape.min()
+
+    # Nightly energy from the dusk-to-dawn window and each pole's dimming profile
+    profile_names = poles['dimming_profile'].fillna(dimming_profile) if 'dimming_profile' in poles else pd.Series([dimming_profile] * len(poles))
+    profile_table = np.array([DIMMING_PROFILES[name] for name in DIMMING_PROFILES])
+    unknown_profiles = set(profile_names) - set(DIMMING_PROFILES)
+    if unknown_profiles:
+        raise ValueError(f"Unknown dimming profile(s): {', '.join(sorted(unknown_profiles))}")
+    profile_index = profile_names.map({name: i for i, name in enumerate(DIMMING_PROFILES)}).to_numpy(dtype=int)
+    nightly_hours = profile_table @ dark_hours_fraction()
+    nightly_energy_wh = luminaire_w * nightly_hours[profile_index]
+
+    # Worst-month panel sizing and battery sizing for the required autonomy
+    required_panel_w = nightly_energy_wh / (worst_month_psh * system_efficiency)
+    panel_unit_w, panels = round_up_to_standard(required_panel_w, STANDARD_PANEL_SIZES_W)
+    panel_w = panel_unit_w * panels
+    required_battery_ah = nightly_energy_wh * autonomy_days / battery_dod / BATTERY_VOLTAGE
+    # Batteries beyond the largest size are connected in parallel at the same voltage
+    battery_unit_ah, batteries = round_up_to_standard(required_battery_ah, STANDARD_BATTERY_SIZES_AH)
+    battery_ah = battery_unit_ah * batteries
+    battery_kwh = battery_ah * BATTERY_VOLTAGE / 1000
+
+    pole_cost = (
+        panel_w * panel_cost_per_wp
+        + battery_kwh * battery_cost_per_kwh
+        + luminaire_w * luminaire_cost_per_w
+        + pole_fixed_cost
+    )
+
+    design = pd.DataFrame({
+        'pole_id': poles['pole_id'],
+        'latitude': poles['latitude'],
+        'longitude': poles['longitude'],
+        'county': county,
+        'luminaire_w': luminaire_w,
+        'dimming_profile': profile_names.to_numpy(),
+        'annual_peak_sun_hours': annual_psh,
+        'worst_month_peak_sun_hours': worst_month_psh,
+        'nightly_energy_wh': nightly_energy_wh,
+        'panel_unit_w': panel_unit_w,
+        'panels': panels,
+        'panel_w': panel_w,
+        'battery_unit_ah': battery_unit_ah,
+        'batteries': batteries,
+        'battery_ah': battery_ah,
+        'battery_kwh': battery_kwh,
+        'pole_cost': pole_cost
+    })
+
+    # Bill of materials: component counts by stock size plus project totals
+    bill_of_materials = pd.concat([
+        design.groupby('luminaire_w').size().rename('quantity').reset_index()
+            .assign(item=lambda df: "LED Luminaire " + df['luminaire_w'].map('{:.0f} W'.format)),
+        design.groupby('panel_unit_w')['panels'].sum().rename('quantity').reset_index()
+            .assign(item=lambda df: "Solar Panel " + df['panel_unit_w'].map('{:.0f} W'.format)),
+        design.groupby('battery_unit_ah')['batteries'].sum().rename('quantity').reset_index()
+            .assign(item=lambda df: f"LiFePO4 Battery {BATTERY_VOLTAGE} V " + df['battery_unit_ah'].map('{:.0f} Ah'.format)),
+    ], ignore_index=True)[['item', 'quantity']]
+
+    summary = {
+        'number_of_poles': len(design),
+        'total_luminaire_kw': float(luminaire_w.sum() / 1000),
+        'total_panel_kw': float(panel_w.sum() / 1000),
+        'total_battery_kwh': float(battery_kwh.sum()),
+        'total_cost': float(pole_cost.sum()),
+        'average_cost_per_pole': float(pole_cost.mean()) if len(design) else 0.0
+    }
+
+    return {
+        'design': design,
+        'bill_of_materials': bill_of_materials,
+        'summary': summary
+    }
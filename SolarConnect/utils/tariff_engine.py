@@ -0,0 +1,369 @@
+import numpy as np
+from typing import Dict, Any, Union
+from data.kenya_electricity_tariffs import get_electricity_tariff, get_tou_tariff
+from utils.memoize import memoize
+from utils.hourly_simulation import HOURS_PER_DAY, DAYS_PER_MONTH, HOURS_PER_YEAR
+
+# First day of each month in a 365-day year, for monthly reductions over daily values
+MONTH_START_DAYS = np.concatenate([[0], np.cumsum(DAYS_PER_MONTH)[:-1]])
+
+# Bill line items in the order they appear on a Kenya Power bill
+BILL_COMPONENTS = [
+    'energy_charge', 'fixed_charge', 'fuel_energy_cost', 'forex_adjustment',
+    'inflation_adjustment', 'erc_levy', 'rep_levy', 'wra_levy', 'vat'
+]
+
+
+def compile_tariff(tariff: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Precompile a tariff into the band tables used by calculate_bill().
+
+    For each band the lower limit, rate and the energy charge accumulated below it are
+    stored, so a bill for any consumption is one band lookup and one multiply-add.
+
+    Parameters:
+    tariff (Dict[str, Any]): Tariff from get_electricity_tariff()
+
+    Returns:
+    Dict[str, Any]: Compiled tariff
+    """
+    bands = sorted(tariff.get('bands') or [(float('inf'), float(tariff['energy_charge']))])
+    upper = np.array([limit for limit, _ in bands], dtype=float)
+    rates = np.array([rate for _, rate in bands], dtype=float)
+    lower = np.concatenate([[0.0], upper[:-1]])
+    charge_below = np.concatenate([[0.0], np.cumsum((upper[:-1] - lower[:-1]) * rates[:-1])])
+
+    adjustments = tariff.get('adjustments', {})
+    return {
+        'category': tariff.get('category', ''),
+        'band_pricing': tariff.get('band_pricing', 'volume'),
+        'upper': upper,
+        'lower': lower,
+        'rates': rates,
+        'charge_below': charge_below,
+        'fixed_charge': float(tariff['fixed_charge']),
+        'fuel_energy_cost': adjustments.get('fuel_energy_cost', 0.0),
+        'forex_adjustment': adjustments.get('forex_adjustment', 0.0),
+        'inflation_adjustment': adjustments.get('inflation_adjustment', 0.0),
+        'erc_levy': adjustments.get('erc_levy', 0.0),
+        'wra_levy': adjustments.get('wra_levy', 0.0),
+        'rep_levy_rate': adjustments.get('rep_levy_percent', 0.0) / 100,
+        'vat_rate': adjustments.get('vat_percent', 0.0) / 100
+    }
+
+
+@memoize(maxsize=16)
+def get_compiled_tariff(consumer_type: str) -> Dict[str, Any]:
+    """
+    Return the compiled tariff of a Kenya Power consumer type.
+
+    Parameters:
+    consumer_type (str): The type of consumer (Domestic, Small Commercial, Commercial, or Industrial)
+
+    Returns:
+    Dict[str, Any]: Compiled tariff
+    """
+    return compile_tariff(get_electricity_tariff(consumer_type))
+
+
+def _resolve_tariff(tariff: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Accept a consumer type, a tariff or a compiled tariff."""
+    if isinstance(tariff, str):
+        return get_compiled_tariff(tariff)
+    if 'charge_below' in tariff:
+        return tariff
+    return compile_tariff(tariff)
+
+
+def calculate_bill(monthly_kwh: np.ndarray, tariff: Union[str, Dict[str, Any]] = "Domestic") -> Dict[str, np.ndarray]:
+    """
+    Calculate the itemized monthly electricity bill for one or more consumption values.
+
+    The consumption may be an array of any shape; every line item is returned with the
+    same shape, computed for all values in one pass.
+
+    Parameters:
+    monthly_kwh (np.ndarray): Monthly energy consumption in kWh
+    tariff (str or Dict[str, Any]): Consumer type, tariff from get_electricity_tariff()
+        or compiled tariff from compile_tariff()
+
+    Returns:
+    Dict[str, np.ndarray]: Bill line items in KES (see BILL_COMPONENTS), the 'total' bill
+        and the 'effective_rate' in KES per kWh
+    """
+    tariff = _resolve_tariff(tariff)
+    kwh = np.maximum(np.asarray(monthly_kwh, dtype=float), 0.0)
+
+    # Band of the month's consumption (a consumption on a band limit belongs to the lower band)
+    band = np.minimum(np.searchsorted(tariff['upper'], kwh, side='left'), len(tariff['upper']) - 1)
+    if tariff['band_pricing'] == 'incremental':
+        energy_charge = tariff['charge_below'][band] + (kwh - tariff['lower'][band]) * tariff['rates'][band]
+    else:
+        energy_charge = kwh * tariff['rates'][band]
+
+    fixed_charge = np.full(kwh.shape, tariff['fixed_charge'])
+    fuel_energy_cost = kwh * tariff['fuel_energy_cost']
+    forex_adjustment = kwh * tariff['forex_adjustment']
+    inflation_adjustment = kwh * tariff['inflation_adjustment']
+    erc_levy = kwh * tariff['erc_levy']
+    wra_levy = kwh * tariff['wra_levy']
+    rep_levy = energy_charge * tariff['rep_levy_rate']
+    vat = (energy_charge + fixed_charge + fuel_energy_cost + forex_adjustment + inflation_adjustment) * tariff['vat_rate']
+
+    bill = {
+        'energy_charge': energy_charge,
+        'fixed_charge': fixed_charge,
+        'fuel_energy_cost': fuel_energy_cost,
+        'forex_adjustment': forex_adjustment,
+        'inflation_adjustment': inflation_adjustment,
+        'erc_levy': erc_levy,
+        'rep_levy': rep_levy,
+        'wra_levy': wra_levy,
+        'vat': vat
+    }
+    bill['total'] = sum(bill[name] for name in BILL_COMPONENTS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bill['effective_rate'] = np.where(kwh > 0, bill['total'] / kwh, np.nan)
+    return bill
+
+
+def effective_tariff(monthly_kwh: float, tariff: Union[str, Dict[str, Any]] = "Domestic") -> Dict[str, float]:
+    """
+    Express the full bill at a consumption level as an energy charge and a fixed charge.
+
+    All-in charges include pass-through charges, levies and VAT, so the flat
+    energy_charge/fixed_charge model of calculate_grid_costs() reproduces the full bill
+    exactly at this consumption.
+
+    Parameters:
+    monthly_kwh (float): Monthly energy consumption in kWh
+    tariff (str or Dict[str, Any]): Consumer type, tariff or compiled tariff
+
+    Returns:
+    Dict[str, float]: All-in 'energy_charge' in KES per kWh and 'fixed_charge' in KES per month
+    """
+    tariff = _resolve_tariff(tariff)
+    fixed_charge = tariff['fixed_charge'] * (1 + tariff['vat_rate'])
+    bill = calculate_bill(monthly_kwh, tariff)
+    energy_charge = (bill['total'] - fixed_charge) / monthly_kwh if monthly_kwh > 0 else 0.0
+    return {
+        'energy_charge': float(energy_charge),
+        'fixed_charge': float(fixed_charge)
+    }
+
+
+def consumption_from_bill(total_amount: np.ndarray, tariff: Union[str, Dict[str, Any]] = "Domestic") -> np.ndarray:
+    """
+    Reconstruct the monthly consumption behind one or more bill totals.
+
+    The bill is piecewise linear in the consumption between band limits, so it is
+    evaluated at every band limit and inverted by linear interpolation. Where a band
+    change makes the bill jump, amounts inside the jump map to the band limit.
+
+    Parameters:
+    total_amount (np.ndarray): Bill totals in KES
+    tariff (str or Dict[str, Any]): Consumer type, tariff or compiled tariff
+
+    Returns:
+    np.ndarray: Monthly energy consumption in kWh
+    """
+    tariff = _resolve_tariff(tariff)
+    limits = tariff['upper'][np.isfinite(tariff['upper'])]
+    top = max(limits.max() * 10 if len(limits) else 0.0, 100000.0)
+    kwh_points = np.unique(np.concatenate([[0.0], limits, np.nextafter(limits, np.inf), [top]]))
+    bill_points = np.maximum.accumulate(calculate_bill(kwh_points, tariff)['total'])
+
+    amount = np.asarray(total_amount, dtype=float)
+    kwh = np.interp(amount, bill_points, kwh_points)
+    # Extrapolate beyond the last point at the top band's marginal rate
+    marginal = (bill_points[-1] - bill_points[-2]) / (kwh_points[-1] - kwh_points[-2])
+    return np.where(amount > bill_points[-1], top + (amount - bill_points[-1]) / marginal, kwh)
+
+
+def compile_tou_tariff(tariff: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Precompile a time-of-use tariff into 24-hour rate and demand tables.
+
+    Parameters:
+    tariff (Dict[str, Any]): Tariff from get_tou_tariff()
+
+    Returns:
+    Dict[str, Any]: Compiled TOU tariff
+    """
+    hour_rate = np.full(HOURS_PER_DAY, np.nan)
+    hour_period = np.empty(HOURS_PER_DAY, dtype=object)
+    for name, period in tariff['periods'].items():
+        hour_rate[period['hours']] = period['energy_charge']
+        hour_period[period['hours']] = name
+    if np.isnan(hour_rate).any():
+        raise ValueError("The TOU periods must cover every hour of the day")
+
+    demand_mask = np.zeros(HOURS_PER_DAY, dtype=bool)
+    demand_mask[tariff.get('demand_hours', list(range(HOURS_PER_DAY)))] = True
+
+    adjustments = tariff.get('adjustments', {})
+    return {
+        'category': tariff.get('category', ''),
+        'hour_rate': hour_rate,
+        'hour_period': hour_period,
+        'periods': list(tariff['periods']),
+        'demand_mask': demand_mask,
+        'demand_charge_per_kva': float(tariff.get('demand_charge_per_kva', 0.0)),
+        'power_factor': float(tariff.get('power_factor', 1.0)),
+        'fixed_charge': float(tariff['fixed_charge']),
+        'fuel_energy_cost': adjustments.get('fuel_energy_cost', 0.0),
+        'forex_adjustment': adjustments.get('forex_adjustment', 0.0),
+        'inflation_adjustment': adjustments.get('inflation_adjustment', 0.0),
+        'erc_levy': adjustments.get('erc_levy', 0.0),
+        'wra_levy': adjustments.get('wra_levy', 0.0),
+        'rep_levy_rate': adjustments.get('rep_levy_percent', 0.0) / 100,
+        'vat_rate': adjustments.get('vat_percent', 0.0) / 100
+    }
+
+
+@memoize(maxsize=16)
+def get_compiled_tou_tariff(consumer_type: str) -> Dict[str, Any]:
+    """
+    Return the compiled time-of-use tariff of a commercial or industrial consumer type.
+
+    Parameters:
+    consumer_type (str): The type of consumer (Commercial (DC) or Industrial)
+
+    Returns:
+    Dict[str, Any]: Compiled TOU tariff
+    """
+    return compile_tou_tariff(get_tou_tariff(consumer_type))
+
+
+def calculate_hourly_bill(hourly_import_kw: np.ndarray, tariff: Union[str, Dict[str, Any]] = "Commercial (DC)") -> Dict[str, np.ndarray]:
+    """
+    Calculate the monthly time-of-use bills of one or more hourly grid import series.
+
+    Each series is reshaped into a day-by-hour matrix so energy charges and maximum demand
+    are vectorized reductions over the hour axis followed by per-month reductions over the
+    day axis. Maximum demand in kVA is the highest hourly import during the demand hours of
+    the month divided by the power factor.
+
+    Parameters:
+    hourly_import_kw (np.ndarray): Hourly grid import in kW, shape (..., 8760)
+    tariff (str or Dict[str, Any]): Consumer type, tariff from get_tou_tariff() or compiled TOU tariff
+
+    Returns:
+    Dict[str, np.ndarray]: Monthly bill line items in KES of shape (..., 12), the monthly
+        energy per TOU period and maximum demand, and the 'annual_total'
+    """
+    if isinstance(tariff, str):
+        tariff = get_compiled_tou_tariff(tariff)
+    elif 'hour_rate' not in tariff:
+        tariff = compile_tou_tariff(tariff)
+
+    hourly = np.maximum(np.asarray(hourly_import_kw, dtype=float), 0.0)
+    if hourly.shape[-1] != HOURS_PER_YEAR:
+        raise ValueError(f"Expected {HOURS_PER_YEAR} hourly values, got {hourly.shape[-1]}")
+    daily = hourly.reshape(hourly.shape[:-1] + (-1, HOURS_PER_DAY))
+
+    def monthly_sum(values):
+        return np.add.reduceat(values, MONTH_START_DAYS, axis=-1)
+
+    energy_kwh = monthly_sum(daily.sum(axis=-1))
+    energy_charge = monthly_sum(daily @ tariff['hour_rate'])
+    period_energy_kwh = {
+        name: monthly_sum(daily @ (tariff['hour_period'] == name).astype(float))
+        for name in tariff['periods']
+    }
+
+    max_demand_kw = np.maximum.reduceat(
+        np.where(tariff['demand_mask'], daily, 0.0).max(axis=-1), MONTH_START_DAYS, axis=-1
+    )
+    max_demand_kva = max_demand_kw / tariff['power_factor']
+    demand_charge = max_demand_kva * tariff['demand_charge_per_kva']
+
+    fixed_charge = np.full(energy_kwh.shape, tariff['fixed_charge'])
+    fuel_energy_cost = energy_kwh * tariff['fuel_energy_cost']
+    forex_adjustment = energy_kwh * tariff['forex_adjustment']
+    inflation_adjustment = energy_kwh * tariff['inflation_adjustment']
+    erc_levy = energy_kwh * tariff['erc_levy']
+    wra_levy = energy_kwh * tariff['wra_levy']
+    rep_levy = energy_charge * tariff['rep_levy_rate']
+    vat = (
+        energy_charge + demand_charge + fixed_charge + fuel_energy_cost + forex_adjustment + inflation_adjustment
+    ) * tariff['vat_rate']
+
+    total = (
+        energy_charge + demand_charge + fixed_charge + fuel_energy_cost + forex_adjustment
+        + inflation_adjustment + erc_levy + rep_levy + wra_levy + vat
+    )
+
+    return {
+        'energy_kwh': energy_kwh,
+        'period_energy_kwh': period_energy_kwh,
+        'max_demand_kva': max_demand_kva,
+        'energy_charge': energy_charge,
+        'demand_charge': demand_charge,
+        'fixed_charge': fixed_charge,
+        'fuel_energy_cost': fuel_energy_cost,
+        'forex_adjustment': forex_adjustment,
+        'inflation_adjustment': inflation_adjustment,
+        'erc_levy': erc_levy,
+        'rep_levy': rep_levy,
+        'wra_levy': wra_levy,
+        'vat': vat,
+        'total': total,
+        'annual_total': total.sum(axis=-1)
+    }
+
+
+def price_peak_shaving(
+    hourly_load_kw: np.ndarray,
+    demand_limits_kw: np.ndarray,
+    tariff: Union[str, Dict[str, Any]] = "Commercial (DC)",
+    round_trip_efficiency: float = 0.9,
+    battery_dod: float = 0.8
+) -> Dict[str, np.ndarray]:
+    """
+    Price peak shaving with a battery for a range of demand limits in one batched evaluation.
+
+    For every demand limit the battery covers the load above the limit during the demand
+    hours and recharges the same energy (plus losses) evenly over the other hours of the
+    day. The resulting import series for all limits are priced together with
+    calculate_hourly_bill().
+
+    Parameters:
+    hourly_load_kw (np.ndarray): Hourly site load in kW, shape (8760,)
+    demand_limits_kw (np.ndarray): Grid demand limits to evaluate in kW, shape (limits,)
+    tariff (str or Dict[str, Any]): Consumer type, TOU tariff or compiled TOU tariff
+    round_trip_efficiency (float): Battery round-trip efficiency (0.0-1.0)
+    battery_dod (float): Usable battery depth of discharge (0.0-1.0)
+
+    Returns:
+    Dict[str, np.ndarray]: Per limit: annual bill, annual savings against no battery, and
+        the battery energy (kWh) and power (kW) needed
+    """
+    if isinstance(tariff, str):
+        tariff = get_compiled_tou_tariff(tariff)
+    elif 'hour_rate' not in tariff:
+        tariff = compile_tou_tariff(tariff)
+
+    load = np.asarray(hourly_load_kw, dtype=float).reshape(-1, HOURS_PER_DAY)
+    limits = np.asarray(demand_limits_kw, dtype=float)[:, np.newaxis, np.newaxis]
+    demand_mask = tariff['demand_mask']
+
+    # Battery discharge above the limit in demand hours, recharged in the other hours
+    discharge = np.where(demand_mask, np.maximum(load - limits, 0.0), 0.0)
+    daily_discharge_kwh = discharge.sum(axis=-1)
+    recharge_hours = max(int((~demand_mask).sum()), 1)
+    recharge = np.where(
+        demand_mask, 0.0, (daily_discharge_kwh / round_trip_efficiency / recharge_hours)[..., np.newaxis]
+    )
+    grid_import = (load - discharge + recharge).reshape(len(limits), HOURS_PER_YEAR)
+
+    bills = calculate_hourly_bill(grid_import, tariff)
+    base_bill = calculate_hourly_bill(load.reshape(HOURS_PER_YEAR), tariff)['annual_total']
+
+    return {
+        'demand_limit_kw': limits[:, 0, 0],
+        'annual_bill': bills['annual_total'],
+        'annual_savings': base_bill - bills['annual_total'],
+        'battery_kwh': daily_discharge_kwh.max(axis=-1) / battery_dod,
+        'battery_kw': discharge.max(axis=(-2, -1))
+    }
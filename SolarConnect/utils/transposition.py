@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List
+from utils.hourly_simulation import hourly_irradiance, monthly_peak_sun_hours, DAYS_PER_MONTH, HOURS_PER_DAY, HOURS_PER_YEAR
+
+SOLAR_CONSTANT = 1.367  # kW/m²
+GROUND_ALBEDO = 0.2
+
+
+def solar_geometry(latitude: float, sunrise: float = 6.5, sunset: float = 18.75) -> Dict[str, np.ndarray]:
+    """
+    Calculate the sun's direction for every hour of a typical year.
+
+    Clock hours are converted to solar time with the solar noon midway between sunrise and
+    sunset, the same convention as hourly_irradiance().
+
+    Parameters:
+    latitude (float): Latitude in degrees
+    sunrise (float): Sunrise time in decimal hours
+    sunset (float): Sunset time in decimal hours
+
+    Returns:
+    Dict[str, np.ndarray]: Unit vector towards the sun ('east', 'north', 'up') and the
+        extraterrestrial irradiance on a horizontal plane, each of shape (8760,)
+    """
+    day_of_year = np.repeat(np.arange(1, int(DAYS_PER_MONTH.sum()) + 1), HOURS_PER_DAY)
+    solar_time = np.tile(np.arange(HOURS_PER_DAY) + 0.5, int(DAYS_PER_MONTH.sum())) - ((sunrise + sunset) / 2 - 12)
+
+    declination = np.radians(23.45) * np.sin(2 * np.pi * (284 + day_of_year) / 365)
+    hour_angle = np.radians(15 * (solar_time - 12))
+    phi = np.radians(latitude)
+
+    up = np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(declination) * np.cos(hour_angle)
+    east = -np.cos(declination) * np.sin(hour_angle)
+    north = np.sin(declination) * np.cos(phi) - np.cos(declination) * np.sin(phi) * np.cos(hour_angle)
+    extraterrestrial = SOLAR_CONSTANT * (1 + 0.033 * np.cos(2 * np.pi * day_of_year / 365)) * np.maximum(up, 0.0)
+
+    return {
+        'east': east,
+        'north': north,
+        'up': up,
+        'extraterrestrial': extraterrestrial
+    }
+
+
+def plane_of_array_irradiance(
+    ghi: np.ndarray,
+    latitude: float,
+    tilt_deg: np.ndarray,
+    azimuth_deg: np.ndarray,
+    albedo: float = GROUND_ALBEDO
+) -> np.ndarray:
+    """
+    Transpose hourly horizontal irradiance onto any number of tilted planes at once.
+
+    The horizontal irradiance is split into beam and diffuse parts with the Erbs correlation
+    and transposed with the isotropic sky model. Tilts and azimuths broadcast against each
+    other and gain a trailing hour axis.
+
+    Parameters:
+    ghi (np.ndarray): Hourly global horizontal irradiance in kW/m², shape (8760,)
+    latitude (float): Latitude in degrees
+    tilt_deg (np.ndarray): Tilt of each plane from horizontal in degrees
+    azimuth_deg (np.ndarray): Compass direction each plane faces in degrees (0 = north, 90 = east)
+    albedo (float): Ground reflectance
+
+    Returns:
+    np.ndarray: Hourly plane-of-array irradiance in kW/m², shape (..., 8760)
+    """
+    ghi = np.asarray(ghi, dtype=float)
+    sun = solar_geometry(latitude)
+
+    # Erbs diffuse fraction from the hourly clearness index
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clearness = np.clip(np.where(sun['extraterrestrial'] > 0, ghi / sun['extraterrestrial'], 0.0), 0.0, 1.0)
+    diffuse_fraction = np.where(
+        clearness <= 0.22, 1 - 0.09 * clearness,
+        np.where(clearness <= 0.8,
+                 0.9511 - 0.1604 * clearness + 4.388 * clearness ** 2 - 16.638 * clearness ** 3 + 12.336 * clearness ** 4,
+                 0.165)
+    )
+    # Below 5 degrees of elevation all irradiance is treated as diffuse
+    low_sun = sun['up'] < np.sin(np.radians(5))
+    diffuse = np.where(low_sun, ghi, ghi * diffuse_fraction)
+    beam_normal = np.where(low_sun, 0.0, (ghi - diffuse) / np.maximum(sun['up'], 1e-9))
+
+    tilt = np.radians(np.asarray(tilt_deg, dtype=float))[..., np.newaxis]
+    azimuth = np.radians(np.asarray(azimuth_deg, dtype=float))[..., np.newaxis]
+    cos_incidence = (
+        np.sin(tilt) * np.sin(azimuth) * sun['east']
+        + np.sin(tilt) * np.cos(azimuth) * sun['north']
+        + np.cos(tilt) * sun['up']
+    )
+
+    return (
+        beam_normal * np.maximum(cos_incidence, 0.0)
+        + diffuse * (1 + np.cos(tilt)) / 2
+        + ghi * albedo * (1 - np.cos(tilt)) / 2
+    )
+
+
+def simulate_sub_arrays(
+    sub_arrays: List[Dict[str, Any]],
+    irradiance_data: Dict[str, Any],
+    latitude: float,
+    panel_wattage: int = 400,
+    system_efficiency: float = 0.85
+) -> Dict[str, Any]:
+    """
+    Simulate the hourly output of an array split over several roof faces.
+
+    All faces are transposed in one vectorized pass and their hourly outputs summed.
+
+    Parameters:
+    sub_arrays (List[Dict[str, Any]]): Roof faces, each with 'tilt' and 'azimuth' in degrees,
+        the number of 'panels' and optionally a 'name'
+    irradiance_data (Dict[str, Any]): Irradiance data for the location
+    latitude (float): Latitude in degrees
+    panel_wattage (int): Wattage of individual solar panels in W
+    system_efficiency (float): Overall system efficiency as a decimal (0.0-1.0)
+
+    Returns:
+    Dict[str, Any]: Hourly output of each face ('face_kw', shape (faces, 8760)) and in total
+        ('pv_kw'), annual energy per face and in total, the total capacity and the effective
+        peak sun hours of the whole array
+    """
+    tilt = np.array([float(face['tilt']) for face in sub_arrays])
+    azimuth = np.array([float(face['azimuth']) for face in sub_arrays])
+    capacity_kw = np.array([float(face['panels']) for face in sub_arrays]) * panel_wattage / 1000
+
+    ghi = hourly_irradiance(monthly_peak_sun_hours(irradiance_data))
+    poa = plane_of_array_irradiance(ghi, latitude, tilt, azimuth)
+    face_kw = poa * capacity_kw[:, np.newaxis] * system_efficiency
+    pv_kw = face_kw.sum(axis=0)
+
+    total_capacity_kw = capacity_kw.sum()
+    annual_kwh = pv_kw.sum()
+    days = HOURS_PER_YEAR / HOURS_PER_DAY
+    return {
+        'face_kw': face_kw,
+        'pv_kw': pv_kw,
+        'face_annual_kwh': face_kw.sum(axis=-1),
+        'annual_kwh': annual_kwh,
+        'capacity_kw': total_capacity_kw,
+        'effective_peak_sun_hours': annual_kwh / (total_capacity_kw * system_efficiency * days) if total_capacity_kw > 0 else 0.0
+    }
+
+
+def compare_roof_designs(
+    designs: Dict[str, List[Dict[str, Any]]],
+    irradiance_data: Dict[str, Any],
+    latitude: float,
+    load_kw: np.ndarray = None,
+    panel_wattage: int = 400,
+    system_efficiency: float = 0.85
+) -> pd.DataFrame:
+    """
+    Compare several roof layouts with one transposition of all their faces.
+
+    Parameters:
+    designs (Dict[str, List[Dict[str, Any]]]): Sub-arrays of each design, by design name
+    irradiance_data (Dict[str, Any]): Irradiance data for the location
+    latitude (float): Latitude in degrees
+    load_kw (np.ndarray, optional): Hourly load in kW, to report the share of solar used directly
+    panel_wattage (int): Wattage of individual solar panels in W
+    system_efficiency (float): Overall system efficiency as a decimal (0.0-1.0)
+
+    Returns:
+    pd.DataFrame: One row per design with capacity, annual energy, specific yield, effective
+        peak sun hours, peak output and (with a load) the share of solar used directly
+    """
+    names = list(designs)
+    faces = [face for name in names for face in designs[name]]
+    design_index = np.repeat(np.arange(len(names)), [len(designs[name]) for name in names])
+
+    simulation = simulate_sub_arrays(faces, irradiance_data, latitude, panel_wattage, system_efficiency)
+    face_capacity = np.array([float(face['panels']) for face in faces]) * panel_wattage / 1000
+
+    pv_kw = np.zeros((len(names), simulation['face_kw'].shape[-1]))
+    np.add.at(pv_kw, design_index, simulation['face_kw'])
+    capacity_kw = np.bincount(design_index, weights=face_capacity, minlength=len(names))
+    annual_kwh = pv_kw.sum(axis=-1)
+    days = HOURS_PER_YEAR / HOURS_PER_DAY
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        comparison = pd.DataFrame({
+            'design': names,
+            'capacity_kw': capacity_kw,
+            'annual_kwh': annual_kwh,
+            'specific_yield_kwh_per_kwp': annual_kwh / capacity_kw,
+            'effective_peak_sun_hours': annual_kwh / (capacity_kw * system_efficiency * days),
+            'peak_output_kw': pv_kw.max(axis=-1)
+        })
+    if load_kw is not None:
+        comparison['self_consumption_percent'] = np.minimum(pv_kw, load_kw).sum(axis=-1) / annual_kwh * 100
+    return comparison
@@ -0,0 +1,305 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from data.solar_pumps import get_solar_pumps
+from utils.hourly_simulation import hourly_irradiance, monthly_peak_sun_hours, HOURS_PER_DAY
+from utils.memoize import memoize
+
+# Share of daily water use drawn in each hour (00:00-23:00): livestock watering and
+# household collection in the morning and late afternoon
+WATER_DEMAND_SHAPE = np.array([
+    0.00, 0.00, 0.00, 0.00, 0.00, 0.02,  # 00-05
+    0.08, 0.12, 0.10, 0.06, 0.04, 0.04,  # 06-11
+    0.04, 0.04, 0.04, 0.06, 0.10, 0.12,  # 12-17
+    0.08, 0.04, 0.02, 0.00, 0.00, 0.00   # 18-23
+])
+WATER_DEMAND_SHAPE = WATER_DEMAND_SHAPE / WATER_DEMAND_SHAPE.sum()
+
+
+def fit_pump_curve(head_points_m: List[float], flow_points_m3h: List[float]) -> Dict[str, float]:
+    """
+    Fit a quadratic head-flow curve H = H0 * (1 - (Q / Qmax)^2) to manufacturer curve points.
+
+    Parameters:
+    head_points_m (List[float]): Pump head values in meters
+    flow_points_m3h (List[float]): Flow rates in m³/h at the corresponding heads
+
+    Returns:
+    Dict[str, float]: Dictionary with 'shutoff_head_m' and 'max_flow_m3h'
+    """
+    head = np.asarray(head_points_m, dtype=float)
+    flow = np.asarray(flow_points_m3h, dtype=float)
+
+    # Linear least squares on H = H0 - k * Q^2
+    design = np.column_stack([np.ones_like(flow), -flow ** 2])
+    (shutoff_head, k), *_ = np.linalg.lstsq(design, head, rcond=None)
+
+    return {
+        'shutoff_head_m': float(shutoff_head),
+        'max_flow_m3h': float(np.sqrt(shutoff_head / k)) if k > 0 else float(flow.max())
+    }
+
+
+def pump_flow_rate(
+    power_w: np.ndarray,
+    rated_power_w: np.ndarray,
+    shutoff_head_m: np.ndarray,
+    max_flow_m3h: np.ndarray,
+    total_dynamic_head_m: float,
+    min_power_fraction: float = 0.1
+) -> np.ndarray:
+    """
+    Calculate pump flow at a given input power and head using the pump affinity laws.
+
+    At reduced power the pump runs slower: flow scales with speed, head with speed squared
+    and power with speed cubed. All arguments broadcast, so flows for many pumps and many
+    hours can be evaluated in one call.
+
+    Parameters:
+    power_w (np.ndarray): Available electrical power in W
+    rated_power_w (np.ndarray): Rated pump power in W
+    shutoff_head_m (np.ndarray): Head at zero flow and rated power in m
+    max_flow_m3h (np.ndarray): Flow at zero head and rated power in m³/h
+    total_dynamic_head_m (float): Total dynamic head of the installation in m
+    min_power_fraction (float): Fraction of rated power needed for the pump to start
+
+    Returns:
+    np.ndarray: Flow rate in m³/h
+    """
+    rated_power_w = np.asarray(rated_power_w, dtype=float)
+    power = np.minimum(np.asarray(power_w, dtype=float), rated_power_w)
+    speed = np.cbrt(power / rated_power_w)
+
+    # Head ratio relative to the shutoff head at the current speed
+    head_at_speed = np.maximum(speed ** 2 * shutoff_head_m, 1e-9)
+    head_ratio = total_dynamic_head_m / head_at_speed
+
+    running = (power >= min_power_fraction * rated_power_w) & (head_ratio < 1)
+    return np.where(running, speed * max_flow_m3h * np.sqrt(np.clip(1 - head_ratio, 0, None)), 0.0)
+
+
+def hourly_pumped_volume(
+    irradiance: np.ndarray,
+    array_kw: np.ndarray,
+    pump: Dict[str, Any],
+    total_dynamic_head_m: float,
+    system_efficiency: float = 0.85
+) -> np.ndarray:
+    """
+    Calculate the hourly pumped water volume for a pump driven directly by a PV array.
+
+    Parameters:
+    irradiance (np.ndarray): Hourly irradiance in kW/m², shape (hours,)
+    array_kw (np.ndarray): PV array size(s) in kWp
+    pump (Dict[str, Any]): Pump data with rated power and curve parameters
+        (values may be arrays to evaluate several pumps at once)
+    total_dynamic_head_m (float): Total dynamic head of the installation in m
+    system_efficiency (float): PV system efficiency as a decimal (0.0-1.0)
+
+    Returns:
+    np.ndarray: Hourly pumped volume in m³, shape (..., hours)
+    """
+    array_kw = np.asarray(array_kw, dtype=float)[..., np.newaxis]
+    power_w = irradiance * array_kw * system_efficiency * 1000
+
+    return pump_flow_rate(
+        power_w,
+        np.asarray(pump['rated_power_w'], dtype=float)[..., np.newaxis],
+        np.asarray(pump['shutoff_head_m'], dtype=float)[..., np.newaxis],
+        np.asarray(pump['max_flow_m3h'], dtype=float)[..., np.newaxis],
+        total_dynamic_head_m
+    )
+
+
+def required_tank_volume(pumped_m3: np.ndarray, demand_m3: np.ndarray) -> np.ndarray:
+    """
+    Calculate the smallest tank that meets every hour of demand (sequent peak analysis).
+
+    The storage deficit follows the recursion K[t] = max(0, K[t-1] + demand[t] - pumped[t]),
+    which has the closed form K[t] = S[t] - min(0, min(S[:t])) for the cumulative net demand S,
+    so the whole analysis is a cumulative sum and a running minimum. The series is repeated
+    once so deficits that wrap around the end of the year are captured.
+
+    Parameters:
+    pumped_m3 (np.ndarray): Hourly pumped volume in m³, shape (..., hours)
+    demand_m3 (np.ndarray): Hourly water demand in m³, shape (hours,)
+
+    Returns:
+    np.ndarray: Required tank volume in m³ (infinite where annual pumping falls short of demand)
+    """
+    net_demand = demand_m3 - pumped_m3
+    net_demand = np.concatenate([net_demand, net_demand], axis=-1)
+
+    cumulative = np.cumsum(net_demand, axis=-1)
+    running_min = np.minimum(np.minimum.accumulate(cumulative, axis=-1), 0.0)
+    deficit = cumulative - running_min
+
+    required = deficit.max(axis=-1)
+    feasible = pumped_m3.sum(axis=-1) >= demand_m3.sum(axis=-1)
+    return np.where(feasible, required, np.inf)
+
+
+def simulate_pumping_system(
+    irradiance: np.ndarray,
+    array_kw: float,
+    pump: Dict[str, Any],
+    total_dynamic_head_m: float,
+    tank_volume_m3: float,
+    daily_water_demand_m3: float,
+    system_efficiency: float = 0.85,
+    initial_level: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Simulate hourly pumping and tank level for a single solar pumping design.
+
+    Parameters:
+    irradiance (np.ndarray): Hourly irradiance in kW/m²
+    array_kw (float): PV array size in kWp
+    pump (Dict[str, Any]): Pump data with rated power and curve parameters
+    total_dynamic_head_m (float): Total dynamic head of the installation in m
+    tank_volume_m3 (float): Storage tank volume in m³
+    daily_water_demand_m3 (float): Daily water demand in m³
+    system_efficiency (float): PV system efficiency as a decimal (0.0-1.0)
+    initial_level (float): Initial tank level as a fraction of its volume
+
+    Returns:
+    Dict[str, Any]: Dictionary containing hourly pumped volume, tank level, unmet demand and overflow
+    """
+    pumped = hourly_pumped_volume(irradiance, array_kw, pump, total_dynamic_head_m, system_efficiency)
+    demand = np.tile(WATER_DEMAND_SHAPE * daily_water_demand_m3, len(irradiance) // HOURS_PER_DAY)
+
+    level = np.empty(len(pumped))
+    unmet = np.empty(len(pumped))
+    overflow = np.empty(len(pumped))
+
+    current = initial_level * tank_volume_m3
+    for hour, (inflow, outflow) in enumerate(zip(pumped.tolist(), demand.tolist())):
+        current = current + inflow - outflow
+        unmet[hour] = max(-current, 0.0)
+        overflow[hour] = max(current - tank_volume_m3, 0.0)
+        current = min(max(current, 0.0), tank_volume_m3)
+        level[hour] = current
+
+    return {
+        'pumped_m3': pumped,
+        'demand_m3': demand,
+        'tank_level_m3': level,
+        'unmet_demand_m3': unmet,
+        'overflow_m3': overflow,
+        'annual_pumped_m3': float(pumped.sum()),
+        'annual_demand_m3': float(demand.sum()),
+        'reliability': 1 - float(unmet.sum()) / max(float(demand.sum()), 1e-9)
+    }
+
+
+@memoize(maxsize=32)
+def size_pumping_system(
+    daily_water_demand_m3: float,
+    total_dynamic_head_m: float,
+    irradiance_data: Dict[str, Any],
+    pumps: Optional[List[Dict[str, Any]]] = None,
+    panel_wattage: int = 400,
+    max_panels: int = 30,
+    max_storage_days: float = 3.0,
+    panel_cost_per_wp: float = 90,
+    tank_cost_per_m3: float = 10000,
+    system_efficiency: float = 0.85
+) -> Dict[str, Any]:
+    """
+    Size the PV array, pump and storage tank for a solar water pumping system.
+
+    Every combination of pump and array size is simulated over an hourly typical year in a
+    single vectorized pass, the required tank for each combination is found by sequent peak
+    analysis and the cheapest feasible design is selected.
+
+    Parameters:
+    daily_water_demand_m3 (float): Daily water demand in m³
+    total_dynamic_head_m (float): Total dynamic head (static lift plus friction losses) in m
+    irradiance_data (Dict[str, Any]): Irradiance data for the location
+    pumps (List[Dict[str, Any]], optional): Candidate pumps, defaults to get_solar_pumps().
+        Pumps may give 'head_points_m' and 'flow_points_m3h' instead of curve parameters.
+    panel_wattage (int): Wattage of individual solar panels in W
+    max_panels (int): Largest array size considered, in panels
+    max_storage_days (float): Largest acceptable tank volume in days of demand
+    panel_cost_per_wp (float): Solar panel cost in KES per Wp
+    tank_cost_per_m3 (float): Storage tank cost in KES per m³
+    system_efficiency (float): PV system efficiency as a decimal (0.0-1.0)
+
+    Returns:
+    Dict[str, Any]: Dictionary containing the recommended design, its hourly simulation
+        and a table of all evaluated candidates
+    """
+    if pumps is None:
+        pumps = get_solar_pumps()
+
+    # Fit curve parameters for pumps described by curve points
+    pump_table = []
+    for pump in pumps:
+        pump = dict(pump)
+        if 'shutoff_head_m' not in pump:
+            pump.update(fit_pump_curve(pump['head_points_m'], pump['flow_points_m3h']))
+        pump_table.append(pump)
+    pump_table = pd.DataFrame(pump_table)
+
+    # Candidate grid: every pump with every array size
+    panel_counts = np.arange(1, max_panels + 1)
+    pump_index, panel_index = np.meshgrid(np.arange(len(pump_table)), panel_counts, indexing='ij')
+    pump_index, panel_count = pump_index.ravel(), panel_index.ravel()
+    array_kw = panel_count * panel_wattage / 1000
+
+    candidate_pumps = {
+        column: pump_table[column].to_numpy(dtype=float)[pump_index]
+        for column in ['rated_power_w', 'shutoff_head_m', 'max_flow_m3h', 'price']
+    }
+
+    irradiance = hourly_irradiance(monthly_peak_sun_hours(irradiance_data))
+    demand = np.tile(WATER_DEMAND_SHAPE * daily_water_demand_m3, len(irradiance) // HOURS_PER_DAY)
+
+    pumped = hourly_pumped_volume(irradiance, array_kw, candidate_pumps, total_dynamic_head_m, system_efficiency)
+    tank_m3 = required_tank_volume(pumped, demand)
+
+    # Round tanks up to the nearest cubic meter and apply the storage limit
+    tank_m3 = np.ceil(tank_m3)
+    feasible = tank_m3 <= max_storage_days * daily_water_demand_m3
+    total_cost = candidate_pumps['price'] + array_kw * 1000 * panel_cost_per_wp + np.where(feasible, tank_m3, 0) * tank_cost_per_m3
+
+    candidates = pd.DataFrame({
+        'pump': pump_table['name'].to_numpy()[pump_index],
+        'number_of_panels': panel_count,
+        'array_kw': array_kw,
+        'annual_pumped_m3': pumped.sum(axis=-1),
+        'tank_m3': tank_m3,
+        'feasible': feasible,
+        'total_cost': np.where(feasible, total_cost, np.inf)
+    })
+
+    if not feasible.any():
+        return {
+            'feasible': False,
+            'candidates': candidates
+        }
+
+    best = int(np.argmin(candidates['total_cost'].to_numpy()))
+    best_pump = pump_table.iloc[pump_index[best]].to_dict()
+    simulation = simulate_pumping_system(
+        irradiance,
+        array_kw[best],
+        best_pump,
+        total_dynamic_head_m,
+        tank_m3[best],
+        daily_water_demand_m3,
+        system_efficiency
+    )
+
+    return {
+        'feasible': True,
+        'pump': best_pump,
+        'number_of_panels': int(panel_count[best]),
+        'array_kw': float(array_kw[best]),
+        'tank_m3': float(tank_m3[best]),
+        'total_cost': float(total_cost[best]),
+        'daily_water_demand_m3': daily_water_demand_m3,
+        'total_dynamic_head_m': total_dynamic_head_m,
+        'simulation': simulation,
+        'candidates': candidates
+    }